@@ -16,11 +16,14 @@ echo "SCHEDULER_RECV_INTERVAL: $SCHEDULER_RECV_INTERVAL, CONC: $CONC, ISL: $ISL,
 
 ps aux
 
+MEM_FRACTION_STATIC=$(python3 utils/engine_args.py get mem-fraction-static 0.85)
+KV_CACHE_DTYPE=$(python3 utils/engine_args.py get kv-cache-dtype fp8_e4m3)
+mapfile -t ENGINE_FLAGS < <(python3 utils/engine_args.py flags --exclude mem-fraction-static kv-cache-dtype)
 set -x
 PYTHONNOUSERSITE=1 python3 -m sglang.launch_server --model-path $MODEL --host 0.0.0.0 --port $PORT --trust-remote-code \
 --tensor-parallel-size=$TP --data-parallel-size=1 \
---cuda-graph-max-bs 256 --max-running-requests 256 --mem-fraction-static 0.85 --kv-cache-dtype fp8_e4m3 \
+--cuda-graph-max-bs ${CUDA_GRAPH_MAX_BS:-256} --max-running-requests 256 --mem-fraction-static $MEM_FRACTION_STATIC --kv-cache-dtype $KV_CACHE_DTYPE \
 --chunked-prefill-size 16384 \
 --ep-size $EP_SIZE --quantization modelopt_fp4 --enable-flashinfer-allreduce-fusion --scheduler-recv-interval $SCHEDULER_RECV_INTERVAL \
---enable-symm-mem --disable-radix-cache --attention-backend trtllm_mla --moe-runner-backend flashinfer_trtllm --stream-interval 10
-
+--enable-symm-mem --disable-radix-cache --attention-backend trtllm_mla --moe-runner-backend flashinfer_trtllm --stream-interval 10 \
+"${ENGINE_FLAGS[@]}"
@@ -22,38 +22,8 @@ echo "TP: $TP, CONC: $CONC, ISL: $ISL, OSL: $OSL, EP_SIZE: $EP_SIZE, DP_ATTENTIO
 
 hf download $MODEL
 
-# ========= Determine DP_ATTENTION, EP_SIZE and MOE_BACKEND based on ISL, OSL, CONC =========
-MOE_BACKEND="TRTLLM"
-
-if [[ "$TP" == "4" ]]; then
-    if [[ "$ISL" == "1024" && "$OSL" == "1024" ]]; then
-        if [[ $CONC -ge 256 ]]; then
-            MOE_BACKEND="CUTLASS"
-        fi
-    elif [[ "$ISL" == "1024" && "$OSL" == "8192" ]]; then
-        if [[ $CONC -ge 256 ]]; then
-            MOE_BACKEND="CUTLASS"
-        fi
-    elif [[ "$ISL" == "8192" && "$OSL" == "1024" ]]; then
-        if [[ $CONC -gt 32 ]]; then
-            MOE_BACKEND="CUTLASS"
-        fi
-    fi
-elif [[ "$TP" == "8" ]]; then
-    if [[ "$ISL" == "1024" && "$OSL" == "1024" ]]; then
-        if [[ $CONC -ge 256 ]]; then
-            MOE_BACKEND="CUTLASS"
-        fi
-    elif [[ "$ISL" == "1024" && "$OSL" == "8192" ]]; then
-        if [[ $CONC -ge 256 ]]; then
-            MOE_BACKEND="CUTLASS"
-        fi
-    elif [[ "$ISL" == "8192" && "$OSL" == "1024" ]]; then
-        if [[ $CONC -gt 32 ]]; then
-            MOE_BACKEND="CUTLASS"
-        fi
-    fi
-fi
+# MoE backend rules by TP, ISL/OSL and CONC live in the master config (engine-arg-rules)
+MOE_BACKEND=$(python3 utils/engine_args.py get moe-backend TRTLLM)
 
 echo "MOE_BACKEND set to '$MOE_BACKEND'"
 
@@ -64,14 +34,14 @@ EXTRA_CONFIG_FILE="dsr1-fp4.yml"
 cat > $EXTRA_CONFIG_FILE << EOF
 cuda_graph_config:
     enable_padding: true
-    max_batch_size: 512
+    max_batch_size: ${CUDA_GRAPH_MAX_BS:-512}
 enable_attention_dp: $DP_ATTENTION
 print_iter_log: true
 kv_cache_config:
-    dtype: fp8
-    free_gpu_memory_fraction: 0.8
+    dtype: $(python3 utils/engine_args.py get kv-cache-dtype fp8)
+    free_gpu_memory_fraction: $(python3 utils/engine_args.py get free-gpu-memory-fraction 0.8)
     enable_block_reuse: false 
-stream_interval: 10
+stream_interval: $(python3 utils/engine_args.py get stream-interval 10)
 moe_config:
     backend: $MOE_BACKEND
 EOF
@@ -102,22 +72,21 @@ mpirun -n 1 --oversubscribe --allow-run-as-root \
 
 
 set +x
-while IFS= read -r line; do
-    printf '%s\n' "$line"
-    if [[ "$line" == *"Application startup complete"* ]]; then
-        break
-    fi
-done < <(tail -F -n0 "$SERVER_LOG")
+SERVER_PID=$!
+python3 utils/wait_for_server.py --pid $SERVER_PID --log $SERVER_LOG --port $PORT --framework trtllm \
+    --output startup_${RESULT_FILENAME}.json || exit 1
 
-git clone https://github.com/kimbochen/bench_serving.git
+source utils/bench_client.sh
 set -x
-python3 bench_serving/benchmark_serving.py \
---model $MODEL --backend openai \
---base-url http://0.0.0.0:$PORT \
---dataset-name random \
---random-input-len $ISL --random-output-len $OSL --random-range-ratio $RANDOM_RANGE_RATIO \
---num-prompts $(( $CONC * 10 )) --max-concurrency $CONC \
---request-rate inf --ignore-eos \
---save-result --percentile-metrics 'ttft,tpot,itl,e2el' \
---result-dir /workspace/ \
---result-filename $RESULT_FILENAME.json
+for CONC in ${CONC_LIST:-$CONC}; do
+    python3 $BENCH_CLIENT_PY \
+    --model $MODEL --backend openai \
+    --base-url http://0.0.0.0:$PORT \
+    --dataset-name random \
+    --random-input-len $ISL --random-output-len $OSL --random-range-ratio $RANDOM_RANGE_RATIO \
+    --num-prompts $(( $CONC * 10 )) --max-concurrency $CONC \
+    --request-rate ${REQUEST_RATE:-inf} ${BURSTINESS:+--burstiness $BURSTINESS} --ignore-eos \
+    --save-result --save-detailed --percentile-metrics 'ttft,tpot,itl,e2el' \
+    --result-dir /workspace/ \
+    --result-filename ${RESULT_FILENAME}_conc${CONC}.json
+done
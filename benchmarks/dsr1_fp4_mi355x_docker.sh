@@ -18,14 +18,16 @@ if [[ "$ISL" == "8192" && "$OSL" == "1024" ]]; then
 	fi
 fi
 
+MEM_FRACTION_STATIC=$(python3 utils/engine_args.py get mem-fraction-static 0.8)
+mapfile -t ENGINE_FLAGS < <(python3 utils/engine_args.py flags --exclude mem-fraction-static)
 set -x
 python3 -m sglang.launch_server --model-path=$MODEL --trust-remote-code \
 --host=0.0.0.0 --port=$PORT \
 --tensor-parallel-size=$TP \
 --chunked-prefill-size=$PREFILL_SIZE \
---mem-fraction-static=0.8 \
+--mem-fraction-static=$MEM_FRACTION_STATIC \
 --disable-radix-cache \
 --num-continuous-decode-steps=4 \
 --max-prefill-tokens=$PREFILL_SIZE \
---cuda-graph-max-bs=128
-
+--cuda-graph-max-bs=${CUDA_GRAPH_MAX_BS:-128} \
+"${ENGINE_FLAGS[@]}"
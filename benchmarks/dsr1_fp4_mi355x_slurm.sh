@@ -22,35 +22,36 @@ if [[ "$ISL" == "8192" && "$OSL" == "1024" ]]; then
         fi
 fi
 
+MEM_FRACTION_STATIC=$(python3 utils/engine_args.py get mem-fraction-static 0.8)
+mapfile -t ENGINE_FLAGS < <(python3 utils/engine_args.py flags --exclude mem-fraction-static)
 set -x
 python3 -m sglang.launch_server --model-path=$MODEL --trust-remote-code \
 --host=0.0.0.0 --port=$PORT \
 --tensor-parallel-size=$TP \
 --chunked-prefill-size=$PREFILL_SIZE \
---mem-fraction-static=0.8 \
+--mem-fraction-static=$MEM_FRACTION_STATIC \
 --disable-radix-cache \
 --num-continuous-decode-steps=4 \
 --max-prefill-tokens=$PREFILL_SIZE \
---cuda-graph-max-bs=128 \
-> $SERVER_LOG 2>&1 &
+--cuda-graph-max-bs=${CUDA_GRAPH_MAX_BS:-128} \
+"${ENGINE_FLAGS[@]}" > $SERVER_LOG 2>&1 &
 
 set +x
-while IFS= read -r line; do
-    printf '%s\n' "$line"
-    if [[ "$line" == *"The server is fired up and ready to roll"* ]]; then
-        break
-    fi
-done < <(tail -F -n0 "$SERVER_LOG")
+SERVER_PID=$!
+python3 utils/wait_for_server.py --pid $SERVER_PID --log $SERVER_LOG --port $PORT --framework sglang \
+    --output startup_${RESULT_FILENAME}.json || exit 1
 
 set -x
-git clone https://github.com/kimbochen/bench_serving.git
-python3 bench_serving/benchmark_serving.py \
---model $MODEL --backend vllm \
---base-url "http://0.0.0.0:$PORT" \
---dataset-name random \
---random-input-len $ISL --random-output-len $OSL --random-range-ratio $RANDOM_RANGE_RATIO \
---num-prompts $(( $CONC * 10 )) --max-concurrency $CONC \
---request-rate inf --ignore-eos \
---save-result --percentile-metrics "ttft,tpot,itl,e2el" \
---result-dir /workspace/ --result-filename $RESULT_FILENAME.json
+source utils/bench_client.sh
+for CONC in ${CONC_LIST:-$CONC}; do
+    python3 $BENCH_CLIENT_PY \
+    --model $MODEL --backend vllm \
+    --base-url "http://0.0.0.0:$PORT" \
+    --dataset-name random \
+    --random-input-len $ISL --random-output-len $OSL --random-range-ratio $RANDOM_RANGE_RATIO \
+    --num-prompts $(( $CONC * 10 )) --max-concurrency $CONC \
+    --request-rate ${REQUEST_RATE:-inf} ${BURSTINESS:+--burstiness $BURSTINESS} --ignore-eos \
+    --save-result --save-detailed --percentile-metrics "ttft,tpot,itl,e2el" \
+    --result-dir /workspace/ --result-filename ${RESULT_FILENAME}_conc${CONC}.json
+done
 
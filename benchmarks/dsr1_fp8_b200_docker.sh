@@ -28,10 +28,14 @@ echo "SCHEDULER_RECV_INTERVAL: $SCHEDULER_RECV_INTERVAL, CONC: $CONC, ISL: $ISL,
 
 ps aux
 
+MEM_FRACTION_STATIC=$(python3 utils/engine_args.py get mem-fraction-static 0.82)
+KV_CACHE_DTYPE=$(python3 utils/engine_args.py get kv-cache-dtype fp8_e4m3)
+mapfile -t ENGINE_FLAGS < <(python3 utils/engine_args.py flags --exclude mem-fraction-static kv-cache-dtype)
 set -x
 PYTHONNOUSERSITE=1 python3 -m sglang.launch_server --model-path=$MODEL --host=0.0.0.0 --port=$PORT \
 --tensor-parallel-size=$TP --data-parallel-size=1 \
---cuda-graph-max-bs 128 --max-running-requests 128 \
---mem-fraction-static 0.82 --kv-cache-dtype fp8_e4m3 --chunked-prefill-size 32768 --max-prefill-tokens 32768 \
+--cuda-graph-max-bs ${CUDA_GRAPH_MAX_BS:-128} --max-running-requests 128 \
+--mem-fraction-static $MEM_FRACTION_STATIC --kv-cache-dtype $KV_CACHE_DTYPE --chunked-prefill-size 32768 --max-prefill-tokens 32768 \
 --enable-flashinfer-allreduce-fusion --scheduler-recv-interval $SCHEDULER_RECV_INTERVAL --disable-radix-cache \
---attention-backend trtllm_mla --stream-interval 30 --ep-size $EP_SIZE --moe-runner-backend flashinfer_trtllm --quantization fp8
+--attention-backend trtllm_mla --stream-interval 30 --ep-size $EP_SIZE --moe-runner-backend flashinfer_trtllm --quantization fp8 \
+"${ENGINE_FLAGS[@]}"
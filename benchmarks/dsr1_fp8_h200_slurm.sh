@@ -23,44 +23,37 @@ SERVER_LOG=$(mktemp /tmp/server-XXXXXX.log)
 
 export TORCH_CUDA_ARCH_LIST="9.0"
 
+# Server knobs come from the master config (engine-args / engine-arg-rules); see utils/engine_args.py
+MAX_RUNNING_REQUESTS=$(python3 utils/engine_args.py get max-running-requests 256)
+MEM_FRACTION_STATIC=$(python3 utils/engine_args.py get mem-fraction-static 0.82)
+mapfile -t ENGINE_FLAGS < <(python3 utils/engine_args.py flags --exclude mem-fraction-static max-running-requests)
+
 set -x
-if [[ $ISL -eq 1024 && $OSL -eq 1024 ]]; then
-    PYTHONNOUSERSITE=1 python3 -m sglang.launch_server --model-path $MODEL --tokenizer-path $MODEL \
-    --host 0.0.0.0 --port $PORT --trust-remote-code \
-    --tensor-parallel-size=$TP --data-parallel-size=1 \
-    --disable-radix-cache --max-running-requests 512 --cuda-graph-max-bs 512 \
-    --chunked-prefill-size 32768 --max-prefill-tokens 32768 --mem-fraction-static 0.82 \
-    --attention-backend flashinfer --stream-interval 10 \
-    --decode-log-interval 1 \
-    > $SERVER_LOG 2>&1 &
-else
-    PYTHONNOUSERSITE=1 python3 -m sglang.launch_server --model-path $MODEL --tokenizer-path $MODEL \
+PYTHONNOUSERSITE=1 python3 -m sglang.launch_server --model-path $MODEL --tokenizer-path $MODEL \
     --host 0.0.0.0 --port $PORT --trust-remote-code \
     --tensor-parallel-size=$TP --data-parallel-size=1 \
-    --disable-radix-cache --max-running-requests 256 --cuda-graph-max-bs 256 \
-    --chunked-prefill-size 32768 --max-prefill-tokens 32768 --mem-fraction-static 0.82 \
+    --disable-radix-cache --max-running-requests $MAX_RUNNING_REQUESTS --cuda-graph-max-bs ${CUDA_GRAPH_MAX_BS:-$MAX_RUNNING_REQUESTS} \
+    --chunked-prefill-size 32768 --max-prefill-tokens 32768 --mem-fraction-static $MEM_FRACTION_STATIC \
     --attention-backend flashinfer --stream-interval 10 \
     --decode-log-interval 1 \
-    > $SERVER_LOG 2>&1 &
-fi
+    "${ENGINE_FLAGS[@]}" > $SERVER_LOG 2>&1 &
 
 set +x
-while IFS= read -r line; do
-    printf '%s\n' "$line"
-    if [[ "$line" == *"Application startup complete"* ]]; then
-        break
-    fi
-done < <(tail -F -n0 "$SERVER_LOG")
+SERVER_PID=$!
+python3 utils/wait_for_server.py --pid $SERVER_PID --log $SERVER_LOG --port $PORT --framework sglang \
+    --output startup_${RESULT_FILENAME}.json || exit 1
 
 set -x
-git clone https://github.com/kimbochen/bench_serving.git 
-python3 bench_serving/benchmark_serving.py \
---model $MODEL --backend vllm \
---base-url http://0.0.0.0:$PORT \
---dataset-name random \
---random-input-len $ISL --random-output-len $OSL --random-range-ratio $RANDOM_RANGE_RATIO \
---num-prompts $(( $CONC * 10 )) --max-concurrency $CONC \
---request-rate inf --ignore-eos \
---save-result --percentile-metrics 'ttft,tpot,itl,e2el' \
---result-dir /workspace/ \
---result-filename $RESULT_FILENAME.json
+source utils/bench_client.sh
+for CONC in ${CONC_LIST:-$CONC}; do
+    python3 $BENCH_CLIENT_PY \
+    --model $MODEL --backend vllm \
+    --base-url http://0.0.0.0:$PORT \
+    --dataset-name random \
+    --random-input-len $ISL --random-output-len $OSL --random-range-ratio $RANDOM_RANGE_RATIO \
+    --num-prompts $(( $CONC * 10 )) --max-concurrency $CONC \
+    --request-rate ${REQUEST_RATE:-inf} ${BURSTINESS:+--burstiness $BURSTINESS} --ignore-eos \
+    --save-result --save-detailed --percentile-metrics 'ttft,tpot,itl,e2el' \
+    --result-dir /workspace/ \
+    --result-filename ${RESULT_FILENAME}_conc${CONC}.json
+done
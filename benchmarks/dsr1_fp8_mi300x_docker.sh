@@ -24,13 +24,16 @@ fi
 
 export SGLANG_USE_AITER=1
 
+MEM_FRACTION_STATIC=$(python3 utils/engine_args.py get mem-fraction-static 0.8)
+mapfile -t ENGINE_FLAGS < <(python3 utils/engine_args.py flags --exclude mem-fraction-static)
 set -x
 python3 -m sglang.launch_server \
 --model-path=$MODEL --host=0.0.0.0 --port=$PORT --trust-remote-code \
 --tensor-parallel-size=$TP \
---mem-fraction-static=0.8 \
---cuda-graph-max-bs=128 \
+--mem-fraction-static=$MEM_FRACTION_STATIC \
+--cuda-graph-max-bs=${CUDA_GRAPH_MAX_BS:-128} \
 --chunked-prefill-size=196608 \
 --num-continuous-decode-steps=4 \
 --max-prefill-tokens=196608 \
---disable-radix-cache
+--disable-radix-cache \
+"${ENGINE_FLAGS[@]}"
@@ -14,6 +14,8 @@
 
 export SGLANG_USE_AITER=1
 
+MEM_FRACTION_STATIC=$(python3 utils/engine_args.py get mem-fraction-static 0.8)
+mapfile -t ENGINE_FLAGS < <(python3 utils/engine_args.py flags --exclude mem-fraction-static)
 python3 -m sglang.launch_server \
     --model-path $MODEL \
     --host=0.0.0.0 \
@@ -21,8 +23,8 @@ python3 -m sglang.launch_server \
     --tensor-parallel-size $TP \
     --trust-remote-code \
     --chunked-prefill-size 196608 \
-    --mem-fraction-static 0.8 --disable-radix-cache \
+    --mem-fraction-static $MEM_FRACTION_STATIC --disable-radix-cache \
     --num-continuous-decode-steps 4 \
     --max-prefill-tokens 196608 \
-    --cuda-graph-max-bs 128
-    
+    --cuda-graph-max-bs ${CUDA_GRAPH_MAX_BS:-128} \
+    "${ENGINE_FLAGS[@]}"
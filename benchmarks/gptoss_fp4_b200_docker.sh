@@ -34,7 +34,7 @@ cat > config.yaml << EOF
 compilation-config: '{"pass_config":{"enable_fi_allreduce_fusion":true,"enable_attn_fusion":true,"enable_noop":true},"custom_ops":["+rms_norm"],"cudagraph_mode":"FULL_AND_PIECEWISE"}'
 async-scheduling: true
 no-enable-prefix-caching: true
-cuda-graph-sizes: 2048
+cuda-graph-sizes: ${CUDA_GRAPH_MAX_BS:-2048}
 max-num-batched-tokens: 8192
 max-model-len: $CALCULATED_MAX_MODEL_LEN
 EOF
@@ -44,7 +44,10 @@ export VLLM_FLASHINFER_ALLREDUCE_FUSION_THRESHOLDS_MB='{"2":32,"4":32,"8":8}'
 export PYTHONNOUSERSITE=1
 export VLLM_USE_FLASHINFER_MOE_MXFP4_MXFP8=1
 
+GPU_MEMORY_UTILIZATION=$(python3 utils/engine_args.py get gpu-memory-utilization 0.9)
+mapfile -t ENGINE_FLAGS < <(python3 utils/engine_args.py flags --exclude gpu-memory-utilization)
 set -x
 vllm serve $MODEL --host 0.0.0.0 --port $PORT --config config.yaml \
---gpu-memory-utilization 0.9 --tensor-parallel-size $TP --max-num-seqs 512 \
---disable-log-requests
+--gpu-memory-utilization $GPU_MEMORY_UTILIZATION --tensor-parallel-size $TP --max-num-seqs 512 \
+--disable-log-requests \
+"${ENGINE_FLAGS[@]}"
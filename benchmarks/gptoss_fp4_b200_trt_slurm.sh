@@ -39,12 +39,12 @@ export NCCL_GRAPH_REGISTER=0
 cat > $EXTRA_CONFIG_FILE << EOF
 cuda_graph_config:
     enable_padding: true
-    max_batch_size: $CONC
+    max_batch_size: ${CUDA_GRAPH_MAX_BS:-$CONC}
 enable_attention_dp: $DP_ATTENTION
 kv_cache_config:
-    dtype: fp8
+    dtype: $(python3 utils/engine_args.py get kv-cache-dtype fp8)
     enable_block_reuse: false
-    free_gpu_memory_fraction: 0.85
+    free_gpu_memory_fraction: $(python3 utils/engine_args.py get free-gpu-memory-fraction 0.85)
 print_iter_log: true
 stream_interval: 20
 num_postprocess_workers: 4
@@ -80,22 +80,21 @@ mpirun -n 1 --oversubscribe --allow-run-as-root \
 
 
 set +x
-while IFS= read -r line; do
-    printf '%s\n' "$line"
-    if [[ "$line" == *"Application startup complete"* ]]; then
-        break
-    fi
-done < <(tail -F -n0 "$SERVER_LOG")
-
-git clone https://github.com/kimbochen/bench_serving.git
+SERVER_PID=$!
+python3 utils/wait_for_server.py --pid $SERVER_PID --log $SERVER_LOG --port $PORT --framework trtllm \
+    --output startup_${RESULT_FILENAME}.json || exit 1
+
+source utils/bench_client.sh
 set -x
-python3 bench_serving/benchmark_serving.py \
---model $MODEL --backend openai \
---base-url http://0.0.0.0:$PORT \
---dataset-name random \
---random-input-len $ISL --random-output-len $OSL --random-range-ratio $RANDOM_RANGE_RATIO \
---num-prompts $(( $CONC * 10 )) --max-concurrency $CONC \
---request-rate inf --ignore-eos \
---save-result --percentile-metrics 'ttft,tpot,itl,e2el' \
---result-dir /workspace/ \
---result-filename $RESULT_FILENAME.json
+for CONC in ${CONC_LIST:-$CONC}; do
+    python3 $BENCH_CLIENT_PY \
+    --model $MODEL --backend openai \
+    --base-url http://0.0.0.0:$PORT \
+    --dataset-name random \
+    --random-input-len $ISL --random-output-len $OSL --random-range-ratio $RANDOM_RANGE_RATIO \
+    --num-prompts $(( $CONC * 10 )) --max-concurrency $CONC \
+    --request-rate ${REQUEST_RATE:-inf} ${BURSTINESS:+--burstiness $BURSTINESS} --ignore-eos \
+    --save-result --save-detailed --percentile-metrics 'ttft,tpot,itl,e2el' \
+    --result-dir /workspace/ \
+    --result-filename ${RESULT_FILENAME}_conc${CONC}.json
+done
@@ -12,17 +12,20 @@ cat > config.yaml << EOF
 compilation-config: '{"cudagraph_mode":"PIECEWISE"}'
 async-scheduling: true
 no-enable-prefix-caching: true
-cuda-graph-sizes: 2048
+cuda-graph-sizes: ${CUDA_GRAPH_MAX_BS:-2048}
 max-num-batched-tokens: 8192
 max-model-len: 10240
 EOF
 
 export PYTHONNOUSERSITE=1
 
+GPU_MEMORY_UTILIZATION=$(python3 utils/engine_args.py get gpu-memory-utilization 0.9)
+mapfile -t ENGINE_FLAGS < <(python3 utils/engine_args.py flags --exclude gpu-memory-utilization)
 set -x
 vllm serve $MODEL --host=0.0.0.0 --port=$PORT \
 --config config.yaml \
---gpu-memory-utilization=0.9 \
+--gpu-memory-utilization=$GPU_MEMORY_UTILIZATION \
 --tensor-parallel-size=$TP \
 --max-num-seqs=$CONC  \
---disable-log-requests
+--disable-log-requests \
+"${ENGINE_FLAGS[@]}"
@@ -20,7 +20,7 @@ cat > config.yaml << EOF
 compilation-config: '{"cudagraph_mode":"PIECEWISE"}'
 async-scheduling: true
 no-enable-prefix-caching: true
-cuda-graph-sizes: 2048
+cuda-graph-sizes: ${CUDA_GRAPH_MAX_BS:-2048}
 max-num-batched-tokens: 8192
 max-model-len: 10240
 EOF
@@ -28,33 +28,34 @@ EOF
 SERVER_LOG=$(mktemp /tmp/server-XXXXXX.log)
 export TORCH_CUDA_ARCH_LIST="9.0"
 
+GPU_MEMORY_UTILIZATION=$(python3 utils/engine_args.py get gpu-memory-utilization 0.9)
+mapfile -t ENGINE_FLAGS < <(python3 utils/engine_args.py flags --exclude gpu-memory-utilization)
 set -x
 PYTHONNOUSERSITE=1 vllm serve $MODEL --host=0.0.0.0 --port=$PORT \
 --config config.yaml \
---gpu-memory-utilization=0.9 \
+--gpu-memory-utilization=$GPU_MEMORY_UTILIZATION \
 --tensor-parallel-size=$TP \
 --max-num-seqs=$CONC  \
---disable-log-requests > $SERVER_LOG 2>&1 &
+--disable-log-requests "${ENGINE_FLAGS[@]}" > $SERVER_LOG 2>&1 &
 
 set +x
-while IFS= read -r line; do
-    printf '%s\n' "$line"
-    if [[ "$line" == *"Application startup complete"* ]]; then
-        break
-    fi
-done < <(tail -F -n0 "$SERVER_LOG")
+SERVER_PID=$!
+python3 utils/wait_for_server.py --pid $SERVER_PID --log $SERVER_LOG --port $PORT --framework vllm \
+    --output startup_${RESULT_FILENAME}.json || exit 1
 
-pip install -q datasets pandas
-git clone https://github.com/kimbochen/bench_serving.git
+source utils/bench_client.sh
+$BENCH_CLIENT_SETUP
 set -x
-python3 bench_serving/benchmark_serving.py \
---model=$MODEL \
---backend=vllm \
---base-url="http://0.0.0.0:$PORT" \
---dataset-name=random \
---random-input-len=$ISL --random-output-len=$OSL --random-range-ratio=$RANDOM_RANGE_RATIO \
---num-prompts=$(( $CONC * 10 )) --max-concurrency=$CONC \
---request-rate=inf --ignore-eos \
---save-result --percentile-metrics='ttft,tpot,itl,e2el' \
---result-dir=/workspace/ \
---result-filename=$RESULT_FILENAME.json
+for CONC in ${CONC_LIST:-$CONC}; do
+    python3 $BENCH_CLIENT_PY \
+    --model=$MODEL \
+    --backend=vllm \
+    --base-url="http://0.0.0.0:$PORT" \
+    --dataset-name=random \
+    --random-input-len=$ISL --random-output-len=$OSL --random-range-ratio=$RANDOM_RANGE_RATIO \
+    --num-prompts=$(( $CONC * 10 )) --max-concurrency=$CONC \
+    --request-rate=${REQUEST_RATE:-inf} ${BURSTINESS:+--burstiness=$BURSTINESS} --ignore-eos \
+    --save-result --save-detailed --percentile-metrics='ttft,tpot,itl,e2el' \
+    --result-dir=/workspace/ \
+    --result-filename=${RESULT_FILENAME}_conc${CONC}.json
+done
@@ -24,14 +24,17 @@ export VLLM_ROCM_USE_AITER_MHA=0
 export VLLM_ROCM_USE_AITER_TRITON_BF16_GEMM=0 
 export VLLM_ROCM_QUICK_REDUCE_QUANTIZATION=INT4
 
+GPU_MEMORY_UTILIZATION=$(python3 utils/engine_args.py get gpu-memory-utilization 0.95)
+mapfile -t ENGINE_FLAGS < <(python3 utils/engine_args.py flags --exclude gpu-memory-utilization)
 set -x
 vllm serve $MODEL --port $PORT \
 --tensor-parallel-size=$TP \
---gpu-memory-utilization 0.95 \
+--gpu-memory-utilization $GPU_MEMORY_UTILIZATION \
 --max-model-len $MAX_MODEL_LEN \
 --max-seq-len-to-capture $MAX_MODEL_LEN \
 --compilation-config  '{"cudagraph_mode": "FULL_AND_PIECEWISE"}' \
 --block-size=64 \
 --no-enable-prefix-caching \
 --disable-log-requests \
---async-scheduling
+--async-scheduling \
+"${ENGINE_FLAGS[@]}"
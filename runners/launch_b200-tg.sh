@@ -8,44 +8,46 @@ server_name="bmk-server"
 client_name="bmk-client"
 
 set -x
+# Persistent compile caches on the HF cache mount, keyed by image, model and parallel layout
+eval "$(python3 utils/compile_cache.py prepare --root ${HF_HUB_CACHE_MOUNT}compile_cache --mount-root ${HF_HUB_CACHE}compile_cache --output compile_cache_${RESULT_FILENAME}.json)"
 docker run --rm -d --network host --name $server_name \
 --runtime nvidia --gpus all --ipc host --privileged --shm-size=16g --ulimit memlock=-1 --ulimit stack=67108864 \
 -v $HF_HUB_CACHE_MOUNT:$HF_HUB_CACHE \
 -v $GITHUB_WORKSPACE:/workspace/ -w /workspace/ \
--e HF_TOKEN -e HF_HUB_CACHE -e MODEL -e TP -e CONC -e MAX_MODEL_LEN -e ISL -e OSL -e PORT=$PORT -e EP_SIZE \
+-e HF_TOKEN -e HF_HUB_CACHE -e MODEL -e TP -e CONC -e CUDA_GRAPH_MAX_BS -e CUDA_GRAPH_SIZES -e COMPILE_SIZES -e VLLM_CACHE_ROOT -e TORCHINDUCTOR_CACHE_DIR -e TRITON_CACHE_DIR -e XDG_CACHE_HOME -e ENGINE_ARGS -e MAX_MODEL_LEN -e ISL -e OSL -e PORT=$PORT -e EP_SIZE \
 -e TORCH_CUDA_ARCH_LIST="10.0" -e CUDA_DEVICE_ORDER=PCI_BUS_ID -e CUDA_VISIBLE_DEVICES="0,1,2,3,4,5,6,7" \
 --entrypoint=/bin/bash \
 $(echo "$IMAGE" | sed 's/#/\//') \
 benchmarks/"${EXP_NAME%%_*}_${PRECISION}_b200${FRAMEWORK_SUFFIX}_docker.sh"
 
 set +x
-while IFS= read -r line; do
-    printf '%s\n' "$line"
-    if [[ "$line" =~ Application\ startup\ complete ]]; then
-        break
-    fi
-done < <(docker logs -f --tail=0 $server_name 2>&1)
+python3 utils/wait_for_server.py --container $server_name --port $PORT \
+    --output startup_${RESULT_FILENAME}.json || exit 1
 
-git clone https://github.com/kimbochen/bench_serving.git
+source utils/bench_client.sh
 
 set -x
-docker run --rm --network host --name $client_name \
--v $GITHUB_WORKSPACE:/workspace/ -w /workspace/ \
--e HF_TOKEN -e PYTHONPYCACHEPREFIX=/tmp/pycache/ \
---entrypoint=/bin/bash \
-$(echo "$IMAGE" | sed 's/#/\//') \
--lc "pip install -q datasets pandas && \
-python3 bench_serving/benchmark_serving.py \
---model $MODEL  --backend vllm --base-url http://localhost:$PORT \
---dataset-name random \
---random-input-len $ISL --random-output-len $OSL --random-range-ratio $RANDOM_RANGE_RATIO \
---num-prompts $(( $CONC * 10 )) \
---max-concurrency $CONC \
---request-rate inf --ignore-eos \
---save-result --percentile-metrics 'ttft,tpot,itl,e2el' \
---result-dir /workspace/ --result-filename $RESULT_FILENAME.json"
+for CONC in ${CONC_LIST:-$CONC}; do
+    docker run --rm --network host --name $client_name \
+    -v $GITHUB_WORKSPACE:/workspace/ -w /workspace/ \
+    -e HF_TOKEN -e PYTHONPYCACHEPREFIX=/tmp/pycache/ \
+    --entrypoint=/bin/bash \
+    $(echo "$IMAGE" | sed 's/#/\//') \
+    -lc "$BENCH_CLIENT_SETUP && \
+    python3 $BENCH_CLIENT_PY \
+    --model $MODEL  --backend vllm --base-url http://localhost:$PORT \
+    --dataset-name random \
+    --random-input-len $ISL --random-output-len $OSL --random-range-ratio $RANDOM_RANGE_RATIO \
+    --num-prompts $(( $CONC * 10 )) \
+    --max-concurrency $CONC \
+    --request-rate ${REQUEST_RATE:-inf} ${BURSTINESS:+--burstiness $BURSTINESS} --ignore-eos \
+    --save-result --save-detailed --percentile-metrics 'ttft,tpot,itl,e2el' \
+    --result-dir /workspace/ --result-filename ${RESULT_FILENAME}_conc${CONC}.json"
+done
 
 while [ -n "$(docker ps -aq)" ]; do
     docker stop $server_name
     sleep 5
 done
+
+python3 utils/compile_cache.py finish --root ${HF_HUB_CACHE_MOUNT}compile_cache
@@ -14,8 +14,8 @@ if [[ $FRAMEWORK == "dynamo-sglang" ]]; then
     export MODEL_PATH="/mnt/lustre01/models/deepseek-r1-0528"
     export CONFIG_DIR="/mnt/lustre01/artifacts/sglang-configs/1k1k"
 else
-    SQUASH_FILE="/mnt/lustre01/users/sa-shared/images/$(echo "$IMAGE" | sed 's/[\/:@#]/_/g').sqsh"
-    srun --partition=$SLURM_PARTITION --exclusive --time=180 bash -c "enroot import -o $SQUASH_FILE docker://$IMAGE"
+    SQUASH_FILE=$(srun --partition=$SLURM_PARTITION --exclusive --time=180 \
+        python3 utils/squash_cache.py --cache-dir /mnt/lustre01/users/sa-shared/images --image $IMAGE) || exit 1
 
     # Update the IMAGE variable to the squash file
     export IMAGE=$SQUASH_FILE
@@ -2,19 +2,20 @@
 
 HF_HUB_CACHE_MOUNT="/mnt/vast/hf_hub_cache/"
 PARTITION="h100"
-SQUASH_FILE="/mnt/vast/squash/$(echo "$IMAGE" | sed 's/[\/:@#]/_/g').sqsh"
 
 salloc --partition=$PARTITION --gres=gpu:$TP --exclusive --time=180 --no-shell
 JOB_ID=$(squeue -u $USER -h -o %A | head -n1)
 
 set -x
-srun --jobid=$JOB_ID bash -c "enroot import -o $SQUASH_FILE docker://$IMAGE"
+SQUASH_FILE=$(srun --jobid=$JOB_ID python3 utils/squash_cache.py --cache-dir /mnt/vast/squash --image $IMAGE) \
+    || { scancel $JOB_ID; exit 1; }
 srun --jobid=$JOB_ID \
 --container-image=$SQUASH_FILE \
 --container-mounts=$GITHUB_WORKSPACE:/workspace/,$HF_HUB_CACHE_MOUNT:$HF_HUB_CACHE \
 --container-mount-home \
 --container-workdir=/workspace/ \
 --no-container-entrypoint --export=ALL,PORT=8888 \
-bash benchmarks/${EXP_NAME%%_*}_${PRECISION}_h100_slurm.sh
+python3 utils/compile_cache.py run --root ${HF_HUB_CACHE}compile_cache --output compile_cache_${RESULT_FILENAME}.json \
+-- bash benchmarks/${EXP_NAME%%_*}_${PRECISION}_h100_slurm.sh
 
 scancel $JOB_ID
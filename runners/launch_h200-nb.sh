@@ -7,7 +7,6 @@ MODEL_CODE="${EXP_NAME%%_*}"
 FRAMEWORK_SUFFIX=$([[ "$FRAMEWORK" == "trt" ]] && printf '_trt' || printf '')
 
 PARTITION="main"
-SQUASH_FILE="/home/squash/$(echo "$IMAGE" | sed 's/[\/:@#]/_/g').sqsh"
 
 salloc --partition=$PARTITION --gres=gpu:$TP --exclusive --time=180 --no-shell
 JOB_ID=$(squeue -u $USER -h -o %A | head -n1)
@@ -17,7 +16,8 @@ set -x
 if [[ "$MODEL" == "openai/gpt-oss-120b" && "$FRAMEWORK" == "trt" ]]; then
     CONTAINER_IMAGE=$IMAGE
 else
-    srun --jobid=$JOB_ID bash -c "enroot import -o $SQUASH_FILE docker://$IMAGE"
+    SQUASH_FILE=$(srun --jobid=$JOB_ID python3 utils/squash_cache.py --cache-dir /home/squash --image $IMAGE) \
+        || { scancel $JOB_ID; exit 1; }
     CONTAINER_IMAGE=$(realpath $SQUASH_FILE)
 fi
 
@@ -27,6 +27,7 @@ srun --jobid=$JOB_ID \
 --container-mount-home \
 --container-workdir=/workspace/ \
 --no-container-entrypoint --export=ALL \
-bash benchmarks/${MODEL_CODE}_${PRECISION}_h200${FRAMEWORK_SUFFIX}_slurm.sh
+python3 utils/compile_cache.py run --root ${HF_HUB_CACHE}compile_cache --output compile_cache_${RESULT_FILENAME}.json \
+-- bash benchmarks/${MODEL_CODE}_${PRECISION}_h200${FRAMEWORK_SUFFIX}_slurm.sh
 
 scancel $JOB_ID
@@ -12,45 +12,47 @@ client_name="bmk-client"
 docker network create $network_name
 
 set -x
+# Persistent compile caches on the HF cache mount, keyed by image, model and parallel layout
+eval "$(python3 utils/compile_cache.py prepare --root ${HF_HUB_CACHE_MOUNT}compile_cache --mount-root ${HF_HUB_CACHE}compile_cache --output compile_cache_${RESULT_FILENAME}.json)"
 docker run --rm -d --ipc=host --shm-size=16g --network=$network_name --name=$server_name \
 --privileged --cap-add=CAP_SYS_ADMIN --device=/dev/kfd --device=/dev/dri --device=/dev/mem \
 --cap-add=SYS_PTRACE --security-opt seccomp=unconfined \
 -v $HF_HUB_CACHE_MOUNT:$HF_HUB_CACHE \
 -v $GITHUB_WORKSPACE:/workspace/ -w /workspace/ \
--e HF_TOKEN -e HF_HUB_CACHE -e MODEL -e TP -e CONC -e MAX_MODEL_LEN -e PORT=$PORT \
+-e HF_TOKEN -e HF_HUB_CACHE -e MODEL -e TP -e CONC -e CUDA_GRAPH_MAX_BS -e CUDA_GRAPH_SIZES -e COMPILE_SIZES -e VLLM_CACHE_ROOT -e TORCHINDUCTOR_CACHE_DIR -e TRITON_CACHE_DIR -e XDG_CACHE_HOME -e ENGINE_ARGS -e MAX_MODEL_LEN -e PORT=$PORT \
 -e ISL -e OSL \
 --entrypoint=/bin/bash \
 $IMAGE \
 benchmarks/"${EXP_NAME%%_*}_${PRECISION}_mi300x_docker.sh"
 
 set +x
-while IFS= read -r line; do
-    printf '%s\n' "$line"
-    if [[ "$line" =~ Application\ startup\ complete ]]; then
-        break
-    fi
-done < <(docker logs -f --tail=0 $server_name 2>&1)
+python3 utils/wait_for_server.py --container $server_name --port $PORT \
+    --output startup_${RESULT_FILENAME}.json || exit 1
 
-git clone https://github.com/kimbochen/bench_serving.git
+source utils/bench_client.sh
 
 set -x
-docker run --rm --network=$network_name --name=$client_name \
--v $GITHUB_WORKSPACE:/workspace/ -w /workspace/ \
--e HF_TOKEN -e PYTHONPYCACHEPREFIX=/tmp/pycache/ \
---entrypoint=python3 \
-$IMAGE \
-bench_serving/benchmark_serving.py \
---model=$MODEL --backend=vllm --base-url=http://$server_name:$PORT \
---dataset-name=random \
---random-input-len=$ISL --random-output-len=$OSL --random-range-ratio=$RANDOM_RANGE_RATIO \
---num-prompts=$(( $CONC * 10 )) \
---max-concurrency=$CONC \
---request-rate=inf --ignore-eos \
---save-result --percentile-metrics="ttft,tpot,itl,e2el" \
---result-dir=/workspace/ --result-filename=$RESULT_FILENAME.json
+for CONC in ${CONC_LIST:-$CONC}; do
+    docker run --rm --network=$network_name --name=$client_name \
+    -v $GITHUB_WORKSPACE:/workspace/ -w /workspace/ \
+    -e HF_TOKEN -e PYTHONPYCACHEPREFIX=/tmp/pycache/ \
+    --entrypoint=python3 \
+    $IMAGE \
+    $BENCH_CLIENT_PY \
+    --model=$MODEL --backend=vllm --base-url=http://$server_name:$PORT \
+    --dataset-name=random \
+    --random-input-len=$ISL --random-output-len=$OSL --random-range-ratio=$RANDOM_RANGE_RATIO \
+    --num-prompts=$(( $CONC * 10 )) \
+    --max-concurrency=$CONC \
+    --request-rate=${REQUEST_RATE:-inf} ${BURSTINESS:+--burstiness=$BURSTINESS} --ignore-eos \
+    --save-result --save-detailed --percentile-metrics="ttft,tpot,itl,e2el" \
+    --result-dir=/workspace/ --result-filename=${RESULT_FILENAME}_conc${CONC}.json
+done
 
 while [ -n "$(docker ps -aq)" ]; do
     docker stop $server_name
     docker network rm $network_name
     sleep 5
 done
+
+python3 utils/compile_cache.py finish --root ${HF_HUB_CACHE_MOUNT}compile_cache
@@ -0,0 +1,484 @@
+import os
+import ssl
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import statistics
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit
+
+
+# Token ids used for random prompts; the range is valid for every served model's vocabulary
+RANDOM_TOKEN_ID_RANGE = (1000, 30000)
+
+DEFAULT_PERCENTILE_METRICS = 'ttft,tpot,itl'
+DEFAULT_METRIC_PERCENTILES = '99'
+
+# Busy fraction of a core above which a client process is likely inflating measured latencies
+CLIENT_CPU_SATURATION = 0.9
+
+
+class ConnectionPool:
+    """Pool of keep-alive HTTP/1.1 connections to a single host."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.ssl = ssl.create_default_context() if parts.scheme == 'https' else None
+        self.port = parts.port or (443 if self.ssl else 80)
+        self.base_path = parts.path.rstrip('/')
+        self.idle = []
+
+    async def acquire(self):
+        while self.idle:
+            reader, writer = self.idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl, limit=1 << 20)
+
+    def release(self, conn, reusable):
+        if reusable:
+            self.idle.append(conn)
+        else:
+            conn[1].close()
+
+    async def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle = []
+
+
+async def _read_response_head(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Connection closed before response')
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return status, headers
+
+
+async def _iter_body(reader, headers):
+    """Yield raw body chunks as they arrive (chunked, fixed-length or until close)."""
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                # Trailer section ends with an empty line
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return
+            yield await reader.readexactly(size)
+            await reader.readexactly(2)
+    elif 'content-length' in headers:
+        remaining = int(headers['content-length'])
+        while remaining > 0:
+            chunk = await reader.read(min(remaining, 1 << 16))
+            if not chunk:
+                raise ConnectionError('Connection closed mid-body')
+            remaining -= len(chunk)
+            yield chunk
+    else:
+        while chunk := await reader.read(1 << 16):
+            yield chunk
+
+
+async def post_sse(pool, path, payload):
+    """POST a JSON payload and yield (monotonic timestamp, data) for every server-sent event.
+
+    Events are parsed incrementally as body chunks arrive, so timestamps reflect
+    arrival of each event rather than of the full response.
+    """
+    body = json.dumps(payload).encode()
+    request = (
+        f'POST {pool.base_path}{path} HTTP/1.1\r\n'
+        f'Host: {pool.host}:{pool.port}\r\n'
+        'Content-Type: application/json\r\n'
+        'Accept: text/event-stream\r\n'
+        'Connection: keep-alive\r\n'
+        f"Authorization: Bearer {os.environ.get('OPENAI_API_KEY', 'EMPTY')}\r\n"
+        f'Content-Length: {len(body)}\r\n\r\n'
+    ).encode() + body
+
+    conn = await pool.acquire()
+    reader, writer = conn
+    reusable = False
+    try:
+        writer.write(request)
+        await writer.drain()
+        status, headers = await _read_response_head(reader)
+        if status != 200:
+            error_body = b''.join([chunk async for chunk in _iter_body(reader, headers)])
+            reusable = headers.get('connection', '').lower() != 'close'
+            raise RuntimeError(f'HTTP {status}: {error_body.decode(errors="replace")[:500]}')
+
+        buf = b''
+        async for chunk in _iter_body(reader, headers):
+            now = time.perf_counter()
+            buf += chunk.replace(b'\r\n', b'\n')
+            while b'\n\n' in buf:
+                event, buf = buf.split(b'\n\n', 1)
+                data = '\n'.join(line[5:].lstrip() for line in event.decode().split('\n') if line.startswith('data:'))
+                if data:
+                    yield now, data
+        reusable = headers.get('connection', '').lower() != 'close' and (
+            'content-length' in headers or 'transfer-encoding' in headers)
+    finally:
+        pool.release(conn, reusable)
+
+
+def build_payload(args, prompt, output_len):
+    common = {
+        'model': args.served_model_name or args.model,
+        'temperature': 0.0,
+        'stream': True,
+        'stream_options': {'include_usage': True},
+        'ignore_eos': args.ignore_eos,
+    }
+    if args.backend == 'openai-chat':
+        return '/v1/chat/completions', {**common, 'messages': [{'role': 'user', 'content': prompt}],
+                                        'max_completion_tokens': output_len}
+    return '/v1/completions', {**common, 'prompt': prompt, 'max_tokens': output_len}
+
+
+async def send_request(pool, args, prompt, input_len, output_len, t0):
+    """Send one streaming request and record per-chunk timing on the monotonic clock."""
+    path, payload = build_payload(args, prompt, output_len)
+    output = {
+        'success': False, 'start_time': time.perf_counter() - t0, 'ttft': 0.0, 'itl': [], 'latency': 0.0,
+        'prompt_len': input_len, 'output_len': 0, 'generated_text': '', 'error': '',
+    }
+    start = time.perf_counter()
+    last = start
+    n_chunks = 0
+    text = []
+    try:
+        async for timestamp, data in post_sse(pool, path, payload):
+            # Keep reading past [DONE] so the body is fully consumed and the connection reusable
+            if data == '[DONE]':
+                continue
+            message = json.loads(data)
+            if message.get('usage'):
+                output['output_len'] = message['usage'].get('completion_tokens', output['output_len'])
+                if message['usage'].get('prompt_tokens'):
+                    output['prompt_len'] = message['usage']['prompt_tokens']
+            choices = message.get('choices') or []
+            if not choices:
+                continue
+            choice = choices[0]
+            piece = choice.get('text') if 'text' in choice else (choice.get('delta') or {}).get('content')
+            if not piece:
+                continue
+            if n_chunks == 0:
+                output['ttft'] = timestamp - start
+            else:
+                output['itl'].append(timestamp - last)
+            last = timestamp
+            n_chunks += 1
+            text.append(piece)
+
+        output['latency'] = time.perf_counter() - start
+        output['generated_text'] = ''.join(text)
+        output['output_len'] = output['output_len'] or n_chunks
+        output['success'] = n_chunks > 0
+        if not output['success']:
+            output['error'] = 'No tokens received'
+    except Exception as e:
+        output['error'] = f'{type(e).__name__}: {e}'
+    return output
+
+
+def sample_requests(args):
+    """Random dataset matching bench_serving's: lengths uniform in [len * range_ratio, len]."""
+    rng = random.Random(args.seed)
+    requests = []
+    for _ in range(args.num_prompts):
+        input_len = rng.randint(int(args.random_input_len * args.random_range_ratio), args.random_input_len)
+        output_len = rng.randint(max(1, int(args.random_output_len * args.random_range_ratio)), args.random_output_len)
+        token_ids = [rng.randrange(*RANDOM_TOKEN_ID_RANGE) for _ in range(input_len)]
+        if args.backend == 'openai-chat':
+            # Chat endpoints take text; one short token-like word per token id
+            prompt = ' '.join(f'w{t}' for t in token_ids)
+        else:
+            prompt = token_ids
+        requests.append((prompt, input_len, output_len))
+    return requests
+
+
+def arrival_times(n, request_rate, burstiness=1.0, seed=0):
+    """Send times (s from the start of the run) of n requests.
+
+    Gaps are gamma distributed with mean 1 / request_rate and shape burstiness, like
+    bench_serving's --burstiness: 1 is a Poisson process, lower values send requests
+    in tighter bursts. With an infinite rate every request is due at once.
+    """
+    if request_rate == float('inf'):
+        return [0.0] * n
+    rng = random.Random(seed)
+    times, t = [], 0.0
+    for _ in range(n):
+        times.append(t)
+        t += rng.gammavariate(burstiness, 1.0 / (request_rate * burstiness))
+    return times
+
+
+async def _dispatch(arrivals, t0):
+    """Yield (request index, lateness) as each request comes due.
+
+    Every request sleeps until its absolute deadline t0 + arrival, so a late wakeup
+    (event-loop lag) delays that one request but does not shift the ones after it.
+    """
+    for i, arrival in enumerate(arrivals):
+        delay = t0 + arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield i, time.perf_counter() - t0 - arrival
+
+
+async def check_server(args, request):
+    """Send one request before the run so misconfiguration fails fast."""
+    pool = ConnectionPool(args.base_url)
+    output = await send_request(pool, args, *request, time.perf_counter())
+    await pool.close()
+    if not output['success']:
+        raise ValueError(f'Initial test request failed: {output["error"]}')
+
+
+async def run_shard(args, requests, max_concurrency, arrivals, start_at):
+    """Run a share of the requests on this process's event loop and connection pool.
+
+    arrivals are the requests' send times from start_at, a time.monotonic() deadline
+    shared by all shards so their schedules and start_times line up. Each output
+    records its scheduled_time and schedule_lag (how late it was dispatched).
+    Returns (outputs, finish time, client CPU utilization).
+    """
+    pool = ConnectionPool(args.base_url)
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def limited(request):
+        if semaphore is None:
+            return await send_request(pool, args, *request, t0)
+        async with semaphore:
+            return await send_request(pool, args, *request, t0)
+
+    await asyncio.sleep(max(0.0, start_at - time.monotonic()))
+    t0 = time.perf_counter()
+    cpu_start = time.process_time()
+    tasks, lags = [], []
+    async for i, lag in _dispatch(arrivals, t0):
+        tasks.append(asyncio.create_task(limited(requests[i])))
+        lags.append(lag)
+    outputs = await asyncio.gather(*tasks)
+    for output, arrival, lag in zip(outputs, arrivals, lags):
+        output['scheduled_time'] = arrival
+        output['schedule_lag'] = lag
+    finish = time.monotonic()
+    cpu_util = (time.process_time() - cpu_start) / max(time.perf_counter() - t0, 1e-9)
+    await pool.close()
+    return outputs, finish, cpu_util
+
+
+def _shard_main(args, requests, max_concurrency, arrivals, start_at, core):
+    if core is not None and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {core})
+    return asyncio.run(run_shard(args, requests, max_concurrency, arrivals, start_at))
+
+
+def run_benchmark(args, requests):
+    """Run the benchmark, sharded over args.num_workers processes when more than one.
+
+    The arrival schedule is drawn once and requests are dealt round-robin to shards
+    with their send times; the concurrency budget is split evenly, so the aggregate
+    load matches a single client. Each shard
+    is pinned to its own core when the platform allows it. Returns (outputs in
+    request order, duration, per-shard CPU utilization).
+    """
+    asyncio.run(check_server(args, requests[0]))
+
+    arrivals = arrival_times(len(requests), args.request_rate, args.burstiness, args.seed)
+    concurrency = args.max_concurrency
+    n_workers = max(1, min(args.num_workers, concurrency or args.num_workers, len(requests)))
+    if n_workers == 1:
+        start_at = time.monotonic()
+        outputs, finish, cpu_util = asyncio.run(
+            run_shard(args, requests, concurrency, arrivals, start_at))
+        return outputs, finish - start_at, [cpu_util]
+
+    cores = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else []
+    shard_indices = [list(range(k, len(requests), n_workers)) for k in range(n_workers)]
+    # Leave time for every process to start before the common start
+    start_at = time.monotonic() + max(1.0, 0.1 * n_workers)
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context('fork')) as pool:
+        futures = [
+            pool.submit(
+                _shard_main, args, [requests[i] for i in indices],
+                concurrency // n_workers + (k < concurrency % n_workers) if concurrency else None,
+                [arrivals[i] for i in indices], start_at,
+                cores[k % len(cores)] if len(cores) >= n_workers else None,
+            )
+            for k, indices in enumerate(shard_indices)
+        ]
+        shard_results = [f.result() for f in futures]
+
+    outputs = [None] * len(requests)
+    for indices, (shard_outputs, _, _) in zip(shard_indices, shard_results):
+        for i, output in zip(indices, shard_outputs):
+            outputs[i] = output
+    duration = max(finish for _, finish, _ in shard_results) - start_at
+    return outputs, duration, [cpu_util for _, _, cpu_util in shard_results]
+
+
+def _percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    rank = (len(values) - 1) * p / 100
+    lo = int(rank)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (rank - lo)
+
+
+def calculate_metrics(outputs, duration, percentile_metrics, metric_percentiles):
+    """Summary metrics in bench_serving's result schema (latencies in ms)."""
+    completed = [o for o in outputs if o['success']]
+    total_input = sum(o['prompt_len'] for o in completed)
+    total_output = sum(o['output_len'] for o in completed)
+    samples = {
+        'ttft': [o['ttft'] for o in completed],
+        'tpot': [(o['latency'] - o['ttft']) / (o['output_len'] - 1) for o in completed if o['output_len'] > 1],
+        'itl': [itl for o in completed for itl in o['itl']],
+        'e2el': [o['latency'] for o in completed],
+    }
+
+    result = {
+        'duration': duration,
+        'completed': len(completed),
+        'total_input_tokens': total_input,
+        'total_output_tokens': total_output,
+        'request_throughput': len(completed) / duration,
+        'output_throughput': total_output / duration,
+        'total_token_throughput': (total_input + total_output) / duration,
+    }
+    for metric in percentile_metrics:
+        values = [v * 1000 for v in samples[metric]]
+        result[f'mean_{metric}_ms'] = statistics.fmean(values) if values else 0.0
+        result[f'median_{metric}_ms'] = statistics.median(values) if values else 0.0
+        result[f'std_{metric}_ms'] = statistics.pstdev(values) if values else 0.0
+        for p in metric_percentiles:
+            result[f'p{p:g}_{metric}_ms'] = _percentile(values, p)
+    return result
+
+
+def schedule_metrics(outputs):
+    """How closely an open-loop run kept its arrival schedule (ms).
+
+    max_schedule_lag is the latest a request was dispatched after its send time
+    (client event-loop lag). queue_delay is the time from a request's send time until
+    a --max-concurrency slot let it go out; it grows without bound once the offered
+    load exceeds what the server sustains at that concurrency.
+    """
+    delays = [(o['start_time'] - o['scheduled_time']) * 1000 for o in outputs]
+    return {
+        'max_schedule_lag_ms': max(o['schedule_lag'] for o in outputs) * 1000,
+        'mean_queue_delay_ms': statistics.fmean(delays),
+        'p99_queue_delay_ms': _percentile(delays, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Async load generator for OpenAI-compatible servers, CLI- and result-compatible with bench_serving')
+    parser.add_argument('--backend', default='vllm', choices=['vllm', 'sglang', 'openai', 'openai-chat'],
+                        help="'openai-chat' uses /v1/chat/completions, everything else /v1/completions")
+    parser.add_argument('--base-url', required=True, help='Server URL, e.g. http://0.0.0.0:8888')
+    parser.add_argument('--model', required=True)
+    parser.add_argument('--served-model-name', required=False, help='Model name sent in requests (default: --model)')
+    parser.add_argument('--tokenizer', required=False, help='Accepted for compatibility; prompts are token ids')
+    parser.add_argument('--dataset-name', default='random', choices=['random'])
+    parser.add_argument('--random-input-len', type=int, default=1024)
+    parser.add_argument('--random-output-len', type=int, default=128)
+    parser.add_argument('--random-range-ratio', type=float, default=1.0)
+    parser.add_argument('--num-prompts', type=int, default=1000)
+    parser.add_argument('--max-concurrency', type=int, required=False)
+    parser.add_argument('--request-rate', type=float, default=float('inf'))
+    parser.add_argument('--burstiness', type=float, default=1.0,
+                        help='Shape of the gamma distributed request gaps; 1 is Poisson, lower is burstier (default: 1.0)')
+    parser.add_argument('--num-workers', type=int, default=1,
+                        help='Client processes to shard the concurrency budget over, each pinned to its own core (default: 1)')
+    parser.add_argument('--ignore-eos', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--percentile-metrics', default=DEFAULT_PERCENTILE_METRICS)
+    parser.add_argument('--metric-percentiles', default=DEFAULT_METRIC_PERCENTILES)
+    parser.add_argument('--save-result', action='store_true')
+    parser.add_argument('--save-detailed', action='store_true', help='Also save per-request arrays (ttfts, itls, ...)')
+    parser.add_argument('--result-dir', default='.')
+    parser.add_argument('--result-filename', required=False)
+    args = parser.parse_args()
+    if args.burstiness <= 0:
+        parser.error('--burstiness must be positive')
+
+    percentile_metrics = [m.strip() for m in args.percentile_metrics.split(',') if m.strip()]
+    metric_percentiles = [float(p) for p in args.metric_percentiles.split(',')]
+
+    requests = sample_requests(args)
+    outputs, duration, cpu_utils = run_benchmark(args, requests)
+    metrics = calculate_metrics(outputs, duration, percentile_metrics, metric_percentiles)
+    if args.request_rate != float('inf'):
+        metrics.update(schedule_metrics(outputs))
+    metrics['client_num_workers'] = len(cpu_utils)
+    metrics['client_cpu_util_mean'] = statistics.fmean(cpu_utils)
+    metrics['client_cpu_util_max'] = max(cpu_utils)
+
+    result = {
+        'date': datetime.now().strftime('%Y%m%d-%H%M%S'),
+        'backend': args.backend,
+        'model_id': args.model,
+        'tokenizer_id': args.tokenizer or args.model,
+        'num_prompts': args.num_prompts,
+        'request_rate': args.request_rate if args.request_rate != float('inf') else 'inf',
+        'burstiness': args.burstiness,
+        'max_concurrency': args.max_concurrency,
+        **metrics,
+    }
+    print(json.dumps(metrics, indent=2))
+
+    if metrics['client_cpu_util_max'] > CLIENT_CPU_SATURATION:
+        print(f"Warning: a client process used {metrics['client_cpu_util_max']:.0%} of a core; measured latencies "
+              f"may include client overhead. Consider a higher --num-workers.", file=sys.stderr)
+
+    n_failed = len(outputs) - metrics['completed']
+    if n_failed:
+        errors = sorted({o['error'] for o in outputs if o['error']})
+        print(f'{n_failed} requests failed: {errors[:5]}', file=sys.stderr)
+
+    if args.save_result:
+        if args.save_detailed:
+            result.update({
+                'input_lens': [o['prompt_len'] for o in outputs],
+                'output_lens': [o['output_len'] for o in outputs],
+                'ttfts': [o['ttft'] for o in outputs],
+                'itls': [o['itl'] for o in outputs],
+                'start_times': [o['start_time'] for o in outputs],
+                'scheduled_times': [o['scheduled_time'] for o in outputs],
+                'generated_texts': [o['generated_text'] for o in outputs],
+                'errors': [o['error'] for o in outputs],
+            })
+        result_filename = args.result_filename or f"{args.backend}-{args.request_rate}qps-{args.model.split('/')[-1]}-{result['date']}.json"
+        os.makedirs(args.result_dir, exist_ok=True)
+        with open(os.path.join(args.result_dir, result_filename), 'w') as f:
+            json.dump(result, f)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+# Sourced by the benchmark scripts and launchers before their client loop, from the
+# workspace root. Sets BENCH_CLIENT_PY to the benchmark client to run with python3, and
+# BENCH_CLIENT_SETUP to a command installing what it needs (run it where the client runs).
+#
+# By default this is utils/bench_client.py, which takes bench_serving's arguments and
+# writes its result schema with nothing beyond python3. BENCH_CLIENT=bench_serving falls
+# back to cloning the external bench_serving client, except for open-loop entries
+# (REQUEST_RATE set): their arrivals are sent on bench_client.py's drift-free schedule,
+# which also reports the queue delay the load curves show.
+if [[ "${BENCH_CLIENT:-builtin}" == "bench_serving" && -n "$REQUEST_RATE" ]]; then
+    echo "Open-loop entry (REQUEST_RATE=$REQUEST_RATE): using utils/bench_client.py instead of bench_serving" >&2
+fi
+if [[ "${BENCH_CLIENT:-builtin}" == "bench_serving" && -z "$REQUEST_RATE" ]]; then
+    [[ -d bench_serving ]] || git clone https://github.com/kimbochen/bench_serving.git
+    BENCH_CLIENT_PY=bench_serving/benchmark_serving.py
+    BENCH_CLIENT_SETUP="pip install -q datasets pandas"
+else
+    BENCH_CLIENT_PY=utils/bench_client.py
+    BENCH_CLIENT_SETUP=true
+fi
@@ -0,0 +1,101 @@
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+
+UTILS_DIR = Path(__file__).resolve().parent
+
+HW = ['h100', 'h200', 'b200', 'mi300x', 'mi325x', 'mi355x']
+FRAMEWORKS = ['vllm', 'sglang', 'trt']
+PRECISIONS = ['fp8', 'fp4']
+MODELS = ['deepseek-ai/DeepSeek-R1-0528', 'openai/gpt-oss-120b', 'meta-llama/Llama-3.3-70B-Instruct']
+SEQ_LENS = [(1024, 1024), (1024, 8192), (8192, 1024)]
+
+
+def synthetic_result(rng, i):
+    isl, osl = rng.choice(SEQ_LENS)
+    conc = 2 ** rng.randint(2, 9)
+    tpot = 0.005 + 0.0005 * conc * rng.uniform(0.5, 1.5)
+    e2el = rng.uniform(0.05, 2.0) + osl * tpot
+    result = {
+        'hw': rng.choice(HW),
+        'tp': rng.choice([1, 2, 4, 8]),
+        'ep': rng.choice([1, 8]),
+        'dp_attention': rng.choice(['true', 'false']),
+        'conc': conc,
+        'model': rng.choice(MODELS),
+        'framework': rng.choice(FRAMEWORKS),
+        'precision': rng.choice(PRECISIONS),
+        'tput_per_gpu': rng.uniform(100, 10000),
+        'output_tput_per_gpu': rng.uniform(50, 5000),
+        'input_tput_per_gpu': rng.uniform(50, 5000),
+        'isl': isl,
+        'osl': osl,
+        'image': f'image:v{i % 7}',
+    }
+    for stat in ('mean', 'median', 'p99', 'std'):
+        result[f'{stat}_ttft'] = rng.uniform(0.05, 5.0)
+        result[f'{stat}_tpot'] = tpot
+        result[f'{stat}_intvty'] = 1.0 / tpot
+        result[f'{stat}_itl'] = tpot
+        result[f'{stat}_e2el'] = e2el
+    return result
+
+
+def write_corpus(corpus_dir, n_results, seed=0):
+    """Write n_results agg_*.json files laid out like downloaded artifacts (one directory per job)."""
+    rng = random.Random(seed)
+    for i in range(n_results):
+        job_dir = corpus_dir / f'job_{i}'
+        job_dir.mkdir(parents=True)
+        with open(job_dir / f'agg_job_{i}.json', 'w') as f:
+            json.dump(synthetic_result(rng, i), f, indent=2)
+
+
+def timed(cmd, cwd):
+    start = time.perf_counter()
+    subprocess.run(cmd, cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare report.py against the separate summarize/collect/plot scripts on a synthetic corpus')
+    parser.add_argument('--n-results', type=int, default=50000, help='Number of synthetic results (default: 50000)')
+    parser.add_argument('--workers', type=int, required=False, help='Loader threads passed to report.py')
+    parser.add_argument('--no-plots', action='store_true', help='Leave plotting out of both timings')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        corpus_dir = tmp / 'results'
+        print(f'Writing {args.n_results} synthetic results...', file=sys.stderr)
+        write_corpus(corpus_dir, args.n_results)
+
+        scripts = [['summarize.py', str(corpus_dir)], ['collect_results.py', str(corpus_dir), 'bench']]
+        if not args.no_plots:
+            scripts.append(['plot_perf.py', str(corpus_dir), 'bench'])
+        separate = {script[0]: timed([sys.executable, str(UTILS_DIR / script[0])] + script[1:], tmp) for script in scripts}
+
+        report_cmd = [sys.executable, str(UTILS_DIR / 'report.py'), str(corpus_dir), 'bench']
+        if args.workers:
+            report_cmd += ['--workers', str(args.workers)]
+        if args.no_plots:
+            report_cmd.append('--no-plots')
+        single = timed(report_cmd, tmp)
+
+    total = sum(separate.values())
+    for script, elapsed in separate.items():
+        print(f'{script:<20} {elapsed:8.2f} s')
+    print(f"{'separate total':<20} {total:8.2f} s")
+    print(f"{'report.py':<20} {single:8.2f} s")
+    print(f"{'speedup':<20} {total / single:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+import sys
+import json
+import socket
+import tempfile
+import argparse
+import subprocess
+from pathlib import Path
+
+
+UTILS_DIR = Path(__file__).resolve().parent
+
+DEFAULT_CONCURRENCIES = [16, 64, 256, 1024]
+
+# Allowed error of measured median latency vs. the server's configured latency
+DEFAULT_TOLERANCE = 0.15
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_mock_server(port, ttft_ms, itl_ms, workers, extra_args=()):
+    """Start mock_server.py and block until it prints its readiness line."""
+    proc = subprocess.Popen(
+        [sys.executable, str(UTILS_DIR / 'mock_server.py'), '--host', '127.0.0.1', '--port', str(port),
+         '--latency-model', 'fixed', '--ttft-ms', str(ttft_ms), '--itl-ms', str(itl_ms), '--workers', str(workers), *extra_args],
+        stdout=subprocess.PIPE, text=True)
+    for line in proc.stdout:
+        if 'Application startup complete' in line:
+            return proc
+    raise ValueError(f'mock_server.py exited with code {proc.wait()} before becoming ready')
+
+
+def run_client(port, conc, num_workers, output_len, result_dir, extra_args=()):
+    """Run bench_client.py against the local server and return its saved result."""
+    filename = f'selftest_conc{conc}_workers{num_workers}.json'
+    subprocess.run(
+        [sys.executable, str(UTILS_DIR / 'bench_client.py'), '--model', 'mock-model',
+         '--base-url', f'http://127.0.0.1:{port}', '--random-input-len', '32', '--random-output-len', str(output_len),
+         '--num-prompts', str(conc * 4), '--max-concurrency', str(conc), '--num-workers', str(num_workers),
+         '--ignore-eos', '--percentile-metrics', 'ttft,tpot,itl', '--metric-percentiles', '50,99',
+         '--save-result', '--result-dir', result_dir, '--result-filename', filename, *extra_args],
+        check=True, stdout=subprocess.DEVNULL)
+    with open(Path(result_dir) / filename) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Check that bench_client.py latencies stay accurate as client concurrency grows, using mock_server.py')
+    parser.add_argument('--concurrencies', type=int, nargs='+', default=DEFAULT_CONCURRENCIES)
+    parser.add_argument('--num-workers', type=int, nargs='+', default=[1, 4],
+                        help='Client process counts to compare at each concurrency (default: 1 4)')
+    parser.add_argument('--server-workers', type=int, default=4, help='mock_server.py processes (default: 4)')
+    parser.add_argument('--ttft-ms', type=float, default=50.0)
+    parser.add_argument('--itl-ms', type=float, default=20.0)
+    parser.add_argument('--output-len', type=int, default=64)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    port = _free_port()
+    server = start_mock_server(port, args.ttft_ms, args.itl_ms, args.server_workers)
+    print('| Conc | Client Procs | Median TTFT (ms) | Median ITL (ms) | P99 ITL (ms) | Client CPU (max) | OK |')
+    print('| :-: | :-: | :-: | :-: | :-: | :-: | :-: |')
+    failures = 0
+    try:
+        with tempfile.TemporaryDirectory() as result_dir:
+            for conc in args.concurrencies:
+                for num_workers in args.num_workers:
+                    result = run_client(port, conc, num_workers, args.output_len, result_dir)
+                    ok = (abs(result['median_ttft_ms'] - args.ttft_ms) <= args.tolerance * args.ttft_ms
+                          and abs(result['median_itl_ms'] - args.itl_ms) <= args.tolerance * args.itl_ms)
+                    failures += not ok
+                    print(
+                        f"| {conc} "
+                        f"| {result['client_num_workers']} "
+                        f"| {result['median_ttft_ms']:.1f} "
+                        f"| {result['median_itl_ms']:.2f} "
+                        f"| {result['p99_itl_ms']:.2f} "
+                        f"| {result['client_cpu_util_max']:.0%} "
+                        f"| {'yes' if ok else 'NO'} |",
+                        flush=True,
+                    )
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f'\nConfigured TTFT {args.ttft_ms:g} ms, ITL {args.itl_ms:g} ms, tolerance {args.tolerance:.0%}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,37 @@
-import sys
 import json
-from pathlib import Path
+import argparse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-results_dir = Path(sys.argv[1])
-exp_name = sys.argv[2]
+from columnar import iter_result_files, write_parquet
 
-agg_results = []
-for result_path in results_dir.rglob(f'*.json'):
-    with open(result_path) as f:
-        result = json.load(f)
-    agg_results.append(result)
 
-with open(f'agg_{exp_name}.json', 'w') as f:
-    json.dump(agg_results, f, indent=2)
+def write_agg_results(results, exp_name):
+    if orjson is not None:
+        with open(f'agg_{exp_name}.json', 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        return
+
+    with open(f'agg_{exp_name}.json', 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Aggregate per-job results into agg_<exp_name>.json and/or .parquet')
+    parser.add_argument('results_dir', help='Directory holding per-job aggregated results')
+    parser.add_argument('exp_name', help='Experiment name used in output file names')
+    parser.add_argument('--format', choices=['json', 'parquet', 'both'], default='json',
+                        help='Output format; parquet requires pyarrow (default: json)')
+    args = parser.parse_args()
+
+    if args.format == 'parquet':
+        # Streamed in batches, so memory does not grow with the number of results
+        write_parquet(iter_result_files(args.results_dir), f'agg_{args.exp_name}.parquet')
+    else:
+        agg_results = list(iter_result_files(args.results_dir))
+        write_agg_results(agg_results, args.exp_name)
+        if args.format == 'both':
+            write_parquet(agg_results, f'agg_{args.exp_name}.parquet')
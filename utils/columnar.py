@@ -0,0 +1,131 @@
+import sys
+import json
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+DEFAULT_BATCH_SIZE = 4096
+
+LATENCY_METRICS = ['ttft', 'tpot', 'itl', 'e2el', 'intvty']
+LATENCY_STATS = ['mean', 'median', 'std', 'p50', 'p90', 'p95', 'p99']
+
+
+def results_schema():
+    """Explicit Arrow schema of the aggregated results.
+
+    Low-cardinality strings are dictionary encoded. Fields of a record that are not
+    in the schema are not written; fields missing from a record are null.
+    """
+    if pa is None:
+        raise ImportError('pyarrow is required for columnar results (pip install pyarrow)')
+
+    category = pa.dictionary(pa.int32(), pa.string())
+    fields = [
+        pa.field('model', category),
+        pa.field('hw', category),
+        pa.field('framework', category),
+        pa.field('precision', category),
+        pa.field('dp_attention', category),
+        pa.field('mtp', category),
+        pa.field('image', category),
+        pa.field('compile_cache', category),
+        pa.field('engine_args_tag', category),
+        pa.field('arrival', category),
+        pa.field('isl', pa.int32()),
+        pa.field('osl', pa.int32()),
+        pa.field('tp', pa.int32()),
+        pa.field('ep', pa.int32()),
+        pa.field('conc', pa.int32()),
+        pa.field('kv_capacity', pa.int32()),
+        pa.field('request_rate', pa.float64()),
+        pa.field('burstiness', pa.float64()),
+        pa.field('request_throughput', pa.float64()),
+        pa.field('tput_per_gpu', pa.float64()),
+        pa.field('output_tput_per_gpu', pa.float64()),
+        pa.field('input_tput_per_gpu', pa.float64()),
+        pa.field('goodput_ratio', pa.float64()),
+        pa.field('goodput_req_s', pa.float64()),
+        pa.field('goodput_output_tok_s', pa.float64()),
+        pa.field('steady_tput_per_gpu', pa.float64()),
+        pa.field('steady_output_tput_per_gpu', pa.float64()),
+        pa.field('steady_window_s', pa.float64()),
+        pa.field('steady_window_frac', pa.float64()),
+        pa.field('time_to_ready_s', pa.float64()),
+        pa.field('startup_weight_load_s', pa.float64()),
+        pa.field('startup_compile_s', pa.float64()),
+        pa.field('startup_graph_capture_s', pa.float64()),
+        pa.field('startup_kv_cache_s', pa.float64()),
+    ]
+    fields += [pa.field(f'{stat}_{metric}', pa.float64()) for metric in LATENCY_METRICS for stat in LATENCY_STATS]
+    return pa.schema(fields)
+
+
+def iter_result_files(results_dir):
+    """Yield result records one file at a time."""
+    for result_path in sorted(Path(results_dir).rglob('*.json')):
+        with open(result_path) as f:
+            yield json.load(f)
+
+
+def _record_batch(records, schema):
+    columns = {}
+    for field in schema:
+        values = [r.get(field.name) for r in records]
+        if field.name == 'dp_attention':
+            values = [None if v is None else str(v).lower() for v in values]
+        columns[field.name] = values
+    return pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def write_parquet(records, path, batch_size=DEFAULT_BATCH_SIZE, compression='zstd'):
+    """Stream records (any iterable of agg dicts) into a Parquet file.
+
+    Only one batch of records is held in memory at a time. Returns the number of
+    records written.
+    """
+    schema = results_schema()
+    n_written = 0
+    batch = []
+    with pq.ParquetWriter(path, schema, compression=compression, use_dictionary=True) as writer:
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                writer.write_batch(_record_batch(batch, schema))
+                n_written += len(batch)
+                batch = []
+        if batch:
+            writer.write_batch(_record_batch(batch, schema))
+            n_written += len(batch)
+    return n_written
+
+
+def read_parquet(path, columns=None):
+    """Load aggregated results from a Parquet file as a list of dicts.
+
+    Only the requested columns are read, through a memory map. Null values are
+    dropped from each record so consumers can keep using r.get(...) defaults.
+    """
+    if pq is None:
+        raise ImportError('pyarrow is required for columnar results (pip install pyarrow)')
+
+    table = pq.read_table(path, columns=columns, memory_map=True)
+    return [{k: v for k, v in row.items() if v is not None} for row in table.to_pylist()]
+
+
+def load_results(path, columns=None):
+    """Load results from a directory of JSON results or from a Parquet file."""
+    path = Path(path)
+    if path.is_file() and path.suffix == '.parquet':
+        return read_parquet(path, columns)
+    return list(iter_result_files(path))
+
+
+if __name__ == '__main__':
+    n_written = write_parquet(iter_result_files(sys.argv[1]), f'agg_{sys.argv[2]}.parquet')
+    print(f'Wrote {n_written} results to agg_{sys.argv[2]}.parquet', file=sys.stderr)
@@ -0,0 +1,243 @@
+import os
+import sys
+import json
+import time
+import fcntl
+import shutil
+import hashlib
+import argparse
+import subprocess
+from pathlib import Path
+
+
+# Fields a cache entry is keyed by and the environment variables they are read from
+KEY_FIELDS = {
+    'image': 'IMAGE',
+    'model': 'MODEL',
+    'framework': 'FRAMEWORK',
+    'tp': 'TP',
+    'ep': 'EP_SIZE',
+    'dp_attention': 'DP_ATTENTION',
+    'max_model_len': 'MAX_MODEL_LEN',
+}
+
+# Compile and JIT cache locations the servers read from the environment, relative to the entry.
+# XDG_CACHE_HOME covers caches kept under ~/.cache (FlashInfer, DeepGEMM, TRT-LLM JIT kernels).
+CACHE_DIRS = {
+    'VLLM_CACHE_ROOT': 'vllm',
+    'TORCHINDUCTOR_CACHE_DIR': 'inductor',
+    'TRITON_CACHE_DIR': 'triton',
+    'XDG_CACHE_HOME': 'xdg',
+}
+
+METADATA_FILE = 'cache_entry.json'
+LOCK_FILE = '.lock'
+
+DEFAULT_MAX_SIZE_GB = 200
+# Entries used this recently may belong to a running job and are never evicted
+DEFAULT_PROTECT_HOURS = 4
+
+
+def key_fields_from_env():
+    return {field: os.environ.get(env, '') for field, env in KEY_FIELDS.items()}
+
+
+def cache_key(fields):
+    """Directory name of the cache entry for a server configuration.
+
+    A readable prefix helps when browsing the cache; the hash over all fields
+    keeps different images and layouts apart.
+    """
+    digest = hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()[:16]
+    model = fields.get('model', '').rstrip('/').split('/')[-1]
+    return f"{fields.get('framework')}_{model}_tp{fields.get('tp')}_{digest}"
+
+
+def cache_env(entry_dir):
+    return {env: str(Path(entry_dir) / subdir) for env, subdir in CACHE_DIRS.items()}
+
+
+class CacheLock:
+    """Exclusive lock over a cache root, shared by all jobs on the node."""
+
+    def __init__(self, root):
+        self.path = Path(root) / LOCK_FILE
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, 'w')
+        fcntl.flock(self.file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
+
+
+def _dir_size(path):
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _read_metadata(entry_dir):
+    try:
+        with open(Path(entry_dir) / METADATA_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_metadata(entry_dir, metadata):
+    tmp_path = Path(entry_dir) / f'{METADATA_FILE}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(metadata, f, indent=2)
+    tmp_path.replace(Path(entry_dir) / METADATA_FILE)
+
+
+def prepare(root, fields):
+    """Create or reuse the entry for fields and mark it used.
+
+    A hit means an earlier job finished with this entry, so its compile artifacts
+    are complete. Returns (key, entry dir, report dict).
+    """
+    key = cache_key(fields)
+    entry_dir = Path(root) / key
+    with CacheLock(root):
+        metadata = _read_metadata(entry_dir) or {'fields': fields, 'created': time.time(), 'complete': False,
+                                                 'hits': 0, 'size_bytes': 0}
+        hit = metadata['complete']
+        metadata['hits'] += hit
+        metadata['last_used'] = time.time()
+        for subdir in CACHE_DIRS.values():
+            (entry_dir / subdir).mkdir(parents=True, exist_ok=True)
+        _write_metadata(entry_dir, metadata)
+
+    report = {
+        'compile_cache': 'hit' if hit else 'miss',
+        'compile_cache_key': key,
+        'compile_cache_bytes': metadata['size_bytes'],
+    }
+    return key, entry_dir, report
+
+
+def evict(root, max_bytes, protect_s, keep=()):
+    """Delete least recently used entries until the cache fits in max_bytes.
+
+    Entries in keep or used within protect_s seconds are never deleted. Call with
+    the cache lock held. Returns the keys of the deleted entries.
+    """
+    entries = []
+    for entry_dir in Path(root).iterdir():
+        if not entry_dir.is_dir():
+            continue
+        metadata = _read_metadata(entry_dir) or {}
+        size = metadata.get('size_bytes') or _dir_size(entry_dir)
+        entries.append((metadata.get('last_used', entry_dir.stat().st_mtime), size, entry_dir))
+
+    total = sum(size for _, size, _ in entries)
+    evicted = []
+    now = time.time()
+    for last_used, size, entry_dir in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        if entry_dir.name in keep or now - last_used < protect_s:
+            continue
+        # Artifacts written by root inside containers may not be removable; count what is left
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        total -= size - (_dir_size(entry_dir) if entry_dir.exists() else 0)
+        evicted.append(entry_dir.name)
+    return evicted
+
+
+def finish(root, key, max_bytes, protect_s):
+    """Mark an entry complete after its job, record its size and evict to the budget."""
+    entry_dir = Path(root) / key
+    with CacheLock(root):
+        metadata = _read_metadata(entry_dir)
+        if metadata is None:
+            raise ValueError(f'No cache entry {key} in {root}')
+        metadata.update({'complete': True, 'last_used': time.time(), 'size_bytes': _dir_size(entry_dir)})
+        _write_metadata(entry_dir, metadata)
+        return evict(root, max_bytes, protect_s, keep={key})
+
+
+def _write_report(report, output):
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+    print(f"Compile cache {report['compile_cache']}: {report['compile_cache_key']} "
+          f"({report['compile_cache_bytes'] / 2**30:.1f} GiB)", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Persistent torch.compile/Triton/JIT cache shared by benchmark jobs, keyed by image, model '
+                    'and parallel layout (read from IMAGE, MODEL, FRAMEWORK, TP, EP_SIZE, DP_ATTENTION, MAX_MODEL_LEN)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_common(subparser):
+        subparser.add_argument('--root', required=True, help='Cache root, e.g. on the HF cache mount')
+        subparser.add_argument('--max-size-gb', type=float, default=DEFAULT_MAX_SIZE_GB,
+                               help=f'Evict least recently used entries beyond this size (default: {DEFAULT_MAX_SIZE_GB})')
+        subparser.add_argument('--protect-hours', type=float, default=DEFAULT_PROTECT_HOURS,
+                               help=f'Never evict entries used this recently (default: {DEFAULT_PROTECT_HOURS})')
+
+    prepare_parser = subparsers.add_parser(
+        'prepare', help='Create or reuse the entry and print shell exports pointing the server at it')
+    add_common(prepare_parser)
+    prepare_parser.add_argument('--mount-root', required=False,
+                                help='Path of --root as seen by the server container (default: --root)')
+    prepare_parser.add_argument('--output', required=False,
+                                help='Write the hit/miss report as JSON to this file (read by process_result.py)')
+
+    finish_parser = subparsers.add_parser('finish', help='Mark the entry complete and evict down to the size budget')
+    add_common(finish_parser)
+    finish_parser.add_argument('--key', default=os.environ.get('COMPILE_CACHE_KEY'),
+                               help='Entry printed by prepare (default: $COMPILE_CACHE_KEY)')
+
+    run_parser = subparsers.add_parser('run', help='prepare, run a command with the cache environment, then finish')
+    add_common(run_parser)
+    run_parser.add_argument('--output', required=False, help='Write the hit/miss report as JSON to this file')
+    run_parser.add_argument('cmd', nargs=argparse.REMAINDER, help='Command to run, after --')
+
+    args = parser.parse_args()
+    max_bytes = args.max_size_gb * 2**30
+    protect_s = args.protect_hours * 3600
+
+    if args.command == 'finish':
+        if not args.key:
+            parser.error('--key or COMPILE_CACHE_KEY is required')
+        evicted = finish(args.root, args.key, max_bytes, protect_s)
+        if evicted:
+            print(f"Evicted {len(evicted)} compile cache entries: {', '.join(evicted)}", file=sys.stderr)
+        return
+
+    key, entry_dir, report = prepare(args.root, key_fields_from_env())
+    _write_report(report, args.output)
+
+    if args.command == 'prepare':
+        env = cache_env(Path(args.mount_root or args.root) / key)
+        for name, value in {**env, 'COMPILE_CACHE_KEY': key}.items():
+            print(f'export {name}={value}')
+        return
+
+    cmd = args.cmd[1:] if args.cmd[:1] == ['--'] else args.cmd
+    if not cmd:
+        parser.error('run needs a command after --')
+    returncode = subprocess.run(cmd, env={**os.environ, **cache_env(entry_dir)}).returncode
+    # Only a job that ran to completion leaves a complete entry behind
+    if returncode == 0:
+        evicted = finish(args.root, key, max_bytes, protect_s)
+        if evicted:
+            print(f"Evicted {len(evicted)} compile cache entries: {', '.join(evicted)}", file=sys.stderr)
+    sys.exit(returncode)
+
+
+if __name__ == '__main__':
+    main()
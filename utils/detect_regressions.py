@@ -0,0 +1,240 @@
+import sys
+import json
+import argparse
+import statistics
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from results_db import connect, query
+
+
+# Metrics checked for every point and whether a higher value is better
+METRICS = {
+    'tput_per_gpu': True,
+    'median_ttft': False,
+    'median_intvty': True,
+}
+
+# Server startup metrics (lower is better). Every concurrency of a server shares them,
+# so they are judged once per server rather than per point.
+STARTUP_METRICS = ['time_to_ready_s', 'startup_weight_load_s', 'startup_compile_s',
+                   'startup_graph_capture_s', 'startup_kv_cache_s']
+
+# Fields identifying a benchmark point across nights; engine_args_tag keeps swept engine-arg variants apart,
+# request_rate and burstiness keep open-loop points apart from closed-loop ones
+POINT_FIELDS = ['model', 'hw', 'framework', 'precision', 'isl', 'osl', 'tp', 'ep', 'dp_attention', 'conc', 'mtp',
+                'engine_args_tag', 'request_rate', 'burstiness']
+
+# Fields identifying a server configuration; its points differ only in concurrency
+SERVER_FIELDS = [f for f in POINT_FIELDS if f != 'conc']
+
+# Scale factor making the MAD a consistent estimator of the standard deviation for normal noise
+MAD_SCALE = 1.4826
+
+
+def point_key(record, fields=POINT_FIELDS):
+    return tuple(str(record.get(f)).lower() if f == 'dp_attention' else record.get(f) for f in fields)
+
+
+def load_current_results(results_dir):
+    results = []
+    for result_path in Path(results_dir).rglob('*.json'):
+        with open(result_path) as f:
+            result = json.load(f)
+        if isinstance(result, dict) and 'hw' in result:
+            results.append(result)
+    return results
+
+
+def robust_compare(value, baseline, higher_is_better, z_threshold, min_effect, rel_noise_floor):
+    """Compare one value against its baseline samples with a median/MAD noise model.
+
+    The noise estimate is floored at rel_noise_floor * |median| so that a perfectly
+    stable history does not turn every tiny change into a significant one. A change is
+    significant when its robust z-score is at least z_threshold and its relative
+    effect is at least min_effect.
+    """
+    median = statistics.median(baseline)
+    mad = MAD_SCALE * statistics.median(abs(b - median) for b in baseline)
+    noise = max(mad, rel_noise_floor * abs(median))
+    z = (value - median) / noise if noise > 0 else 0.0
+    rel_change = (value - median) / abs(median) if median else 0.0
+
+    status = 'unchanged'
+    if abs(z) >= z_threshold and abs(rel_change) >= min_effect:
+        improved = (rel_change > 0) == higher_is_better
+        status = 'improvement' if improved else 'regression'
+
+    return {
+        'value': value,
+        'baseline_median': median,
+        'baseline_mad': mad,
+        'n_baseline': len(baseline),
+        'z_score': z,
+        'rel_change': rel_change,
+        'status': status,
+    }
+
+
+def detect_regressions(current, history, max_baseline, min_history,
+                       z_threshold, min_effect, rel_noise_floor):
+    """Compare current results against history, both lists of agg records.
+
+    history must be ordered oldest first; only the latest max_baseline samples of each
+    point are used as its rolling baseline. Points with fewer than min_history samples
+    are reported as 'no_baseline'.
+    """
+    history_by_point = {}
+    for record in history:
+        history_by_point.setdefault(point_key(record), []).append(record)
+
+    metrics = {**METRICS, **{m: False for m in STARTUP_METRICS}}
+    findings = []
+    startup_checked = set()
+    for record in current:
+        baseline_records = history_by_point.get(point_key(record), [])[-max_baseline:]
+        baseline_images = sorted({r['image'] for r in baseline_records if r.get('image')})
+        point = {f: record.get(f) for f in POINT_FIELDS}
+        check_startup = point_key(record, SERVER_FIELDS) not in startup_checked
+        startup_checked.add(point_key(record, SERVER_FIELDS))
+
+        for metric, higher_is_better in metrics.items():
+            if record.get(metric) is None or (metric in STARTUP_METRICS and not check_startup):
+                continue
+            baseline = [r[metric] for r in baseline_records if r.get(metric) is not None]
+            if len(baseline) < min_history:
+                comparison = {'value': record[metric], 'n_baseline': len(baseline), 'status': 'no_baseline'}
+            else:
+                comparison = robust_compare(record[metric], baseline, higher_is_better,
+                                            z_threshold, min_effect, rel_noise_floor)
+            findings.append({
+                **point,
+                'metric': metric,
+                **comparison,
+                'image': record.get('image'),
+                'baseline_images': baseline_images,
+            })
+
+    return findings
+
+
+def format_markdown(findings):
+    significant = [f for f in findings if f['status'] in ('regression', 'improvement')]
+    counts = {s: sum(f['status'] == s for f in findings) for s in ('regression', 'improvement', 'unchanged', 'no_baseline')}
+
+    lines = [
+        '## Performance Regressions',
+        '',
+        f"{counts['regression']} regressions, {counts['improvement']} improvements, "
+        f"{counts['unchanged']} unchanged, {counts['no_baseline']} without enough history.",
+        '',
+    ]
+    if not significant:
+        return '\n'.join(lines)
+
+    lines += [
+        '| Status | Model | Hardware | Framework | Precision | ISL | OSL | TP | EP | DP Attention | Conc | Metric | Value | Baseline Median | Change | Robust Z | Image | Baseline Images |',
+        '| :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: |',
+    ]
+    significant.sort(key=lambda f: (f['status'] != 'regression', -abs(f['z_score'])))
+    for f in significant:
+        lines.append(
+            f"| {f['status'].upper()} "
+            f"| {f['model']} "
+            f"| {str(f['hw']).upper()} "
+            f"| {str(f['framework']).upper()} "
+            f"| {str(f['precision']).upper()} "
+            f"| {f['isl']} "
+            f"| {f['osl']} "
+            f"| {f['tp']} "
+            f"| {f['ep']} "
+            f"| {f['dp_attention']} "
+            f"| {f['conc']} "
+            f"| {f['metric']} "
+            f"| {f['value']:.4f} "
+            f"| {f['baseline_median']:.4f} "
+            f"| {f['rel_change'] * 100:+.2f}% "
+            f"| {f['z_score']:+.2f} "
+            f"| {f['image'] or '-'} "
+            f"| {', '.join(f['baseline_images']) or '-'} |"
+        )
+    return '\n'.join(lines)
+
+
+def format_startup_trend(current, history, n_runs=7):
+    """Markdown table of time-to-ready over the last n_runs nights for each server in current."""
+    runs_by_server = {}
+    for record in history:
+        if record.get('time_to_ready_s') is not None:
+            # One sample per run; all points of a server run share the startup record
+            runs_by_server.setdefault(point_key(record, SERVER_FIELDS), {}).setdefault(record['run_id'], record)
+
+    servers = {}
+    for record in current:
+        if record.get('time_to_ready_s') is not None:
+            servers.setdefault(point_key(record, SERVER_FIELDS), record)
+    if not servers:
+        return ''
+
+    lines = [
+        '## Server Startup Trend',
+        '',
+        f'Time to ready (s) over the last {n_runs} runs, oldest first, then the current run\'s phase breakdown.',
+        '',
+        '| Model | Hardware | Framework | Precision | TP | EP | Image | Time to Ready (s) | Weights (s) | Compile (s) | Graph Capture (s) | KV Cache (s) |',
+        '| :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: |',
+    ]
+    for key, record in sorted(servers.items(), key=lambda item: str(item[0])):
+        past = list(runs_by_server.get(key, {}).values())[-(n_runs - 1):] if n_runs > 1 else []
+        trend = ' → '.join(f"{r['time_to_ready_s']:.0f}" for r in past + [record])
+        phases = [record.get(f'startup_{phase}_s') for phase in ('weight_load', 'compile', 'graph_capture', 'kv_cache')]
+        lines.append(
+            f"| {record.get('model')} "
+            f"| {str(record.get('hw')).upper()} "
+            f"| {str(record.get('framework')).upper()} "
+            f"| {str(record.get('precision')).upper()} "
+            f"| {record.get('tp')} "
+            f"| {record.get('ep')} "
+            f"| {record.get('image') or '-'} "
+            f"| {trend} "
+            + ''.join(f"| {p:.1f} " if p is not None else '| - ' for p in phases) + '|'
+        )
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Flag performance regressions against the nightly results history')
+    parser.add_argument('results_dir', help='Directory holding the current run\'s aggregated results')
+    parser.add_argument('--db', required=True, help='Path to the SQLite results store (see results_db.py)')
+    parser.add_argument('--run-id', required=False, help='Run id of the current results, excluded from the baseline')
+    parser.add_argument('--window-days', type=int, default=14, help='Only use history from the last N days (default: 14)')
+    parser.add_argument('--max-baseline', type=int, default=10, help='Use at most the latest N samples of each point (default: 10)')
+    parser.add_argument('--min-history', type=int, default=3, help='Minimum number of baseline samples needed to judge a point (default: 3)')
+    parser.add_argument('--z-threshold', type=float, default=3.5, help='Robust z-score needed to flag a change (default: 3.5)')
+    parser.add_argument('--min-effect', type=float, default=0.03, help='Minimum relative change to flag (default: 0.03)')
+    parser.add_argument('--rel-noise-floor', type=float, default=0.01, help='Lower bound on noise relative to the baseline median (default: 0.01)')
+    parser.add_argument('--output', required=False, help='Write the JSON report to this file')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit with status 1 if any regression is found')
+    args = parser.parse_args()
+
+    since = (datetime.now(timezone.utc) - timedelta(days=args.window_days)).strftime('%Y-%m-%d')
+    history = [r for r in query(connect(args.db), since=since) if r['run_id'] != args.run_id]
+    current = load_current_results(args.results_dir)
+
+    findings = detect_regressions(current, history, args.max_baseline, args.min_history,
+                                  args.z_threshold, args.min_effect, args.rel_noise_floor)
+    print(format_markdown(findings))
+    startup_trend = format_startup_trend(current, history)
+    if startup_trend:
+        print('\n' + startup_trend)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(findings, f, indent=2)
+
+    if args.fail_on_regression and any(f['status'] == 'regression' for f in findings):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
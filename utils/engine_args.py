@@ -0,0 +1,64 @@
+import os
+import sys
+import json
+import argparse
+
+
+def load_engine_args(value=None):
+    """Engine args of the matrix entry, from the ENGINE_ARGS JSON map ({} when unset or null)."""
+    value = os.environ.get('ENGINE_ARGS', '') if value is None else value
+    engine_args = json.loads(value) if value.strip() else None
+    if engine_args is None:
+        return {}
+    if not isinstance(engine_args, dict):
+        raise ValueError(f'ENGINE_ARGS must be a JSON object, got {value!r}')
+    return engine_args
+
+
+def to_flags(engine_args, exclude=(), underscore=False):
+    """Command line arguments for engine args: '--name value', or '--name' alone for true.
+
+    False booleans are left out, so flags a script does not pass by default can be
+    switched on per entry.
+    """
+    args = []
+    for name, value in engine_args.items():
+        if name in exclude or value is False:
+            continue
+        flag = f"--{name.replace('-', '_') if underscore else name}"
+        args += [flag] if value is True else [flag, str(value).lower() if isinstance(value, bool) else str(value)]
+    return args
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Server arguments of the matrix entry, read from the ENGINE_ARGS JSON map '
+                    '(generate_sweep_configs.py engine-args and engine-arg-rules)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    flags_parser = subparsers.add_parser(
+        'flags', help='Print the flags one argument per line, for: mapfile -t ENGINE_FLAGS < <(...)')
+    flags_parser.add_argument('--exclude', nargs='+', default=[], help='Engine args the script passes itself')
+    flags_parser.add_argument('--underscore', action='store_true', help='Spell flags with underscores (trtllm-serve)')
+
+    get_parser = subparsers.add_parser('get', help='Print one engine arg, or the default if it is not set')
+    get_parser.add_argument('name')
+    get_parser.add_argument('default', nargs='?', default='')
+
+    args = parser.parse_args()
+    try:
+        engine_args = load_engine_args()
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == 'flags':
+        for arg in to_flags(engine_args, args.exclude, args.underscore):
+            print(arg)
+    else:
+        value = engine_args.get(args.name, args.default)
+        print(str(value).lower() if isinstance(value, bool) else value)
+
+
+if __name__ == '__main__':
+    main()
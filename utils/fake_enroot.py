@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+
+
+def registry_digest(image):
+    """Manifest digest of an image in the FAKE_ENROOT_REGISTRY JSON map, or None."""
+    if not os.environ.get('FAKE_ENROOT_REGISTRY'):
+        return None
+    with open(os.environ['FAKE_ENROOT_REGISTRY']) as f:
+        return json.load(f).get(image)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Stand-in for "enroot import -o <file> docker://<image>" that writes deterministic bytes, '
+                    'for testing squash_cache.py without enroot or a registry (squash_cache.py --enroot "python3 '
+                    'utils/fake_enroot.py"). FAKE_ENROOT_SIZE sets the file size in bytes, FAKE_ENROOT_DELAY '
+                    'the seconds an import takes, FAKE_ENROOT_FAIL=1 makes it fail halfway, and FAKE_ENROOT_LOG '
+                    'names a file each import appends its image to. It also stands in for "skopeo inspect" '
+                    '(--skopeo "python3 utils/fake_enroot.py"): FAKE_ENROOT_REGISTRY names a JSON map of image '
+                    'to manifest digest, and the bytes an import writes depend on the image\'s digest there')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    import_parser = subparsers.add_parser('import')
+    import_parser.add_argument('-o', '--output', required=True)
+    import_parser.add_argument('uri')
+    inspect_parser = subparsers.add_parser('inspect')
+    inspect_parser.add_argument('--format')
+    inspect_parser.add_argument('uri')
+    args = parser.parse_args()
+
+    image = args.uri.removeprefix('docker://')
+    if args.command == 'inspect':
+        digest = registry_digest(image)
+        if digest is None:
+            print(f'fake skopeo: {image} not found', file=sys.stderr)
+            sys.exit(1)
+        print(digest)
+        return
+
+    size = int(os.environ.get('FAKE_ENROOT_SIZE', 2**20))
+    block = hashlib.sha256(f'{image}{registry_digest(image.replace("#", "/", 1)) or ""}'.encode()).digest() * 1024
+    with open(args.output, 'wb') as f:
+        written = 0
+        while written < size:
+            written += f.write(block[:size - written])
+            if written >= size // 2 and os.environ.get('FAKE_ENROOT_FAIL') == '1':
+                print(f'fake enroot: import of {image} failed', file=sys.stderr)
+                sys.exit(1)
+        f.flush()
+        time.sleep(float(os.environ.get('FAKE_ENROOT_DELAY', 0)))
+
+    if os.environ.get('FAKE_ENROOT_LOG'):
+        with open(os.environ['FAKE_ENROOT_LOG'], 'a') as f:
+            f.write(f'{image}\n')
+
+
+if __name__ == '__main__':
+    main()
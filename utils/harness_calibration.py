@@ -0,0 +1,148 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+import subprocess
+import urllib.request
+from pathlib import Path
+
+from client_selftest import UTILS_DIR, _free_port
+
+
+DEFAULT_CONCURRENCIES = [1, 4, 16, 64, 256]
+
+# Allowed bias of a reported median vs. the server's ground truth: relative, with an absolute floor in ms
+DEFAULT_TOLERANCE = 0.05
+DEFAULT_ABS_TOLERANCE_MS = 2.0
+
+READY_TIMEOUT_S = 60
+
+
+def start_server(port, log_path, server_args):
+    """Start mock_server.py and wait for 'Application startup complete' in its log, like the benchmark scripts."""
+    log = open(log_path, 'w')
+    proc = subprocess.Popen([sys.executable, str(UTILS_DIR / 'mock_server.py'), '--host', '127.0.0.1',
+                             '--port', str(port), *server_args], stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + READY_TIMEOUT_S
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise ValueError(f'mock_server.py exited with code {proc.returncode}, see {log_path}')
+        with open(log_path) as f:
+            if 'Application startup complete' in f.read():
+                return proc
+        time.sleep(0.1)
+    proc.terminate()
+    raise ValueError(f'mock_server.py not ready after {READY_TIMEOUT_S}s, see {log_path}')
+
+
+def _server_call(port, path, method='GET'):
+    request = urllib.request.Request(f'http://127.0.0.1:{port}{path}', method=method, data=b'' if method == 'POST' else None)
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+def run_point(port, conc, args, work_dir):
+    """Benchmark and process one concurrency exactly as the benchmark scripts do.
+
+    Returns (agg record written by process_result.py, server ground truth).
+    """
+    result_filename = f'{args.exp_name}_conc{conc}'
+    _server_call(port, '/mock/reset', 'POST')
+    subprocess.run(
+        [sys.executable, str(UTILS_DIR / 'bench_client.py'), '--model', 'mock-model', '--backend', 'vllm',
+         '--base-url', f'http://127.0.0.1:{port}', '--dataset-name', 'random',
+         '--random-input-len', str(args.isl), '--random-output-len', str(args.osl), '--random-range-ratio', '1.0',
+         '--num-prompts', str(conc * args.prompts_per_conc), '--max-concurrency', str(conc),
+         '--request-rate', 'inf', '--ignore-eos', '--num-workers', str(args.client_workers),
+         '--save-result', '--percentile-metrics', 'ttft,tpot,itl,e2el',
+         '--result-dir', work_dir, '--result-filename', f'{result_filename}.json'],
+        check=True, stdout=subprocess.DEVNULL)
+    ground_truth = _server_call(port, '/mock/stats')
+
+    env = {
+        **os.environ,
+        'RESULT_FILENAME': str(Path(work_dir) / result_filename),
+        'RUNNER_TYPE': 'cpu-mock', 'FRAMEWORK': 'mock', 'PRECISION': 'fp8', 'TP': '1',
+        'ISL': str(args.isl), 'OSL': str(args.osl),
+    }
+    subprocess.run([sys.executable, str(UTILS_DIR / 'process_result.py')], env=env, check=True, stdout=subprocess.DEVNULL)
+    # Agg records go in their own directory, as the collect step downloads only those
+    agg_path = Path(work_dir) / 'results' / f'agg_{result_filename}.json'
+    agg_path.parent.mkdir(exist_ok=True)
+    (Path(work_dir) / agg_path.name).rename(agg_path)
+    with open(agg_path) as f:
+        return json.load(f), ground_truth
+
+
+def _within(measured_ms, true_ms, args):
+    return abs(measured_ms - true_ms) <= max(args.tolerance * true_ms, args.abs_tolerance_ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='CPU-only end-to-end benchmark of the harness: bench_client.py and process_result.py against '
+                    'mock_server.py, comparing reported TTFT/TPOT with the latencies the server actually produced')
+    parser.add_argument('--concurrencies', type=int, nargs='+', default=DEFAULT_CONCURRENCIES)
+    parser.add_argument('--isl', type=int, default=1024)
+    parser.add_argument('--osl', type=int, default=128)
+    parser.add_argument('--prompts-per-conc', type=int, default=4,
+                        help='Requests per unit of concurrency (the benchmark scripts use 10; default: 4)')
+    parser.add_argument('--client-workers', type=int, default=1, help='bench_client.py --num-workers (default: 1)')
+    parser.add_argument('--exp-name', default='calibration')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--abs-tolerance-ms', type=float, default=DEFAULT_ABS_TOLERANCE_MS)
+    parser.add_argument('--output', required=False, help='Write the calibration table as JSON to this file')
+    parser.add_argument('server_args', nargs=argparse.REMAINDER,
+                        help='Arguments after -- are passed to mock_server.py (e.g. -- --decode-ms-per-seq 0.2)')
+    args = parser.parse_args()
+    server_args = [a for a in args.server_args if a != '--']
+
+    rows = []
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as work_dir:
+        server = start_server(port, Path(work_dir) / 'server.log', server_args)
+        try:
+            for conc in args.concurrencies:
+                agg, truth = run_point(port, conc, args, work_dir)
+                row = {
+                    'conc': conc,
+                    'true_median_ttft_ms': truth['median_ttft_ms'],
+                    'median_ttft_ms': agg['median_ttft'] * 1000,
+                    'true_median_tpot_ms': truth['median_tpot_ms'],
+                    'median_tpot_ms': agg['median_tpot'] * 1000,
+                    'mean_batch_size': truth.get('mean_batch_size'),
+                }
+                row['ok'] = (_within(row['median_ttft_ms'], row['true_median_ttft_ms'], args)
+                             and _within(row['median_tpot_ms'], row['true_median_tpot_ms'], args))
+                rows.append(row)
+        finally:
+            server.terminate()
+            server.wait()
+
+        # The reporting step must accept the records too
+        subprocess.run([sys.executable, str(UTILS_DIR / 'report.py'), 'results', args.exp_name, '--no-plots'],
+                       cwd=work_dir, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    print('| Conc | True TTFT (ms) | Reported TTFT (ms) | True TPOT (ms) | Reported TPOT (ms) | Mean Batch | OK |')
+    print('| :-: | :-: | :-: | :-: | :-: | :-: | :-: |')
+    for row in rows:
+        print(
+            f"| {row['conc']} "
+            f"| {row['true_median_ttft_ms']:.1f} "
+            f"| {row['median_ttft_ms']:.1f} "
+            f"| {row['true_median_tpot_ms']:.2f} "
+            f"| {row['median_tpot_ms']:.2f} "
+            f"| {row['mean_batch_size']:.1f} "
+            f"| {'yes' if row['ok'] else 'NO'} |"
+        )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(rows, f, indent=2)
+    sys.exit(0 if all(row['ok'] for row in rows) else 1)
+
+
+if __name__ == '__main__':
+    main()
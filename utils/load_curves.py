@@ -0,0 +1,149 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+
+# Fields defining one latency vs offered load curve; its points differ only in request_rate
+CURVE_FIELDS = ['model', 'hw', 'framework', 'precision', 'isl', 'osl', 'tp', 'ep', 'dp_attention', 'conc',
+                'arrival', 'burstiness']
+
+# A run is saturated when it completes requests at less than this fraction of the offered
+# rate: arrivals outpace completions, so the queue grows for as long as the run lasts
+DEFAULT_SATURATION = 0.9
+
+
+def is_open_loop(record):
+    return record.get('request_rate') is not None
+
+
+def load_curves(results):
+    """Group open-loop records into curves, each sorted by offered request rate."""
+    curves = {}
+    for r in results:
+        if is_open_loop(r):
+            key = tuple(str(r.get(f)).lower() if f == 'dp_attention' else r.get(f) for f in CURVE_FIELDS)
+            curves.setdefault(key, []).append(r)
+    return {key: sorted(points, key=lambda r: float(r['request_rate']))
+            for key, points in sorted(curves.items(), key=lambda kv: tuple(str(v) for v in kv[0]))}
+
+
+def achieved_fraction(record):
+    """Completed over offered request rate, or None if the record has no request_throughput."""
+    if record.get('request_throughput') is None:
+        return None
+    return float(record['request_throughput']) / float(record['request_rate'])
+
+
+def saturation_point(points, saturation=DEFAULT_SATURATION):
+    """Lowest offered rate of a curve the server does not keep up with, or None if it keeps up with all."""
+    for r in points:
+        fraction = achieved_fraction(r)
+        if fraction is not None and fraction < saturation:
+            return float(r['request_rate'])
+    return None
+
+
+def _fmt(value, scale=1.0, digits=3):
+    return f'{float(value) * scale:.{digits}f}' if value is not None else '-'
+
+
+def format_load_curves(results, saturation=DEFAULT_SATURATION):
+    """Markdown table of every open-loop point: latency against offered load, marking saturated points."""
+    lines = [
+        '| Model | Hardware | Framework | Precision | ISL | OSL | TP | EP | DP Attention | Conc | Arrival '
+        '| Offered (req/s) | Achieved (req/s) | TTFT (ms) | P99 TTFT (ms) | TPOT (ms) | E2EL (s) '
+        '| Queue Delay (ms) | Saturated |',
+        '| ' + ' | '.join([':-:'] * 19) + ' |',
+    ]
+    for key, points in load_curves(results).items():
+        model, hw, framework, precision, isl, osl, tp, ep, dp_attention, conc, arrival, burstiness = key
+        knee = saturation_point(points, saturation)
+        arrival = f'{arrival} ({burstiness:g})' if burstiness is not None else arrival
+        for r in points:
+            rate = float(r['request_rate'])
+            saturated = '-' if achieved_fraction(r) is None else ('yes' if knee is not None and rate >= knee else 'no')
+            lines.append(
+                f"| {model} "
+                f"| {str(hw).upper()} "
+                f"| {str(framework).upper()} "
+                f"| {str(precision).upper()} "
+                f"| {isl} "
+                f"| {osl} "
+                f"| {tp} "
+                f"| {ep} "
+                f"| {dp_attention} "
+                f"| {conc} "
+                f"| {arrival} "
+                f"| {rate:g} "
+                f"| {_fmt(r.get('request_throughput'), digits=2)} "
+                f"| {_fmt(r.get('median_ttft'), 1000, 1)} "
+                f"| {_fmt(r.get('p99_ttft'), 1000, 1)} "
+                f"| {_fmt(r.get('median_tpot'), 1000, 1)} "
+                f"| {_fmt(r.get('median_e2el'))} "
+                f"| {_fmt(r.get('mean_queue_delay'), 1000, 1)} "
+                f"| {saturated} |"
+            )
+    return '\n'.join(lines)
+
+
+def plot_load_curves(results, path, saturation=DEFAULT_SATURATION):
+    """Plot median and p99 TTFT against offered load, one line per curve, marking saturation points."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    for key, points in load_curves(results).items():
+        label = ' '.join(str(v) for f, v in zip(CURVE_FIELDS, key) if f in ('hw', 'framework', 'precision', 'tp', 'conc', 'arrival'))
+        rates = [float(r['request_rate']) for r in points]
+        line, = ax.plot(rates, [float(r['median_ttft']) for r in points], marker='o', label=label)
+        if all(r.get('p99_ttft') is not None for r in points):
+            ax.plot(rates, [float(r['p99_ttft']) for r in points], color=line.get_color(), linestyle=':')
+        knee = saturation_point(points, saturation)
+        if knee is not None:
+            ax.axvline(knee, color=line.get_color(), linestyle='--', alpha=0.5)
+
+    ax.set_xlabel('Offered load (req/s)')
+    ax.set_ylabel('TTFT (s), p99 dotted')
+    ax.set_yscale('log')
+    ax.legend(fontsize=7)
+    fig.tight_layout()
+    fig.savefig(path, bbox_inches='tight')
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Report latency against offered load for open-loop results (request_rate set) and the '
+                    'saturation point of each curve, where the server stops keeping up and the queue grows without bound')
+    parser.add_argument('results_dir', help='Directory holding aggregated results')
+    parser.add_argument('--saturation', type=float, default=DEFAULT_SATURATION,
+                        help=f'Achieved/offered rate below which a point is saturated (default: {DEFAULT_SATURATION})')
+    parser.add_argument('--output', required=False, help='Also write each curve and its saturation point as JSON to this file')
+    parser.add_argument('--plot', required=False, help='Write a TTFT vs offered load plot to this file')
+    args = parser.parse_args()
+
+    results = []
+    for result_path in sorted(Path(args.results_dir).rglob('*.json')):
+        with open(result_path) as f:
+            data = json.load(f)
+        results += [r for r in (data if isinstance(data, list) else [data]) if isinstance(r, dict) and 'hw' in r]
+
+    if not any(is_open_loop(r) for r in results):
+        print(f'No open-loop results found in {args.results_dir}', file=sys.stderr)
+    print(format_load_curves(results, args.saturation))
+
+    if args.output:
+        curves = [{**dict(zip(CURVE_FIELDS, key)),
+                   'saturation_request_rate': saturation_point(points, args.saturation),
+                   'points': [{f: r.get(f) for f in ('request_rate', 'request_throughput', 'median_ttft', 'p99_ttft',
+                                                     'median_tpot', 'median_e2el', 'mean_queue_delay')}
+                              for r in points]}
+                  for key, points in load_curves(results).items()]
+        with open(args.output, 'w') as f:
+            json.dump(curves, f, indent=2)
+    if args.plot:
+        plot_load_curves(results, args.plot, args.saturation)
+
+
+if __name__ == '__main__':
+    main()
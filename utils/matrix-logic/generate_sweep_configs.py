@@ -1,8 +1,21 @@
+import re
+import sys
 import json
+import math
+import heapq
+import collections
+import random
 import yaml
 import argparse
+import operator
+import itertools
+from pathlib import Path
 from pydantic import BaseModel, Field, ValidationError, ConfigDict
-from typing import List
+from typing import Dict, List, Optional, Union
+
+# The hardware and model tables live in utils/specs.py, shared with utils/roofline.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from specs import MODEL_SPECS, WEIGHT_BYTES_PER_PARAM, hardware_name, hardware_spec, kv_dtype_bytes, kv_elements_per_token
 
 # Field name constants
 # Top-level config fields
@@ -14,6 +27,12 @@ FIELD_FRAMEWORK = 'framework'
 FIELD_RUNNER = 'runner'
 FIELD_SEQ_LEN_CONFIGS = 'seq-len-configs'
 
+# Engine knob fields, allowed at the top level of a config and in search-space entries
+FIELD_ENGINE_ARGS = 'engine-args'
+FIELD_ENGINE_ARG_RULES = 'engine-arg-rules'
+FIELD_RULE_WHEN = 'when'
+FIELD_RULE_SET = 'set'
+
 # Seq-len-config fields
 FIELD_ISL = 'isl'
 FIELD_OSL = 'osl'
@@ -25,11 +44,23 @@ FIELD_CONC_START = 'conc-start'
 FIELD_CONC_END = 'conc-end'
 FIELD_EP = 'ep'
 FIELD_DP_ATTN = 'dp-attn'
+# Open-loop load, also matrix entry fields: offered request rate (req/s, a list sweeps it),
+# inter-arrival distribution and, for gamma arrivals, the burstiness factor
+FIELD_REQUEST_RATE = 'request-rate'
+FIELD_ARRIVAL = 'arrival'
+FIELD_BURSTINESS = 'burstiness'
 
 # Matrix entry fields
 FIELD_CONC = 'conc'
+FIELD_CONC_LIST = 'conc-list'
 FIELD_MAX_MODEL_LEN = 'max-model-len'
 FIELD_EXP_NAME = 'exp-name'
+FIELD_CUDA_GRAPH_MAX_BS = 'cuda-graph-max-bs'
+FIELD_CUDA_GRAPH_SIZES = 'cuda-graph-sizes'
+FIELD_COMPILE_SIZES = 'compile-sizes'
+FIELD_ENGINE_ARGS_TAG = 'engine-args-tag'
+FIELD_KV_CAPACITY = 'kv-capacity'
+FIELD_PREDICTED = 'predicted'
 
 seq_len_stoi = {
     "1k1k": (1024, 1024),
@@ -40,6 +71,96 @@ seq_len_stoi = {
 # Reverse mapping for exp-name generation
 seq_len_itos = {v: k for k, v in seq_len_stoi.items()}
 
+# Inter-arrival distributions of open-loop load. gamma with burstiness 1 is poisson; lower
+# burstiness sends requests in tighter bursts at the same average rate
+ARRIVAL_DISTRIBUTIONS = ('poisson', 'gamma')
+DEFAULT_ARRIVAL = 'poisson'
+DEFAULT_BURSTINESS = 1.0
+
+# Entry fields an engine-arg rule can be conditioned on
+RULE_CONDITION_FIELDS = (FIELD_CONC, FIELD_TP, FIELD_EP, FIELD_DP_ATTN, FIELD_ISL, FIELD_OSL)
+# A rule condition is a literal to compare for equality or a comparison such as '>= 256'
+RULE_COMPARISON = re.compile(r'^\s*(>=|<=|==|!=|>|<)\s*(-?\d+(?:\.\d+)?)\s*$')
+RULE_OPERATORS = {'>=': operator.ge, '<=': operator.le, '==': operator.eq,
+                  '!=': operator.ne, '>': operator.gt, '<': operator.lt}
+
+# Planner constants
+# Benchmark scripts send CONC * 10 prompts at max concurrency CONC, i.e. ~10 rounds of requests
+PLAN_PROMPTS_PER_CONC = 10
+# Default per-job startup cost (allocation, image import, model download/load, graph capture)
+PLAN_DEFAULT_STARTUP_S = 900.0
+# Analytic fallback for entries without history: e2el = isl / prefill rate + osl * tpot,
+# where tpot grows linearly with the running batch past a knee
+ANALYTIC_PREFILL_TOK_PER_S_PER_GPU = 4000.0
+ANALYTIC_BASE_TPOT_S = 0.015
+ANALYTIC_TPOT_KNEE_CONC = 64
+
+# Adaptive concurrency search constants
+ADAPTIVE_DEFAULT_STEP_SIZE = 4
+ADAPTIVE_DEFAULT_POINTS_PER_ROUND = 2
+# Throughput is considered saturated once it gains less than this fraction per doubling of
+# concurrency
+ADAPTIVE_DEFAULT_SATURATION = 0.05
+
+# Engine-knob autotuner constants
+AUTOTUNE_DEFAULT_CANDIDATES = 9
+# Successive halving keeps the best 1/eta of the candidates at each rung and measures
+# the survivors at eta times as many concurrencies
+AUTOTUNE_DEFAULT_ETA = 3
+
+# Serving simulator constants
+# Engine args capping the running batch and the prefill tokens per step, and the values
+# assumed when a result or entry does not set them (the running batch then only is
+# capped by the client concurrency)
+MAX_RUNNING_ARGS = ('max-running-requests', 'max-num-seqs', 'max_batch_size')
+PREFILL_CHUNK_ARGS = ('chunked-prefill-size', 'max-num-batched-tokens', 'max_num_tokens')
+SIMULATE_DEFAULT_PREFILL_CHUNK = 16384
+SIMULATE_DEFAULT_HOLDOUT = 0.2
+# Prompt and output lengths are drawn uniformly from [ratio * isl, isl] and [ratio * osl, osl],
+# the benchmark workflows' default --random-range-ratio
+SIMULATE_RANDOM_RANGE_RATIO = 0.8
+SIMULATE_METRICS = ('tput_per_gpu', 'median_ttft', 'median_tpot', 'median_e2el')
+
+# Batch sizes engines capture CUDA graphs for and pad decode batches up to (the full lists
+# the benchmark scripts used to hard-code), and the subset also compiled with torch.compile
+CUDA_GRAPH_SIZE_LADDER = [1, 2, 4] + list(range(6, 129, 2)) + list(range(136, 1025, 8)) + [2048, 4096, 8192]
+COMPILE_SIZE_LADDER = [1, 2, 4] + list(range(6, 129, 2)) + [256, 512, 1024, 2048, 8192]
+# Frameworks whose DP attention dispatch assigns each new request to the least loaded rank
+# (TRT-LLM's attention DP scheduler), so with at most conc requests running no rank holds
+# more than ceil(conc / tp). SGLang dispatches round robin without regard to load, so in a
+# closed loop one rank can accumulate the requests; it gets graphs for the whole conc.
+DP_ATTN_BALANCED_FRAMEWORKS = {'trt'}
+
+# Engine arg setting the memory fraction of each framework, and the framework's own
+# default. vLLM and SGLang budget weights and KV cache out of that fraction of HBM;
+# TRT-LLM gives the KV cache that fraction of the memory left free after loading the
+# weights.
+MEM_FRACTION_ARGS = {'vllm': 'gpu-memory-utilization', 'sglang': 'mem-fraction-static', 'trt': 'free-gpu-memory-fraction'}
+DEFAULT_MEM_FRACTION = {'vllm': 0.9, 'sglang': 0.8, 'trt': 0.9}
+# Memory fraction and kv-cache-dtype each benchmark script falls back to when the entry's
+# engine-args do not set them, by (model code, precision, GPU, framework). They apply to
+# custom entries and any config without engine-args, and must match the scripts.
+SCRIPT_ENGINE_DEFAULTS = {
+    ('dsr1', 'fp4', 'b200', 'sglang'): {'mem-fraction-static': 0.85, 'kv-cache-dtype': 'fp8_e4m3'},
+    ('dsr1', 'fp8', 'b200', 'sglang'): {'mem-fraction-static': 0.82, 'kv-cache-dtype': 'fp8_e4m3'},
+    ('dsr1', 'fp8', 'h200', 'sglang'): {'mem-fraction-static': 0.82},
+    ('dsr1', 'fp4', 'mi355x', 'sglang'): {'mem-fraction-static': 0.8},
+    ('dsr1', 'fp8', 'mi300x', 'sglang'): {'mem-fraction-static': 0.8},
+    ('dsr1', 'fp8', 'mi325x', 'sglang'): {'mem-fraction-static': 0.8},
+    ('dsr1', 'fp8', 'mi355x', 'sglang'): {'mem-fraction-static': 0.8},
+    ('dsr1', 'fp4', 'b200', 'trt'): {'free-gpu-memory-fraction': 0.8, 'kv-cache-dtype': 'fp8'},
+    ('dsr1', 'fp8', 'b200', 'trt'): {'free-gpu-memory-fraction': 0.8, 'kv-cache-dtype': 'fp8'},
+    ('dsr1', 'fp8', 'h200', 'trt'): {'free-gpu-memory-fraction': 0.75, 'kv-cache-dtype': 'fp8'},
+    ('gptoss', 'fp4', 'b200', 'trt'): {'free-gpu-memory-fraction': 0.85, 'kv-cache-dtype': 'fp8'},
+    ('gptoss', 'fp4', 'h200', 'trt'): {'free-gpu-memory-fraction': 0.85, 'kv-cache-dtype': 'auto'},
+    ('gptoss', 'fp4', 'b200', 'vllm'): {'gpu-memory-utilization': 0.9},
+    ('gptoss', 'fp4', 'h100', 'vllm'): {'gpu-memory-utilization': 0.9},
+    ('gptoss', 'fp4', 'h200', 'vllm'): {'gpu-memory-utilization': 0.9},
+    ('gptoss', 'fp4', 'mi300x', 'vllm'): {'gpu-memory-utilization': 0.95},
+    ('gptoss', 'fp4', 'mi325x', 'vllm'): {'gpu-memory-utilization': 0.95},
+    ('gptoss', 'fp4', 'mi355x', 'vllm'): {'gpu-memory-utilization': 0.95},
+}
+
 
 def seq_len_to_str(isl: int, osl: int) -> str:
     """Convert sequence lengths to short string representation.
@@ -65,8 +186,19 @@ class MatrixEntry(BaseModel):
     ep: int
     dp_attn: bool = Field(alias='dp-attn')
     conc: int
+    conc_list: Optional[List[int]] = Field(default=None, alias='conc-list')
     max_model_len: int = Field(alias='max-model-len')
     exp_name: str = Field(alias='exp-name')
+    cuda_graph_max_bs: Optional[int] = Field(default=None, alias='cuda-graph-max-bs')
+    cuda_graph_sizes: Optional[List[int]] = Field(default=None, alias='cuda-graph-sizes')
+    compile_sizes: Optional[List[int]] = Field(default=None, alias='compile-sizes')
+    engine_args: Optional[Dict[str, Union[bool, int, float, str]]] = Field(default=None, alias='engine-args')
+    engine_args_tag: Optional[str] = Field(default=None, alias='engine-args-tag')
+    kv_capacity: Optional[int] = Field(default=None, alias='kv-capacity')
+    request_rate: Optional[float] = Field(default=None, alias='request-rate')
+    arrival: Optional[str] = None
+    burstiness: Optional[float] = None
+    predicted: Optional[Dict[str, float]] = None
 
 
 def validate_matrix_output(matrix_values: List[dict]) -> List[dict]:
@@ -109,6 +241,8 @@ def validate_master_configs_structure(all_config_data):
                 raise ValueError(
                     f"Field '{field}' must be {expected_type.__name__} for key '{key}', got {type(val[field]).__name__}")
 
+        validate_engine_knobs(val, f"for key '{key}'")
+
         seq_len_configs = val[FIELD_SEQ_LEN_CONFIGS]
         if len(seq_len_configs) == 0:
             raise ValueError(
@@ -141,7 +275,9 @@ def validate_master_configs_structure(all_config_data):
             for j, bmk in enumerate(bmk_space):
                 # Define allowed fields
                 allowed_fields = {FIELD_TP, FIELD_CONC_START,
-                                  FIELD_CONC_END, FIELD_EP, FIELD_DP_ATTN}
+                                  FIELD_CONC_END, FIELD_EP, FIELD_DP_ATTN,
+                                  FIELD_ENGINE_ARGS, FIELD_ENGINE_ARG_RULES,
+                                  FIELD_REQUEST_RATE, FIELD_ARRIVAL, FIELD_BURSTINESS}
                 required_bmk_fields = {FIELD_TP: int,
                                        FIELD_CONC_START: int, FIELD_CONC_END: int}
                 optional_bmk_fields = {FIELD_EP: int, FIELD_DP_ATTN: bool}
@@ -168,6 +304,172 @@ def validate_master_configs_structure(all_config_data):
                             raise ValueError(
                                 f"'{field}' must be {expected_type.__name__} in search-space[{j}] of seq-len-config[{i}] for key '{key}'")
 
+                validate_engine_knobs(bmk, f"in search-space[{j}] of seq-len-config[{i}] for key '{key}'")
+                validate_arrivals(bmk, f"in search-space[{j}] of seq-len-config[{i}] for key '{key}'")
+
+
+def _is_engine_arg_value(value):
+    return isinstance(value, (bool, int, float, str))
+
+
+def validate_engine_knobs(scope, where):
+    """Validate the optional 'engine-args' map and 'engine-arg-rules' list of a config or search-space entry.
+
+    engine-args maps a server flag to a value, or to a list of values to sweep.
+    Each rule has a 'when' map of entry fields to conditions and a 'set' map of
+    flag values applied when all conditions hold.
+    """
+    engine_args = scope.get(FIELD_ENGINE_ARGS)
+    if engine_args is not None:
+        if not isinstance(engine_args, dict):
+            raise ValueError(f"'{FIELD_ENGINE_ARGS}' must be dict {where}")
+        for name, value in engine_args.items():
+            values = value if isinstance(value, list) else [value]
+            if not values or not all(_is_engine_arg_value(v) for v in values):
+                raise ValueError(
+                    f"'{FIELD_ENGINE_ARGS}' value of '{name}' must be a scalar or a non-empty list of scalars {where}")
+
+    rules = scope.get(FIELD_ENGINE_ARG_RULES)
+    if rules is None:
+        return
+    if not isinstance(rules, list):
+        raise ValueError(f"'{FIELD_ENGINE_ARG_RULES}' must be list {where}")
+    for k, rule in enumerate(rules):
+        if not isinstance(rule, dict) or set(rule.keys()) != {FIELD_RULE_WHEN, FIELD_RULE_SET}:
+            raise ValueError(
+                f"'{FIELD_ENGINE_ARG_RULES}[{k}]' must have exactly '{FIELD_RULE_WHEN}' and '{FIELD_RULE_SET}' {where}")
+        when, set_args = rule[FIELD_RULE_WHEN], rule[FIELD_RULE_SET]
+        if not isinstance(when, dict) or not isinstance(set_args, dict) or not set_args:
+            raise ValueError(
+                f"'{FIELD_RULE_WHEN}' and '{FIELD_RULE_SET}' must be dicts in '{FIELD_ENGINE_ARG_RULES}[{k}]' {where}")
+        for field, condition in when.items():
+            if field not in RULE_CONDITION_FIELDS:
+                raise ValueError(
+                    f"Unknown condition field '{field}' in '{FIELD_ENGINE_ARG_RULES}[{k}]' {where}. "
+                    f"Valid fields are: {', '.join(RULE_CONDITION_FIELDS)}")
+            if isinstance(condition, str) and not RULE_COMPARISON.match(condition):
+                raise ValueError(
+                    f"Invalid condition '{field}: {condition}' in '{FIELD_ENGINE_ARG_RULES}[{k}]' {where}, "
+                    f"expected a value or a comparison like '>= 256'")
+        for name, value in set_args.items():
+            if not _is_engine_arg_value(value):
+                raise ValueError(
+                    f"'{FIELD_RULE_SET}' value of '{name}' must be a scalar in '{FIELD_ENGINE_ARG_RULES}[{k}]' {where}")
+
+
+def _is_positive_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+
+def validate_arrivals(bmk, where):
+    """Validate the optional open-loop load fields of a search-space entry.
+
+    request-rate is a positive rate (req/s) or a non-empty list of rates to sweep.
+    arrival and burstiness only apply with a request-rate. Gamma arrivals need a
+    burstiness, and only they take one.
+    """
+    rates = bmk.get(FIELD_REQUEST_RATE)
+    if rates is not None:
+        rates = rates if isinstance(rates, list) else [rates]
+        if not rates or not all(_is_positive_number(r) for r in rates):
+            raise ValueError(
+                f"'{FIELD_REQUEST_RATE}' must be a positive number or a non-empty list of positive numbers {where}")
+
+    arrival = bmk.get(FIELD_ARRIVAL)
+    if arrival is not None:
+        if rates is None:
+            raise ValueError(f"'{FIELD_ARRIVAL}' requires '{FIELD_REQUEST_RATE}' {where}")
+        if arrival not in ARRIVAL_DISTRIBUTIONS:
+            raise ValueError(
+                f"'{FIELD_ARRIVAL}' must be one of {', '.join(ARRIVAL_DISTRIBUTIONS)} {where}, got '{arrival}'")
+
+    burstiness = bmk.get(FIELD_BURSTINESS)
+    if burstiness is not None:
+        if arrival != 'gamma':
+            raise ValueError(f"'{FIELD_BURSTINESS}' requires '{FIELD_ARRIVAL}: gamma' {where}")
+        if not _is_positive_number(burstiness):
+            raise ValueError(f"'{FIELD_BURSTINESS}' must be a positive number {where}")
+    elif arrival == 'gamma':
+        raise ValueError(f"'{FIELD_ARRIVAL}: gamma' requires '{FIELD_BURSTINESS}' {where}")
+
+
+def expand_arrivals(entry, bmk, sweep=True):
+    """Expand a matrix entry by the offered request rates of its search-space entry.
+
+    Without a request-rate the entry is closed-loop (--request-rate inf) and returned
+    as is. Otherwise there is one open-loop entry per rate, still capped at conc
+    requests in flight. With sweep=False only the first rate is used.
+    """
+    rates = bmk.get(FIELD_REQUEST_RATE)
+    if rates is None:
+        return [entry]
+    rates = rates if isinstance(rates, list) else [rates]
+    arrival = bmk.get(FIELD_ARRIVAL, DEFAULT_ARRIVAL)
+    entries = []
+    for rate in rates if sweep else rates[:1]:
+        expanded = {**entry, FIELD_REQUEST_RATE: float(rate), FIELD_ARRIVAL: arrival}
+        if arrival == 'gamma':
+            expanded[FIELD_BURSTINESS] = float(bmk[FIELD_BURSTINESS])
+        entries.append(expanded)
+    return entries
+
+
+def rule_matches(when, entry):
+    """Whether every condition of an engine-arg rule holds for a matrix entry."""
+    for field, condition in when.items():
+        comparison = RULE_COMPARISON.match(condition) if isinstance(condition, str) else None
+        if comparison:
+            op, threshold = comparison.groups()
+            if not RULE_OPERATORS[op](entry[field], float(threshold)):
+                return False
+        elif entry[field] != condition:
+            return False
+    return True
+
+
+def engine_args_tag(engine_args):
+    """Result-filename-safe name of a set of engine arg values, e.g. 'max-num-seqs-128_block-size-16'."""
+    return re.sub(r'[^A-Za-z0-9._-]', '', '_'.join(f'{name}-{value}' for name, value in engine_args.items()))
+
+
+def expand_engine_args(entry, scopes, sweep=True):
+    """Expand a matrix entry by the engine knobs of its config and search-space entry.
+
+    scopes are the config and search-space dicts, outermost first; inner scopes
+    override outer ones. Flag values are resolved as fixed engine-args, then matching
+    rules in order, then swept engine-args (lists), which produce one entry per
+    combination and an 'engine-args-tag' naming it. With sweep=False only the first
+    value of each swept flag is used.
+    """
+    fixed_args, swept_args, rules = {}, {}, []
+    for scope in scopes:
+        for name, value in (scope.get(FIELD_ENGINE_ARGS) or {}).items():
+            fixed_args.pop(name, None)
+            swept_args.pop(name, None)
+            if isinstance(value, list):
+                swept_args[name] = value if sweep else value[:1]
+            else:
+                fixed_args[name] = value
+        rules += scope.get(FIELD_ENGINE_ARG_RULES) or []
+
+    for rule in rules:
+        if rule_matches(rule[FIELD_RULE_WHEN], entry):
+            fixed_args.update(rule[FIELD_RULE_SET])
+
+    if not fixed_args and not swept_args:
+        return [entry]
+
+    entries = []
+    for combination in itertools.product(*swept_args.values()):
+        swept = dict(zip(swept_args, combination))
+        expanded = {**entry, FIELD_ENGINE_ARGS: {**fixed_args, **swept}}
+        # Only axes with several values tell entries apart
+        tag = engine_args_tag({name: value for name, value in swept.items() if len(swept_args[name]) > 1})
+        if tag:
+            expanded[FIELD_ENGINE_ARGS_TAG] = tag
+        entries.append(expanded)
+    return entries
+
 
 def generate_full_sweep(args, all_config_data):
     """Generate full sweep configurations with optional filtering.
@@ -272,7 +574,8 @@ def generate_full_sweep(args, all_config_data):
                 if dp_attn is not None:
                     entry[FIELD_DP_ATTN] = dp_attn
 
-                matrix_values.append(entry)
+                for arrival_entry in expand_arrivals(entry, highest_tp_bmk, sweep=False):
+                    matrix_values += expand_engine_args(arrival_entry, [val, highest_tp_bmk], sweep=False)
             else:
                 # Full sweep mode
                 for bmk in bmk_space:
@@ -306,7 +609,8 @@ def generate_full_sweep(args, all_config_data):
                         if dp_attn is not None:
                             entry[FIELD_DP_ATTN] = dp_attn
 
-                        matrix_values.append(entry)
+                        for arrival_entry in expand_arrivals(entry, bmk):
+                            matrix_values += expand_engine_args(arrival_entry, [val, bmk])
 
                         if conc == conc_end:
                             break
@@ -331,6 +635,182 @@ def generate_full_sweep(args, all_config_data):
     return matrix_values
 
 
+# Derived from the concurrency by add_graph_sizes, so ignored when grouping
+GRAPH_SIZE_FIELDS = (FIELD_CUDA_GRAPH_MAX_BS, FIELD_CUDA_GRAPH_SIZES, FIELD_COMPILE_SIZES)
+
+
+def group_entries_by_server(matrix_values: List[dict]) -> List[dict]:
+    """Collapse entries that only differ in concurrency into one entry per server launch.
+
+    Entries sharing image, model, runner, seq-lens, tp, ep, dp-attn and max-model-len
+    are served by an identical engine launch, so they are merged into a single entry
+    whose 'conc-list' holds every concurrency (ascending). 'conc' is set to the highest
+    concurrency in the group since the benchmark scripts use it to size the server.
+    """
+    groups = {}
+    for entry in matrix_values:
+        # Engine args may differ by concurrency through rules, which needs separate servers
+        key = tuple(sorted((k, json.dumps(v, sort_keys=True) if isinstance(v, dict) else v)
+                           for k, v in entry.items()
+                           if k not in (FIELD_CONC, FIELD_CONC_LIST) + GRAPH_SIZE_FIELDS))
+        if key not in groups:
+            groups[key] = (entry, [])
+        groups[key][1].extend(entry.get(FIELD_CONC_LIST) or [entry[FIELD_CONC]])
+
+    grouped_values = []
+    for entry, concs in groups.values():
+        conc_list = sorted(set(concs))
+        grouped_entry = dict(entry)
+        grouped_entry[FIELD_CONC] = conc_list[-1]
+        grouped_entry[FIELD_CONC_LIST] = conc_list
+        grouped_values.append(grouped_entry)
+
+    return grouped_values
+
+
+def reachable_sizes(ladder, max_batch):
+    """Ladder sizes a batch of at most max_batch can be padded to.
+
+    Batches are padded up to the next ladder size, so the sizes needed are those
+    below max_batch plus the first one at or above it (the whole ladder if none is).
+    """
+    sizes = [size for size in ladder if size < max_batch]
+    padded = next((size for size in ladder if size >= max_batch), None)
+    return sizes + [padded] if padded else sizes
+
+
+def max_running_batch(conc, tp, dp_attn, framework):
+    """Largest decode batch one engine rank can run at a given client concurrency.
+
+    The scripts cap running requests at the concurrency, so a rank never sees more.
+    With DP attention each of the tp ranks batches its own requests, at most its even
+    share when the framework dispatches to the least loaded rank.
+    """
+    if dp_attn and framework in DP_ATTN_BALANCED_FRAMEWORKS:
+        return math.ceil(conc / tp)
+    return conc
+
+
+def add_graph_sizes(matrix_values: List[dict]) -> List[dict]:
+    """Attach the CUDA graph capture and compile sizes each entry's server actually needs.
+
+    Sizes are derived from the largest batch one rank runs at the highest concurrency
+    of the server (its conc-list when grouped), so low-concurrency points no longer
+    capture and compile hundreds of graphs they can never use. Adds
+    'cuda-graph-max-bs', 'cuda-graph-sizes' and 'compile-sizes', which the benchmark
+    scripts read as CUDA_GRAPH_MAX_BS, CUDA_GRAPH_SIZES and COMPILE_SIZES.
+    """
+    sized_values = []
+    for entry in matrix_values:
+        conc = max(entry.get(FIELD_CONC_LIST) or [entry[FIELD_CONC]])
+        max_batch = max_running_batch(conc, entry[FIELD_TP], entry[FIELD_DP_ATTN], entry.get(FIELD_FRAMEWORK))
+        cuda_graph_sizes = reachable_sizes(CUDA_GRAPH_SIZE_LADDER, max_batch)
+        sized_values.append({
+            **entry,
+            FIELD_CUDA_GRAPH_MAX_BS: cuda_graph_sizes[-1],
+            FIELD_CUDA_GRAPH_SIZES: cuda_graph_sizes,
+            FIELD_COMPILE_SIZES: reachable_sizes(COMPILE_SIZE_LADDER, max_batch),
+        })
+    return sized_values
+
+
+def hbm_gb(runner):
+    """HBM per GPU of a runner type or node label, or None if the hardware is unknown."""
+    spec = hardware_spec(runner)
+    return spec['memory_gb'] if spec else None
+
+
+def weight_gb_per_gpu(arch, precision, tp, dp_attn):
+    """Weights held by each GPU: experts are spread over all tp GPUs (by TP or EP), while
+    with DP attention every rank holds the full attention and dense weights."""
+    expert_gb = arch['expert_params_b'] * WEIGHT_BYTES_PER_PARAM[precision] / tp
+    dense_gb = arch['dense_params_b'] * arch['dense_bytes_per_param'] / (1 if dp_attn else tp)
+    return expert_gb + dense_gb
+
+
+def kv_bytes_per_seq(arch, tokens, kv_bytes, tp, dp_attn):
+    """KV cache bytes one sequence of tokens takes on each GPU that holds it.
+
+    An MLA latent is shared by all heads and replicated over TP ranks; GQA heads are
+    split over them.
+    """
+    token_bytes = kv_elements_per_token(arch) * kv_bytes
+    if 'kv_heads' in arch and not dp_attn:
+        token_bytes = token_bytes * math.ceil(arch['kv_heads'] / tp) / arch['kv_heads']
+    sliding_layers = arch.get('sliding_layers', 0)
+    full_layers = arch['layers'] - sliding_layers
+    return token_bytes * (full_layers * tokens + sliding_layers * min(tokens, arch.get('sliding_window', tokens)))
+
+
+def kv_capacity(entry):
+    """Maximum number of isl+osl token sequences the KV cache of an entry's server holds at once.
+
+    Uses the HBM of the entry's runner, the weights per GPU at its precision and
+    parallel layout, and the memory fraction and KV cache dtype the server starts with:
+    the entry's engine-args, else its benchmark script's fallback, else the framework's
+    default. With DP attention each rank caches its own sequences.
+    Returns None when the model, hardware or precision is not known to the model.
+    """
+    arch = MODEL_SPECS.get(entry[FIELD_MODEL])
+    hbm = hbm_gb(entry[FIELD_RUNNER])
+    if arch is None or hbm is None or entry[FIELD_PRECISION] not in WEIGHT_BYTES_PER_PARAM:
+        return None
+
+    framework = entry[FIELD_FRAMEWORK]
+    tp, dp_attn = entry[FIELD_TP], entry[FIELD_DP_ATTN]
+    script_key = (str(entry.get(FIELD_EXP_NAME, '')).split('_')[0], entry[FIELD_PRECISION],
+                  hardware_name(entry[FIELD_RUNNER]), framework)
+    engine_args = {**SCRIPT_ENGINE_DEFAULTS.get(script_key, {}), **(entry.get(FIELD_ENGINE_ARGS) or {})}
+    mem_fraction = float(engine_args.get(MEM_FRACTION_ARGS.get(framework), DEFAULT_MEM_FRACTION.get(framework, 0.9)))
+    kv_bytes = kv_dtype_bytes(engine_args.get('kv-cache-dtype'))
+
+    weights_gb = weight_gb_per_gpu(arch, entry[FIELD_PRECISION], tp, dp_attn)
+    if framework == 'trt':
+        kv_gb = (hbm - weights_gb) * mem_fraction
+    else:
+        kv_gb = hbm * mem_fraction - weights_gb
+    if kv_gb <= 0:
+        return 0
+
+    seq_bytes = kv_bytes_per_seq(arch, entry[FIELD_ISL] + entry[FIELD_OSL], kv_bytes, tp, dp_attn)
+    per_rank = int(kv_gb * 1e9 // seq_bytes)
+    return per_rank * tp if dp_attn else per_rank
+
+
+def add_kv_capacity(matrix_values: List[dict], drop=False, file=None) -> List[dict]:
+    """Attach 'kv-capacity' to each entry and report entries whose concurrency exceeds it.
+
+    Such servers cannot keep every request resident: they OOM or queue requests,
+    which inflates latency. With drop=True those entries are left out. The report
+    goes to stderr by default so stdout stays a valid matrix.
+    """
+    file = file or sys.stderr
+    checked_values, infeasible, unknown = [], [], set()
+    for entry in matrix_values:
+        capacity = kv_capacity(entry)
+        if capacity is None:
+            unknown.add(f"{entry[FIELD_MODEL]} on {entry[FIELD_RUNNER]} ({entry[FIELD_PRECISION]})")
+            checked_values.append(entry)
+            continue
+        entry = {**entry, FIELD_KV_CAPACITY: capacity}
+        if max(entry.get(FIELD_CONC_LIST) or [entry[FIELD_CONC]]) > capacity:
+            infeasible.append(entry)
+            if drop:
+                continue
+        checked_values.append(entry)
+
+    if infeasible:
+        print(f"{len(infeasible)} entries exceed their KV cache capacity"
+              f"{' and were dropped' if drop else ''}:", file=file)
+        for entry in infeasible:
+            print(f"  {entry[FIELD_EXP_NAME]} {entry[FIELD_RUNNER]} {entry[FIELD_FRAMEWORK]} {entry[FIELD_PRECISION]} "
+                  f"tp={entry[FIELD_TP]} ep={entry[FIELD_EP]} dpa={entry[FIELD_DP_ATTN]}: "
+                  f"conc={entry.get(FIELD_CONC_LIST) or entry[FIELD_CONC]} > capacity={entry[FIELD_KV_CAPACITY]}", file=file)
+    for description in sorted(unknown):
+        print(f"No KV cache capacity model for {description}", file=file)
+    return checked_values
+
+
 def generate_test_config(args, all_config_data):
     """Generate test configurations for a specific key.
 
@@ -414,7 +894,8 @@ def generate_test_config(args, all_config_data):
                 if dp_attn is not None:
                     entry[FIELD_DP_ATTN] = dp_attn
 
-                matrix_values.append(entry)
+                for arrival_entry in expand_arrivals(entry, bmk, sweep=False):
+                    matrix_values += expand_engine_args(arrival_entry, [val, bmk], sweep=False)
             else:
                 # Generate entries for each concurrency value in the range
                 conc = conc_start
@@ -442,7 +923,8 @@ def generate_test_config(args, all_config_data):
                     if dp_attn is not None:
                         entry[FIELD_DP_ATTN] = dp_attn
 
-                    matrix_values.append(entry)
+                    for arrival_entry in expand_arrivals(entry, bmk):
+                        matrix_values += expand_engine_args(arrival_entry, [val, bmk])
 
                     if conc == conc_end:
                         break
@@ -521,7 +1003,7 @@ def generate_runner_model_sweep_config(args, all_config_data):
             if dp_attn is not None:
                 entry[FIELD_DP_ATTN] = dp_attn
 
-            matrix_values.append(entry)
+            matrix_values += expand_engine_args(entry, [val, highest_tp_bmk], sweep=False)
 
     return matrix_values
 
@@ -647,7 +1129,7 @@ def generate_runner_sweep_config(args, all_config_data):
             if dp_attn is not None:
                 entry[FIELD_DP_ATTN] = dp_attn
 
-            matrix_values.append(entry)
+            matrix_values += expand_engine_args(entry, [val, highest_tp_bmk], sweep=False)
 
     if len(matrix_values) == 0:
         error_msg = f"No configs found matching model prefix '{args.model_prefix}'"
@@ -660,6 +1142,781 @@ def generate_runner_sweep_config(args, all_config_data):
     return matrix_values
 
 
+def history_key(hw, model, framework, precision, isl, osl, tp, ep, dp_attn, request_rate, conc):
+    """Key used to match matrix entries against historical aggregated results.
+
+    request_rate is None for closed-loop results, so open-loop points never stand in for them.
+    """
+    return (hw, model, framework, precision, int(isl), int(osl),
+            int(tp), int(ep), str(dp_attn).lower(),
+            None if request_rate is None else float(request_rate), int(conc))
+
+
+# Fields every aggregated result record carries (process_result.py output)
+RESULT_RECORD_FIELDS = ('hw', 'tput_per_gpu', 'isl', 'osl', 'tp', 'ep', 'dp_attention', 'conc')
+
+
+def load_result_records(results_dir):
+    """Load aggregated result records (process_result.py output) found under results_dir.
+
+    Accepts both per-job 'agg_<result>.json' records and collected 'agg_<exp>.json' lists.
+    Files that do not parse (e.g. truncated downloads) and JSON that is not an aggregated
+    record are skipped, as are records without seq-len information (written before
+    isl/osl were recorded).
+    """
+    records = []
+    for result_path in Path(results_dir).rglob('*.json'):
+        try:
+            with open(result_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Skipping unreadable result file {result_path}: {e}", file=sys.stderr)
+            continue
+        for r in data if isinstance(data, list) else [data]:
+            if isinstance(r, dict) and all(r.get(field) is not None for field in RESULT_RECORD_FIELDS):
+                records.append(r)
+    return records
+
+
+def record_history_key(r):
+    """history_key of an aggregated result record."""
+    return history_key(r['hw'], r.get('model'), r.get('framework'), r.get('precision'),
+                       r['isl'], r['osl'], r['tp'], r['ep'], r['dp_attention'], r.get('request_rate'), r['conc'])
+
+
+def entry_history_key(entry, runner_type, conc):
+    """history_key of a matrix entry at a given concurrency."""
+    return history_key(runner_type, entry[FIELD_MODEL], entry[FIELD_FRAMEWORK], entry[FIELD_PRECISION],
+                       entry[FIELD_ISL], entry[FIELD_OSL], entry[FIELD_TP], entry[FIELD_EP],
+                       entry[FIELD_DP_ATTN], entry.get(FIELD_REQUEST_RATE), conc)
+
+
+def load_result_history(results_dir):
+    """Load historical aggregated results into a {history_key: [median_e2el, ...]} map."""
+    history = {}
+    for r in load_result_records(results_dir):
+        if 'median_e2el' in r:
+            history.setdefault(record_history_key(r), []).append(float(r['median_e2el']))
+    return history
+
+
+def estimate_e2el_analytic(isl, osl, tp, conc):
+    """Rough end-to-end latency (s) of one request when no history is available."""
+    prefill_s = isl / (ANALYTIC_PREFILL_TOK_PER_S_PER_GPU * tp)
+    tpot_s = ANALYTIC_BASE_TPOT_S * (1 + conc / ANALYTIC_TPOT_KNEE_CONC)
+    return prefill_s + osl * tpot_s
+
+
+def estimate_entry_runtime(entry, history, runner_type, startup_cost):
+    """Estimate the wall time (s) of a matrix entry.
+
+    Each concurrency sends conc * PLAN_PROMPTS_PER_CONC prompts at max concurrency conc, so
+    it runs ~PLAN_PROMPTS_PER_CONC back-to-back rounds of median_e2el each, and open-loop
+    entries at least as long as sending them at their request rate takes. Server-reuse
+    entries pay the startup cost once for their whole conc-list.
+
+    Returns (seconds, number of concurrencies estimated from history).
+    """
+    total = startup_cost
+    from_history = 0
+    for conc in entry.get(FIELD_CONC_LIST) or [entry[FIELD_CONC]]:
+        past = sorted(history.get(entry_history_key(entry, runner_type, conc), []))
+        if past:
+            e2el = past[len(past) // 2]
+            from_history += 1
+        else:
+            e2el = estimate_e2el_analytic(entry[FIELD_ISL], entry[FIELD_OSL], entry[FIELD_TP], conc)
+        num_prompts = conc * PLAN_PROMPTS_PER_CONC
+        seconds = (num_prompts / conc) * e2el
+        if entry.get(FIELD_REQUEST_RATE):
+            seconds = max(seconds, num_prompts / entry[FIELD_REQUEST_RATE])
+        total += seconds
+    return total, from_history
+
+
+def plan_node_assignment(matrix_values, runner_config, history, startup_cost=PLAN_DEFAULT_STARTUP_S):
+    """Assign matrix entries to concrete runner nodes with longest-processing-time-first packing.
+
+    Entries are sorted by estimated runtime (longest first) and each is placed on the least
+    loaded node of its runner type. Entries whose runner is already a node label stay pinned.
+
+    Returns (planned entries in dispatch order, {node: predicted seconds}, estimates) where
+    estimates holds (entry, seconds, concurrencies from history) per input entry.
+    """
+    node_to_type = {node: runner_type for runner_type, nodes in runner_config.items() for node in nodes}
+
+    estimates = []
+    for entry in matrix_values:
+        runner_type = node_to_type.get(entry[FIELD_RUNNER], entry[FIELD_RUNNER])
+        seconds, from_history = estimate_entry_runtime(entry, history, runner_type, startup_cost)
+        estimates.append((entry, seconds, from_history))
+
+    node_loads = {}
+    planned_values = []
+    for entry, seconds, _ in sorted(estimates, key=lambda x: x[1], reverse=True):
+        runner = entry[FIELD_RUNNER]
+        if runner in runner_config:
+            nodes = runner_config[runner]
+            if not nodes:
+                raise ValueError(f"Runner type '{runner}' has no runner nodes in runner config.")
+            node = min(nodes, key=lambda n: (node_loads.get(n, 0.0), nodes.index(n)))
+        elif runner in node_to_type:
+            node = runner
+        else:
+            raise ValueError(f"Runner '{runner}' is not a runner type or runner node in runner config.")
+
+        node_loads[node] = node_loads.get(node, 0.0) + seconds
+        planned_values.append({**entry, FIELD_RUNNER: node})
+
+    return planned_values, node_loads, estimates
+
+
+def print_plan_report(node_loads, estimates, file=None):
+    """Print predicted per-node load and total makespan of a plan (to stderr by default)."""
+    file = file or sys.stderr
+    n_concs = sum(len(e.get(FIELD_CONC_LIST) or [e[FIELD_CONC]]) for e, _, _ in estimates)
+    n_history = sum(h for _, _, h in estimates)
+
+    print(f"{'Node':<16} {'Predicted (h)':<14}", file=file)
+    print("-" * 31, file=file)
+    for node, seconds in sorted(node_loads.items()):
+        print(f"{node:<16} {seconds / 3600:<14.2f}", file=file)
+    print("-" * 31, file=file)
+    makespan = max(node_loads.values()) if node_loads else 0.0
+    print(f"Predicted makespan: {makespan / 3600:.2f} h "
+          f"({len(estimates)} jobs, {n_history}/{n_concs} concurrencies estimated from history)", file=file)
+
+
+def generate_sweep_plan(args, all_config_data):
+    """Generate a full sweep and assign each entry to a concrete runner node.
+
+    Uses the same filters as full-sweep. The predicted per-node and total makespan is
+    printed to stderr so stdout stays a valid matrix.
+    """
+    try:
+        with open(args.runner_config, 'r') as f:
+            runner_config = yaml.safe_load(f)
+    except FileNotFoundError:
+        raise ValueError(
+            f"Runner config file '{args.runner_config}' does not exist.")
+
+    matrix_values = generate_full_sweep(args, all_config_data)
+    if args.group_conc:
+        matrix_values = group_entries_by_server(matrix_values)
+
+    history = load_result_history(args.results_dir) if args.results_dir else {}
+    planned_values, node_loads, estimates = plan_node_assignment(
+        matrix_values, runner_config, history, args.startup_cost)
+    print_plan_report(node_loads, estimates)
+
+    return planned_values
+
+
+def frontier_refinement_scores(points, saturation=ADAPTIVE_DEFAULT_SATURATION):
+    """Score the intervals between adjacent measured concurrencies of one search-space block.
+
+    points is a list of (conc, tput_per_gpu, median_intvty) sorted by conc. Both metrics are
+    normalized by their maximum so they weigh equally. An interval scores its length on the
+    normalized throughput-vs-interactivity curve, weighted by the turning angle (curvature)
+    at its endpoints, so wide gaps and the knee of the frontier are refined first.
+
+    An interval whose throughput gains less than `saturation` per doubling of concurrency is
+    flat and not scored. The gain is normalized by the interval's width in doublings, since
+    refinement puts measured points ever closer together and a rising curve gains less
+    between close neighbours. Intervals above a flat one (e.g. a noisy dip) are still scored.
+
+    Returns (list of (score, lo_conc, hi_conc), saturated).
+    """
+    if len(points) < 2:
+        return [], False
+
+    max_tput = max(p[1] for p in points) or 1.0
+    max_intvty = max(p[2] for p in points) or 1.0
+    xy = [(p[2] / max_intvty, p[1] / max_tput) for p in points]
+
+    def turning_angle(i):
+        if i == 0 or i == len(xy) - 1:
+            return 0.0
+        v1 = (xy[i][0] - xy[i - 1][0], xy[i][1] - xy[i - 1][1])
+        v2 = (xy[i + 1][0] - xy[i][0], xy[i + 1][1] - xy[i][1])
+        n1, n2 = math.hypot(*v1), math.hypot(*v2)
+        if n1 == 0 or n2 == 0:
+            return 0.0
+        cos = max(-1.0, min(1.0, (v1[0] * v2[0] + v1[1] * v2[1]) / (n1 * n2)))
+        return math.acos(cos) / math.pi
+
+    scores = []
+    saturated = False
+    for i in range(len(points) - 1):
+        (lo, lo_tput, _), (hi, hi_tput, _) = points[i], points[i + 1]
+        if hi_tput < lo_tput * (1 + saturation) ** math.log2(hi / lo):
+            saturated = True
+            continue
+        gap = math.hypot(xy[i + 1][0] - xy[i][0], xy[i + 1][1] - xy[i][1])
+        curvature = max(turning_angle(i), turning_angle(i + 1))
+        scores.append((gap * (1 + curvature), lo, hi))
+
+    return scores, saturated
+
+
+def propose_refinement_concs(points, max_new_points=ADAPTIVE_DEFAULT_POINTS_PER_ROUND,
+                             saturation=ADAPTIVE_DEFAULT_SATURATION):
+    """Pick up to max_new_points new concurrencies inside the highest scoring intervals.
+
+    Each new point is the geometric mean of its interval's endpoints, matching the
+    geometric spacing of the coarse ladder. Intervals with no integer concurrency strictly
+    inside them are skipped.
+    """
+    scores, _ = frontier_refinement_scores(points, saturation)
+    measured = {p[0] for p in points}
+
+    new_concs = []
+    for _, lo, hi in sorted(scores, reverse=True):
+        if len(new_concs) == max_new_points:
+            break
+        conc = int(round(math.sqrt(lo * hi)))
+        if lo < conc < hi and conc not in measured:
+            new_concs.append(conc)
+
+    return sorted(new_concs)
+
+
+def load_node_to_type(runner_config_file):
+    """Map each runner node of a runner config file to its runner type ({} without a file)."""
+    if not runner_config_file:
+        return {}
+    try:
+        with open(runner_config_file, 'r') as f:
+            runner_config = yaml.safe_load(f)
+    except FileNotFoundError:
+        raise ValueError(
+            f"Runner config file '{runner_config_file}' does not exist.")
+    return {node: runner_type for runner_type, nodes in runner_config.items() for node in nodes}
+
+
+def generate_adaptive_sweep(args, all_config_data):
+    """Generate the next round of an adaptive concurrency search.
+
+    The coarse ladder is the full sweep at --step-size. Blocks whose coarse ladder has not
+    been fully measured in --results-dir get their missing coarse points. Fully measured
+    blocks get up to --max-new-points follow-up concurrencies where the throughput vs
+    interactivity frontier has its largest gaps or sharpest bends, and none once throughput
+    has saturated. An empty matrix means the search has converged.
+    """
+    node_to_type = load_node_to_type(args.runner_config)
+    matrix_values = generate_full_sweep(args, all_config_data)
+
+    # {history key without conc: {conc: [records]}}
+    measured = {}
+    for r in load_result_records(args.results_dir) if args.results_dir else []:
+        if 'tput_per_gpu' not in r or 'median_intvty' not in r:
+            continue
+        key = record_history_key(r)
+        measured.setdefault(key[:-1], {}).setdefault(key[-1], []).append(r)
+
+    new_values = []
+    for group in group_entries_by_server(matrix_values):
+        template = {k: v for k, v in group.items() if k != FIELD_CONC_LIST}
+        coarse_concs = group[FIELD_CONC_LIST]
+        runner_type = node_to_type.get(group[FIELD_RUNNER], group[FIELD_RUNNER])
+        block_results = measured.get(entry_history_key(group, runner_type, 0)[:-1], {})
+
+        missing = [c for c in coarse_concs if c not in block_results]
+        if missing:
+            new_concs, status = missing, 'coarse'
+        else:
+            points = []
+            for conc in sorted(block_results):
+                if not coarse_concs[0] <= conc <= coarse_concs[-1]:
+                    continue
+                tputs = sorted(float(r['tput_per_gpu']) for r in block_results[conc])
+                intvtys = sorted(float(r['median_intvty']) for r in block_results[conc])
+                points.append((conc, tputs[len(tputs) // 2], intvtys[len(intvtys) // 2]))
+            new_concs = propose_refinement_concs(points, args.max_new_points, args.saturation_threshold)
+            _, saturated = frontier_refinement_scores(points, args.saturation_threshold)
+            status = 'saturated' if saturated else 'refine'
+
+        print(f"{group[FIELD_EXP_NAME]} {group[FIELD_RUNNER]} {group[FIELD_FRAMEWORK]} {group[FIELD_PRECISION]} "
+              f"tp={group[FIELD_TP]} ep={group[FIELD_EP]} dpa={group[FIELD_DP_ATTN]}: "
+              f"{status}, measured={sorted(block_results)}, next={new_concs}", file=sys.stderr)
+
+        for conc in new_concs:
+            new_values.append({**template, FIELD_CONC: conc})
+
+    return new_values
+
+
+def load_autotune_space(space_file):
+    """Load an autotune search space: a YAML map of engine arg to a list of candidate values.
+
+    Scalar values are fixed for every candidate.
+    """
+    try:
+        with open(space_file, 'r') as f:
+            space = yaml.safe_load(f)
+    except FileNotFoundError:
+        raise ValueError(f"Autotune space file '{space_file}' does not exist.")
+    if not isinstance(space, dict) or not space:
+        raise ValueError(f"Autotune space file '{space_file}' must contain a non-empty map of engine args.")
+    validate_engine_knobs({FIELD_ENGINE_ARGS: space}, f"in autotune space file '{space_file}'")
+    return space
+
+
+def autotune_candidates(space, max_candidates, seed=0):
+    """Knob settings to tune over, as {tag: engine args}.
+
+    The candidates are the grid of the space's list values, or a sample of
+    max_candidates of them drawn with seed when the grid is larger. Tags name the
+    values of the swept engine args.
+    """
+    grid = [dict(zip(space, values))
+            for values in itertools.product(*(v if isinstance(v, list) else [v] for v in space.values()))]
+    if len(grid) > max_candidates:
+        grid = [grid[i] for i in sorted(random.Random(seed).sample(range(len(grid)), max_candidates))]
+    swept = [name for name, value in space.items() if isinstance(value, list) and len(value) > 1]
+    return {engine_args_tag({name: c[name] for name in swept}) or 'default': c for c in grid}
+
+
+def autotune_num_rungs(n_candidates, eta=AUTOTUNE_DEFAULT_ETA):
+    """Number of successive halving steps until one candidate is left."""
+    rungs = 0
+    while n_candidates > 1:
+        n_candidates = max(1, n_candidates // eta)
+        rungs += 1
+    return rungs
+
+
+def rung_concs(ladder, rung, num_rungs, eta=AUTOTUNE_DEFAULT_ETA):
+    """Concurrencies candidates are measured at in a rung.
+
+    An evenly spread subset of the ladder that grows eta-fold per rung, ending with
+    the full ladder at the last rung. Every rung adds at least one concurrency, so
+    survivors are never compared on the same evidence twice.
+    """
+    count = min(len(ladder), max(rung + 1, math.ceil(len(ladder) / eta ** (num_rungs - rung))))
+    if count == 1:
+        return [ladder[len(ladder) // 2]]
+    return [ladder[i] for i in sorted({round(i * (len(ladder) - 1) / (count - 1)) for i in range(count)})]
+
+
+def autotune_score(points, min_intvty=None, max_ttft=None):
+    """Best tput_per_gpu over the measured concurrencies that meet the constraints, or None if none does.
+
+    points maps conc to (tput_per_gpu, median_intvty, median_ttft).
+    """
+    feasible = [tput for tput, intvty, ttft in points.values()
+                if (min_intvty is None or (intvty is not None and intvty >= min_intvty))
+                and (max_ttft is None or (ttft is not None and ttft <= max_ttft))]
+    return max(feasible) if feasible else None
+
+
+def successive_halving_survivors(scores, eta=AUTOTUNE_DEFAULT_ETA):
+    """Tags of the best len(scores) // eta candidates (at least one).
+
+    Candidates without a score (failed, or never meeting the constraints) rank last;
+    ties keep candidate order.
+    """
+    ranked = sorted(scores, key=lambda tag: (scores[tag] is None, -(scores[tag] or 0.0)))
+    return ranked[:max(1, len(ranked) // eta)]
+
+
+def _median(values):
+    values = sorted(v for v in values if v is not None)
+    return values[len(values) // 2] if values else None
+
+
+def generate_autotune(args, all_config_data):
+    """Generate the next round of an engine-knob autotune with successive halving.
+
+    Each server configuration of the full sweep (same filters) is a study over the
+    candidates of --space. At rung r every surviving candidate is measured at
+    rung_concs of the study's concurrency ladder and scored by autotune_score; the
+    best 1/--eta survive to the next rung, which measures more concurrencies. The
+    last rung measures the full ladder, and its best candidate is the result.
+
+    Candidates, rungs and scores persist in the --state JSON file between rounds.
+    Results are matched to candidates by engine_args_tag in --results-dir. A
+    candidate proposed for a rung whose results never arrived is scored on what it
+    has. An empty matrix means every study has converged.
+    """
+    space = load_autotune_space(args.space)
+    node_to_type = load_node_to_type(args.runner_config)
+
+    state = {'space': space, 'studies': {}}
+    if Path(args.state).exists():
+        with open(args.state, 'r') as f:
+            state = json.load(f)
+        if state.get('space') != space:
+            raise ValueError(
+                f"Autotune state '{args.state}' was started with a different search space. Use a new --state file.")
+
+    # {(history key without conc, engine args tag): {conc: [records]}}
+    measured = {}
+    for r in load_result_records(args.results_dir) if args.results_dir else []:
+        if 'tput_per_gpu' not in r or not r.get('engine_args_tag'):
+            continue
+        key = record_history_key(r)
+        measured.setdefault((key[:-1], r['engine_args_tag']), {}).setdefault(key[-1], []).append(r)
+
+    # One study per server configuration, over its concurrencies
+    studies = {}
+    for entry in generate_full_sweep(args, all_config_data):
+        key = '|'.join(str(entry.get(f)) for f in (FIELD_EXP_NAME, FIELD_RUNNER, FIELD_FRAMEWORK, FIELD_PRECISION,
+                                                   FIELD_TP, FIELD_EP, FIELD_DP_ATTN, FIELD_ENGINE_ARGS_TAG))
+        studies.setdefault(key, {})[entry[FIELD_CONC]] = entry
+
+    new_values = []
+    for key, entries in studies.items():
+        study = state['studies'].get(key)
+        if study is None:
+            candidates = autotune_candidates(space, args.num_candidates, args.seed)
+            study = state['studies'][key] = {
+                'candidates': candidates,
+                'ladder': sorted(entries),
+                'num_rungs': autotune_num_rungs(len(candidates), args.eta),
+                'rung': 0,
+                'alive': list(candidates),
+                'proposed': {},
+                'history': [],
+                'best': None,
+                'done': False,
+            }
+
+        template = entries[min(entries)]
+        runner_type = node_to_type.get(template[FIELD_RUNNER], template[FIELD_RUNNER])
+        block_key = entry_history_key(template, runner_type, 0)[:-1]
+        base_tag = template.get(FIELD_ENGINE_ARGS_TAG)
+
+        def full_tag(tag):
+            return f'{base_tag}_{tag}' if base_tag else tag
+
+        def points(tag):
+            return {conc: (_median(float(r['tput_per_gpu']) for r in records),
+                           _median(r.get('median_intvty') for r in records),
+                           _median(r.get('median_ttft') for r in records))
+                    for conc, records in measured.get((block_key, full_tag(tag)), {}).items()}
+
+        while not study['done']:
+            concs = rung_concs(study['ladder'], study['rung'], study['num_rungs'], args.eta)
+            missing = {tag: [c for c in concs if c not in points(tag) and c in entries] for tag in study['alive']}
+            waiting = {tag: m for tag, m in missing.items() if m and study['proposed'].get(tag) != study['rung']}
+            if waiting:
+                for tag, tag_concs in waiting.items():
+                    for conc in tag_concs:
+                        entry = entries[conc]
+                        new_values.append({**entry,
+                                           FIELD_ENGINE_ARGS: {**(entry.get(FIELD_ENGINE_ARGS) or {}),
+                                                               **study['candidates'][tag]},
+                                           FIELD_ENGINE_ARGS_TAG: full_tag(tag)})
+                    study['proposed'][tag] = study['rung']
+                break
+
+            scores = {tag: autotune_score(points(tag), args.min_intvty, args.max_ttft) for tag in study['alive']}
+            study['history'].append({'rung': study['rung'], 'concs': concs, 'scores': scores})
+            survivors = successive_halving_survivors(scores, args.eta)
+            if study['rung'] == study['num_rungs']:
+                best = survivors[0]
+                study['best'] = None if scores[best] is None else {
+                    FIELD_ENGINE_ARGS_TAG: best,
+                    FIELD_ENGINE_ARGS: study['candidates'][best],
+                    'tput_per_gpu': scores[best],
+                }
+                study['done'] = True
+            else:
+                study['alive'] = survivors
+                # A single survivor only needs its full-ladder measurement
+                study['rung'] = study['num_rungs'] if len(survivors) == 1 else study['rung'] + 1
+
+        if study['done']:
+            best = study['best']
+            status = (f"converged, best={best[FIELD_ENGINE_ARGS_TAG]} {best[FIELD_ENGINE_ARGS]} "
+                      f"tput_per_gpu={best['tput_per_gpu']:.2f}" if best else "converged, no candidate meets the constraints")
+        else:
+            status = f"rung {study['rung']}/{study['num_rungs']}, alive={study['alive']}"
+        print(f"{key}: {status}", file=sys.stderr)
+
+    with open(args.state, 'w') as f:
+        json.dump(state, f, indent=2)
+
+    return new_values
+
+
+def engine_limits(engine_args, conc):
+    """(max running requests, prefill tokens per step) of a server from its engine args."""
+    engine_args = engine_args or {}
+    max_running = next((int(engine_args[a]) for a in MAX_RUNNING_ARGS if a in engine_args), conc)
+    chunk = next((int(engine_args[a]) for a in PREFILL_CHUNK_ARGS if a in engine_args),
+                 SIMULATE_DEFAULT_PREFILL_CHUNK)
+    return max_running, chunk
+
+
+def simulate_server(params, lengths, conc, max_running, prefill_chunk, request_rate=math.inf,
+                    burstiness=DEFAULT_BURSTINESS, seed=0):
+    """Discrete-event simulation of one continuous-batching engine serving a benchmark client.
+
+    The client keeps at most conc requests in flight and sends one request per
+    (prompt tokens, output tokens) of lengths, arriving at request_rate with gamma
+    distributed gaps of shape burstiness (1 is a Poisson process), or all at once
+    when the rate is infinite, i.e. closed-loop. The engine runs up to
+    max_running requests; the rest wait in FIFO order. Every step emits one token for
+    each decoding request and prefills up to prefill_chunk prompt tokens of the
+    admitted requests in FIFO order (chunked prefill); a request's first token comes at
+    the end of the step finishing its prompt. params = (base, per_seq, per_ctx_token,
+    per_prefill_token) give the step time base + per_seq * decoding requests
+    + per_ctx_token * their summed context + per_prefill_token * prefilled tokens.
+
+    Returns (duration, [(ttft, tpot, e2el) per request]).
+    """
+    base, per_seq, per_ctx, per_prefill = params
+    rng = random.Random(seed)
+    arrivals, t = [], 0.0
+    for _ in lengths:
+        if request_rate != math.inf:
+            t += rng.gammavariate(burstiness, 1 / (request_rate * burstiness))
+        arrivals.append(t)
+
+    free_slots = [0.0] * conc
+    waiting, prefilling, finishing = collections.deque(), [], []
+    # A decoding request's context is its prompt plus the steps since its first token, so
+    # the summed context at step s is ctx_offset + n_decoding * s
+    n_decoding, ctx_offset = 0, 0
+    requests, sent, now, step = [], 0, 0.0, 0
+    while len(requests) < len(lengths):
+        while sent < len(lengths) and free_slots and max(free_slots[0], arrivals[sent]) <= now:
+            prompt_len, output_len = lengths[sent]
+            waiting.append([max(heapq.heappop(free_slots), arrivals[sent]), prompt_len, output_len, prompt_len])
+            sent += 1
+        if not (waiting or prefilling or n_decoding):
+            now = max(free_slots[0], arrivals[sent])
+            continue
+        while waiting and len(prefilling) + n_decoding < max_running:
+            prefilling.append(waiting.popleft())
+
+        budget = prefill_chunk
+        for request in prefilling:
+            take = min(budget, request[3])
+            request[3] -= take
+            budget -= take
+            if budget == 0:
+                break
+        now += (base + per_seq * n_decoding + per_ctx * (ctx_offset + n_decoding * step)
+                + per_prefill * (prefill_chunk - budget))
+
+        while finishing and finishing[0][0] == step:
+            _, first_token, arrival, output_len, ctx = heapq.heappop(finishing)
+            requests.append((first_token - arrival, (now - first_token) / (output_len - 1), now - arrival))
+            heapq.heappush(free_slots, now)
+            n_decoding -= 1
+            ctx_offset -= ctx
+        for arrival, prompt_len, output_len, _ in (r for r in prefilling if r[3] == 0):
+            if output_len == 1:
+                requests.append((now - arrival, 0.0, now - arrival))
+                heapq.heappush(free_slots, now)
+            else:
+                heapq.heappush(finishing, (step + output_len - 1, now, arrival, output_len, prompt_len - step))
+                n_decoding += 1
+                ctx_offset += prompt_len - step
+        prefilling = [r for r in prefilling if r[3] > 0]
+        step += 1
+
+    return now, requests
+
+
+def _server_shape(conc, tp, dp_attn, engine_args):
+    """(engine ranks, client concurrency per rank, max running per rank, prefill chunk).
+
+    With DP attention each of the tp ranks batches its own even share of the requests.
+    """
+    ranks = tp if str(dp_attn).lower() == 'true' else 1
+    max_running, chunk = engine_limits(engine_args, conc)
+    return ranks, math.ceil(conc / ranks), math.ceil(max_running / ranks), chunk
+
+
+def step_time_features(isl, osl, conc, tp, dp_attn, engine_args):
+    """Steady-state features of the median TPOT and TTFT, linear in the step time params.
+
+    In steady state a rank runs a batch B of requests at an average context of
+    isl + osl / 2, and every decode step also prefills the prompts of the requests
+    replacing finished ones, B * isl / osl tokens on average. A new request's prompt
+    takes ceil(isl / chunk) such steps. Returns (tpot features, ttft features).
+    """
+    _, rank_conc, max_running, chunk = _server_shape(conc, tp, dp_attn, engine_args)
+    batch = min(rank_conc, max_running)
+    ctx = isl + osl / 2
+    chunks = math.ceil(isl / chunk)
+    return ([1.0, batch, batch * ctx, batch * isl / osl],
+            [chunks, chunks * batch, chunks * batch * ctx, isl])
+
+
+def fit_step_time(rows, sweeps=2000):
+    """Non-negative least squares fit of step time params to (features, measured) rows.
+
+    Rows are weighted by 1 / measured so every point counts by its relative error.
+    Solved by coordinate descent on the normal equations, projecting onto params >= 0.
+    """
+    n = len(rows[0][0])
+    gram = [[0.0] * n for _ in range(n)]
+    rhs = [0.0] * n
+    for features, measured in rows:
+        x = [f / measured for f in features]
+        for i in range(n):
+            rhs[i] += x[i]
+            for j in range(n):
+                gram[i][j] += x[i] * x[j]
+
+    params = [0.0] * n
+    for _ in range(sweeps):
+        for i in range(n):
+            if gram[i][i] > 0:
+                residual = rhs[i] - sum(gram[i][j] * params[j] for j in range(n))
+                params[i] = max(0.0, params[i] + residual / gram[i][i])
+    return tuple(params)
+
+
+def calibration_key(hw, model, framework, precision, tp, ep, dp_attn, engine_args_tag):
+    """Key of the server configurations sharing one set of step time params."""
+    return (hw, model, framework, precision, int(tp), int(ep), str(dp_attn).lower(), engine_args_tag or None)
+
+
+def record_calibration_key(r):
+    return calibration_key(r['hw'], r.get('model'), r.get('framework'), r.get('precision'),
+                           r['tp'], r['ep'], r['dp_attention'], r.get('engine_args_tag'))
+
+
+def entry_calibration_key(entry, runner_type):
+    return calibration_key(runner_type, entry[FIELD_MODEL], entry[FIELD_FRAMEWORK], entry[FIELD_PRECISION],
+                           entry[FIELD_TP], entry[FIELD_EP], entry[FIELD_DP_ATTN], entry.get(FIELD_ENGINE_ARGS_TAG))
+
+
+def calibrate_simulator(records):
+    """Fit step time params per calibration key to the median TPOT and TTFT of measured results."""
+    rows = {}
+    for r in records:
+        tpot_features, ttft_features = step_time_features(
+            int(r['isl']), int(r['osl']), int(r['conc']), int(r['tp']), r['dp_attention'], r.get('engine_args'))
+        key_rows = rows.setdefault(record_calibration_key(r), [])
+        if float(r['median_tpot']) > 0:
+            key_rows.append((tpot_features, float(r['median_tpot'])))
+        if float(r['median_ttft']) > 0:
+            key_rows.append((ttft_features, float(r['median_ttft'])))
+    return {key: fit_step_time(key_rows) for key, key_rows in rows.items() if key_rows}
+
+
+def simulate_point(params, isl, osl, conc, tp, dp_attn, engine_args, request_rate=math.inf,
+                   burstiness=DEFAULT_BURSTINESS, seed=0):
+    """Predicted tput_per_gpu, median_ttft, median_tpot and median_e2el of one benchmark point.
+
+    Simulates one engine rank with its share of the client concurrency over the
+    benchmark's conc * PLAN_PROMPTS_PER_CONC prompts, with lengths drawn like the
+    benchmark client's random dataset.
+    """
+    ranks, rank_conc, max_running, chunk = _server_shape(conc, tp, dp_attn, engine_args)
+    rng = random.Random(seed)
+    lengths = [(rng.randint(int(isl * SIMULATE_RANDOM_RANGE_RATIO), isl),
+                rng.randint(max(1, int(osl * SIMULATE_RANDOM_RANGE_RATIO)), osl))
+               for _ in range(rank_conc * PLAN_PROMPTS_PER_CONC)]
+    duration, requests = simulate_server(params, lengths, rank_conc, max_running, chunk,
+                                         request_rate / ranks, burstiness, seed)
+    ttfts, tpots, e2els = zip(*requests)
+    return {
+        'tput_per_gpu': sum(p + o for p, o in lengths) / duration * ranks / tp,
+        'median_ttft': _median(ttfts),
+        'median_tpot': _median(tpots),
+        'median_e2el': _median(e2els),
+    }
+
+
+def simulate_record(params, r):
+    return simulate_point(params, int(r['isl']), int(r['osl']), int(r['conc']), int(r['tp']),
+                          r['dp_attention'], r.get('engine_args'))
+
+
+def calibration_error_report(records, holdout_fraction=SIMULATE_DEFAULT_HOLDOUT, seed=0, file=None):
+    """Fit on part of the measured points and report the simulator's error on the rest.
+
+    Per calibration key, a holdout_fraction of the points (drawn with seed, leaving at
+    least one to fit on) is held out. Prints the mean absolute percentage error of each
+    metric per key and overall (to stderr by default) and returns the overall errors.
+    """
+    file = file or sys.stderr
+    by_key = {}
+    for r in records:
+        by_key.setdefault(record_calibration_key(r), []).append(r)
+
+    rng = random.Random(seed)
+    all_errors = {metric: [] for metric in SIMULATE_METRICS}
+    for key, key_records in sorted(by_key.items(), key=lambda kv: tuple(str(v) for v in kv[0])):
+        n_holdout = min(len(key_records) - 1, round(len(key_records) * holdout_fraction))
+        if n_holdout < 1:
+            continue
+        held_out = set(rng.sample(range(len(key_records)), n_holdout))
+        params = calibrate_simulator([r for i, r in enumerate(key_records) if i not in held_out]).get(key)
+        if params is None:
+            continue
+
+        errors = {metric: [] for metric in SIMULATE_METRICS}
+        for i in sorted(held_out):
+            predicted = simulate_record(params, key_records[i])
+            for metric in SIMULATE_METRICS:
+                measured = float(key_records[i][metric])
+                if measured > 0:
+                    errors[metric].append(abs(predicted[metric] - measured) / measured)
+        for metric in SIMULATE_METRICS:
+            all_errors[metric] += errors[metric]
+
+        hw, model, framework, precision, tp, ep, dp_attn, tag = key
+        print(f"{model} {hw} {framework} {precision} tp={tp} ep={ep} dpa={dp_attn}"
+              f"{f' {tag}' if tag else ''}: {n_holdout}/{len(key_records)} held out, "
+              + ', '.join(f"{metric} {_mean(errors[metric]) * 100:.1f}%" for metric in SIMULATE_METRICS),
+              file=file)
+
+    overall = {metric: _mean(all_errors[metric]) for metric in SIMULATE_METRICS}
+    print(f"Calibration error (MAPE over {len(all_errors['median_tpot'])} held-out points): "
+          + ', '.join(f"{metric} {overall[metric] * 100:.1f}%" for metric in SIMULATE_METRICS), file=file)
+    return overall
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def generate_simulation(args, all_config_data):
+    """Predict the results of a full sweep (same filters) without running it.
+
+    Step time params are fitted per calibration key to the aggregated results of
+    --results-dir, and every entry whose key has results gets a 'predicted' map of
+    tput_per_gpu, median_ttft, median_tpot and median_e2el from simulate_point.
+    The calibration error against --holdout-fraction of the measured points and the
+    entries without results to calibrate on are reported to stderr.
+    """
+    node_to_type = load_node_to_type(args.runner_config)
+    # The steady-state fit assumes the closed-loop client
+    records = [r for r in load_result_records(args.results_dir)
+               if r.get('request_rate') is None and all(r.get(metric) is not None for metric in SIMULATE_METRICS)]
+    if args.holdout_fraction > 0:
+        calibration_error_report(records, args.holdout_fraction, args.seed)
+    calibration = calibrate_simulator(records)
+
+    simulated_values, uncalibrated = [], set()
+    for entry in generate_full_sweep(args, all_config_data):
+        runner_type = node_to_type.get(entry[FIELD_RUNNER], entry[FIELD_RUNNER])
+        params = calibration.get(entry_calibration_key(entry, runner_type))
+        if params is None:
+            uncalibrated.add(f"{entry[FIELD_MODEL]} {runner_type} {entry[FIELD_FRAMEWORK]} {entry[FIELD_PRECISION]} "
+                             f"tp={entry[FIELD_TP]} ep={entry[FIELD_EP]} dpa={entry[FIELD_DP_ATTN]}")
+            predicted = None
+        else:
+            predicted = simulate_point(params, entry[FIELD_ISL], entry[FIELD_OSL], entry[FIELD_CONC],
+                                       entry[FIELD_TP], entry[FIELD_DP_ATTN], entry.get(FIELD_ENGINE_ARGS),
+                                       entry.get(FIELD_REQUEST_RATE) or math.inf,
+                                       entry.get(FIELD_BURSTINESS) or DEFAULT_BURSTINESS)
+        simulated_values.append({**entry, FIELD_PREDICTED: predicted})
+
+    for config in sorted(uncalibrated):
+        print(f"No results to calibrate {config}; not predicted", file=sys.stderr)
+    return simulated_values
+
+
 def load_config_files(config_files):
     """Load and merge configuration files."""
     all_config_data = {}
@@ -696,6 +1953,40 @@ def main():
         help='One or more configuration files (YAML format)'
     )
 
+    # Create parent parser with the config filters shared by full-sweep style commands
+    sweep_filter_parser = argparse.ArgumentParser(add_help=False)
+    sweep_filter_parser.add_argument(
+        '--model-prefix',
+        nargs='+',
+        required=False,
+        help='Model prefix(es) to filter configurations (optional, can specify multiple)'
+    )
+    sweep_filter_parser.add_argument(
+        '--precision',
+        nargs='+',
+        required=False,
+        help='Precision(s) to filter by (e.g., fp4, fp8) (optional, can specify multiple)'
+    )
+    sweep_filter_parser.add_argument(
+        '--framework',
+        nargs='+',
+        required=False,
+        help='Framework(s) to filter by (e.g., vllm, trt, sglang) (optional, can specify multiple)'
+    )
+    sweep_filter_parser.add_argument(
+        '--runner-type',
+        nargs='+',
+        required=False,
+        help='Runner type(s) to filter by (e.g., h200, h100) (optional, can specify multiple)'
+    )
+    sweep_filter_parser.add_argument(
+        '--seq-lens',
+        nargs='+',
+        choices=list(seq_len_stoi.keys()),
+        required=False,
+        help=f"Sequence length configurations to include: {', '.join(seq_len_stoi.keys())}. If not specified, all sequence lengths are included."
+    )
+
     # Create main parser
     parser = argparse.ArgumentParser(
         description='Generate benchmark configurations from YAML config files'
@@ -711,62 +2002,301 @@ def main():
     # Subcommand: full-sweep
     full_sweep_parser = subparsers.add_parser(
         'full-sweep',
-        parents=[parent_parser],
+        parents=[parent_parser, sweep_filter_parser],
         add_help=False,
         help='Generate full sweep configurations with optional filtering by model, precision, framework, runner type, and sequence lengths'
     )
     full_sweep_parser.add_argument(
-        '--model-prefix',
-        nargs='+',
+        '--runner-config',
         required=False,
-        help='Model prefix(es) to filter configurations (optional, can specify multiple)'
+        help='Configuration file holding runner information (required if --runner-type is specified)'
     )
     full_sweep_parser.add_argument(
-        '--precision',
-        nargs='+',
-        required=False,
-        help='Precision(s) to filter by (e.g., fp4, fp8) (optional, can specify multiple)'
+        '--step-size',
+        type=int,
+        default=2,
+        help='Step size for concurrency values (default: 2)'
     )
     full_sweep_parser.add_argument(
-        '--framework',
-        nargs='+',
-        required=False,
-        help='Framework(s) to filter by (e.g., vllm, trt, sglang) (optional, can specify multiple)'
+        '--test-mode',
+        action='store_true',
+        help='Test mode: only run highest TP with lowest concurrency for each matching config'
     )
     full_sweep_parser.add_argument(
-        '--runner-type',
-        nargs='+',
-        required=False,
-        help='Runner type(s) to filter by (e.g., h200, h100) (optional, can specify multiple)'
+        '--group-conc',
+        action='store_true',
+        help='Server-reuse mode: emit one entry per server launch carrying every concurrency in a conc-list'
+    )
+    full_sweep_parser.add_argument(
+        '--graph-sizes',
+        action='store_true',
+        help='Add the CUDA graph capture and compile sizes reachable at each entry\'s concurrency'
+    )
+    full_sweep_parser.add_argument(
+        '--kv-capacity',
+        action='store_true',
+        help='Add each entry\'s KV cache capacity (max resident isl+osl sequences) and report entries whose concurrency exceeds it'
+    )
+    full_sweep_parser.add_argument(
+        '--drop-infeasible',
+        action='store_true',
+        help='With --kv-capacity, drop entries whose concurrency exceeds their KV cache capacity'
     )
     full_sweep_parser.add_argument(
+        '-h', '--help',
+        action='help',
+        help='Show this help message and exit'
+    )
+
+    # Subcommand: plan
+    plan_parser = subparsers.add_parser(
+        'plan',
+        parents=[parent_parser, sweep_filter_parser],
+        add_help=False,
+        help='Generate a full sweep (same filters as full-sweep) and assign each entry to a runner node using longest-processing-time-first packing over runtimes estimated from past results'
+    )
+    plan_parser.add_argument(
+        '--runner-config',
+        required=True,
+        help='Configuration file holding runner information'
+    )
+    plan_parser.add_argument(
+        '--results-dir',
+        required=False,
+        help='Directory of past aggregated results (agg_*.json) used to estimate runtimes. Entries without history use an analytic estimate.'
+    )
+    plan_parser.add_argument(
+        '--startup-cost',
+        type=float,
+        default=PLAN_DEFAULT_STARTUP_S,
+        help=f'Estimated per-job startup cost in seconds (default: {PLAN_DEFAULT_STARTUP_S:.0f})'
+    )
+    plan_parser.add_argument(
+        '--step-size',
+        type=int,
+        default=2,
+        help='Step size for concurrency values (default: 2)'
+    )
+    plan_parser.add_argument(
+        '--group-conc',
+        action='store_true',
+        help='Server-reuse mode: emit one entry per server launch carrying every concurrency in a conc-list'
+    )
+    plan_parser.add_argument(
+        '--graph-sizes',
+        action='store_true',
+        help='Add the CUDA graph capture and compile sizes reachable at each entry\'s concurrency'
+    )
+    plan_parser.add_argument(
+        '--kv-capacity',
+        action='store_true',
+        help='Add each entry\'s KV cache capacity (max resident isl+osl sequences) and report entries whose concurrency exceeds it'
+    )
+    plan_parser.add_argument(
+        '--drop-infeasible',
+        action='store_true',
+        help='With --kv-capacity, drop entries whose concurrency exceeds their KV cache capacity'
+    )
+    plan_parser.add_argument(
+        '-h', '--help',
+        action='help',
+        help='Show this help message and exit'
+    )
+    plan_parser.set_defaults(test_mode=False)
+
+    # Subcommand: adaptive-sweep
+    adaptive_parser = subparsers.add_parser(
+        'adaptive-sweep',
+        parents=[parent_parser, sweep_filter_parser],
+        add_help=False,
+        help='Generate the next round of an adaptive concurrency search: the coarse ladder first, then follow-up concurrencies where the throughput vs interactivity frontier bends or has gaps, until throughput saturates'
+    )
+    adaptive_parser.add_argument(
+        '--results-dir',
+        required=False,
+        help='Directory of aggregated results (agg_*.json) from previous rounds'
+    )
+    adaptive_parser.add_argument(
         '--runner-config',
         required=False,
         help='Configuration file holding runner information (required if --runner-type is specified)'
     )
-    full_sweep_parser.add_argument(
-        '--seq-lens',
-        nargs='+',
-        choices=list(seq_len_stoi.keys()),
+    adaptive_parser.add_argument(
+        '--step-size',
+        type=int,
+        default=ADAPTIVE_DEFAULT_STEP_SIZE,
+        help=f'Step size for the coarse concurrency ladder (default: {ADAPTIVE_DEFAULT_STEP_SIZE})'
+    )
+    adaptive_parser.add_argument(
+        '--max-new-points',
+        type=int,
+        default=ADAPTIVE_DEFAULT_POINTS_PER_ROUND,
+        help=f'Maximum follow-up concurrencies per search-space block per round (default: {ADAPTIVE_DEFAULT_POINTS_PER_ROUND})'
+    )
+    adaptive_parser.add_argument(
+        '--saturation-threshold',
+        type=float,
+        default=ADAPTIVE_DEFAULT_SATURATION,
+        help=f'Relative throughput gain per doubling of concurrency below which the curve is considered saturated (default: {ADAPTIVE_DEFAULT_SATURATION})'
+    )
+    adaptive_parser.add_argument(
+        '--group-conc',
+        action='store_true',
+        help='Server-reuse mode: emit one entry per server launch carrying every concurrency in a conc-list'
+    )
+    adaptive_parser.add_argument(
+        '--graph-sizes',
+        action='store_true',
+        help='Add the CUDA graph capture and compile sizes reachable at each entry\'s concurrency'
+    )
+    adaptive_parser.add_argument(
+        '--kv-capacity',
+        action='store_true',
+        help='Add each entry\'s KV cache capacity (max resident isl+osl sequences) and report entries whose concurrency exceeds it'
+    )
+    adaptive_parser.add_argument(
+        '--drop-infeasible',
+        action='store_true',
+        help='With --kv-capacity, drop entries whose concurrency exceeds their KV cache capacity'
+    )
+    adaptive_parser.add_argument(
+        '-h', '--help',
+        action='help',
+        help='Show this help message and exit'
+    )
+    adaptive_parser.set_defaults(test_mode=False)
+
+    # Subcommand: autotune
+    autotune_parser = subparsers.add_parser(
+        'autotune',
+        parents=[parent_parser, sweep_filter_parser],
+        add_help=False,
+        help='Generate the next round of an engine-knob autotune: successive halving over the knob settings of --space, keeping the settings with the best tput_per_gpu under the interactivity/TTFT constraints'
+    )
+    autotune_parser.add_argument(
+        '--space',
+        required=True,
+        help='YAML file mapping engine args to lists of candidate values (e.g. mem-fraction-static: [0.8, 0.85, 0.9])'
+    )
+    autotune_parser.add_argument(
+        '--state',
+        required=True,
+        help='JSON file holding the autotune state between rounds (created on the first round)'
+    )
+    autotune_parser.add_argument(
+        '--results-dir',
         required=False,
-        help=f"Sequence length configurations to include: {', '.join(seq_len_stoi.keys())}. If not specified, all sequence lengths are included."
+        help='Directory of aggregated results (agg_*.json) from previous rounds'
     )
-    full_sweep_parser.add_argument(
+    autotune_parser.add_argument(
+        '--runner-config',
+        required=False,
+        help='Configuration file holding runner information (required if --runner-type is specified)'
+    )
+    autotune_parser.add_argument(
         '--step-size',
         type=int,
         default=2,
-        help='Step size for concurrency values (default: 2)'
+        help='Step size for the concurrency ladder (default: 2)'
     )
-    full_sweep_parser.add_argument(
-        '--test-mode',
+    autotune_parser.add_argument(
+        '--num-candidates',
+        type=int,
+        default=AUTOTUNE_DEFAULT_CANDIDATES,
+        help=f'Knob settings to start from; larger grids are sampled (default: {AUTOTUNE_DEFAULT_CANDIDATES})'
+    )
+    autotune_parser.add_argument(
+        '--eta',
+        type=int,
+        default=AUTOTUNE_DEFAULT_ETA,
+        help=f'Keep the best 1/eta of the candidates at each rung (default: {AUTOTUNE_DEFAULT_ETA})'
+    )
+    autotune_parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='Seed for sampling candidates from a large grid (default: 0)'
+    )
+    autotune_parser.add_argument(
+        '--min-intvty',
+        type=float,
+        required=False,
+        help='Only count concurrencies with at least this median interactivity (tok/s/user)'
+    )
+    autotune_parser.add_argument(
+        '--max-ttft',
+        type=float,
+        required=False,
+        help='Only count concurrencies with at most this median TTFT (s)'
+    )
+    autotune_parser.add_argument(
+        '--group-conc',
         action='store_true',
-        help='Test mode: only run highest TP with lowest concurrency for each matching config'
+        help='Server-reuse mode: emit one entry per server launch carrying every concurrency in a conc-list'
     )
-    full_sweep_parser.add_argument(
+    autotune_parser.add_argument(
+        '--graph-sizes',
+        action='store_true',
+        help='Add the CUDA graph capture and compile sizes reachable at each entry\'s concurrency'
+    )
+    autotune_parser.add_argument(
+        '--kv-capacity',
+        action='store_true',
+        help='Add each entry\'s KV cache capacity (max resident isl+osl sequences) and report entries whose concurrency exceeds it'
+    )
+    autotune_parser.add_argument(
+        '--drop-infeasible',
+        action='store_true',
+        help='With --kv-capacity, drop entries whose concurrency exceeds their KV cache capacity'
+    )
+    autotune_parser.add_argument(
+        '-h', '--help',
+        action='help',
+        help='Show this help message and exit'
+    )
+    autotune_parser.set_defaults(test_mode=False)
+
+    # Subcommand: simulate
+    simulate_parser = subparsers.add_parser(
+        'simulate',
+        parents=[parent_parser, sweep_filter_parser],
+        add_help=False,
+        help='Predict tput_per_gpu, median_ttft, median_tpot and median_e2el of every full-sweep entry with a continuous-batching simulator calibrated on previous results, without running anything'
+    )
+    simulate_parser.add_argument(
+        '--results-dir',
+        required=True,
+        help='Directory of aggregated results (agg_*.json) to calibrate the simulator on'
+    )
+    simulate_parser.add_argument(
+        '--runner-config',
+        required=False,
+        help='Configuration file holding runner information (required if --runner-type is specified)'
+    )
+    simulate_parser.add_argument(
+        '--step-size',
+        type=int,
+        default=2,
+        help='Step size for concurrency values (default: 2)'
+    )
+    simulate_parser.add_argument(
+        '--holdout-fraction',
+        type=float,
+        default=SIMULATE_DEFAULT_HOLDOUT,
+        help=f'Fraction of the measured points held out to report the calibration error on; 0 skips the report (default: {SIMULATE_DEFAULT_HOLDOUT})'
+    )
+    simulate_parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='Seed for choosing the held-out points (default: 0)'
+    )
+    simulate_parser.add_argument(
         '-h', '--help',
         action='help',
         help='Show this help message and exit'
     )
+    simulate_parser.set_defaults(test_mode=False)
 
     # Subcommand: test-config
     test_config_parser = subparsers.add_parser(
@@ -808,6 +2338,26 @@ def main():
         action='store_true',
         help='Generate only the lowest concurrency value for each TP level'
     )
+    test_config_parser.add_argument(
+        '--group-conc',
+        action='store_true',
+        help='Server-reuse mode: emit one entry per server launch carrying every concurrency in a conc-list'
+    )
+    test_config_parser.add_argument(
+        '--graph-sizes',
+        action='store_true',
+        help='Add the CUDA graph capture and compile sizes reachable at each entry\'s concurrency'
+    )
+    test_config_parser.add_argument(
+        '--kv-capacity',
+        action='store_true',
+        help='Add each entry\'s KV cache capacity (max resident isl+osl sequences) and report entries whose concurrency exceeds it'
+    )
+    test_config_parser.add_argument(
+        '--drop-infeasible',
+        action='store_true',
+        help='With --kv-capacity, drop entries whose concurrency exceeds their KV cache capacity'
+    )
     test_config_parser.add_argument(
         '-h', '--help',
         action='help',
@@ -932,6 +2482,14 @@ def main():
     # Route to appropriate function based on subcommand
     if args.command == 'full-sweep':
         matrix_values = generate_full_sweep(args, all_config_data)
+    elif args.command == 'adaptive-sweep':
+        matrix_values = generate_adaptive_sweep(args, all_config_data)
+    elif args.command == 'autotune':
+        matrix_values = generate_autotune(args, all_config_data)
+    elif args.command == 'simulate':
+        matrix_values = generate_simulation(args, all_config_data)
+    elif args.command == 'plan':
+        matrix_values = generate_sweep_plan(args, all_config_data)
     elif args.command == 'test-config':
         matrix_values = generate_test_config(args, all_config_data)
     elif args.command == 'runner-model-sweep':
@@ -945,6 +2503,13 @@ def main():
     else:
         parser.error(f"Unknown command: {args.command}")
 
+    if getattr(args, 'kv_capacity', False):
+        matrix_values = add_kv_capacity(matrix_values, drop=args.drop_infeasible)
+    if getattr(args, 'group_conc', False):
+        matrix_values = group_entries_by_server(matrix_values)
+    if getattr(args, 'graph_sizes', False):
+        matrix_values = add_graph_sizes(matrix_values)
+
     # Validate output before printing
     validate_matrix_output(matrix_values)
 
@@ -1,4 +1,8 @@
+import re
+import json
+import math
 import pytest
+from pathlib import Path
 import yaml
 from unittest.mock import patch
 from generate_sweep_configs import (
@@ -10,9 +14,41 @@ from generate_sweep_configs import (
     generate_runner_model_sweep_config,
     generate_runner_sweep_config,
     generate_custom_test,
+    group_entries_by_server,
+    add_graph_sizes,
+    add_kv_capacity,
+    kv_capacity,
+    hbm_gb,
+    reachable_sizes,
+    validate_engine_knobs,
+    rule_matches,
+    expand_engine_args,
+    load_result_history,
+    estimate_e2el_analytic,
+    estimate_entry_runtime,
+    plan_node_assignment,
+    frontier_refinement_scores,
+    propose_refinement_concs,
+    generate_adaptive_sweep,
+    autotune_candidates,
+    autotune_num_rungs,
+    rung_concs,
+    autotune_score,
+    successive_halving_survivors,
+    generate_autotune,
+    simulate_server,
+    simulate_point,
+    fit_step_time,
+    calibrate_simulator,
+    calibration_error_report,
+    validate_arrivals,
+    expand_arrivals,
     load_config_files,
     main,
     MatrixEntry,
+    PLAN_PROMPTS_PER_CONC,
+    MEM_FRACTION_ARGS,
+    SCRIPT_ENGINE_DEFAULTS,
 )
 
 
@@ -1569,5 +1605,960 @@ def test_max_model_len_calculation(sample_master_config, temp_config_files):
     assert all(e['max-model-len'] == 9416 for e in result)
 
 
+# Tests for group_entries_by_server
+def test_group_entries_by_server(sample_master_config, temp_config_files):
+    """Test that entries differing only in concurrency share one server launch."""
+    _, runner_file = temp_config_files
+
+    class Args:
+        model_prefix = ["70b"]
+        seq_lens = ["1k1k"]
+        step_size = 2
+        precision = None
+        framework = None
+        runner_type = None
+        test_mode = False
+        runner_config = runner_file
+
+    result = generate_full_sweep(Args(), sample_master_config)
+    grouped = group_entries_by_server(result)
+    # tp=4 (conc 1..4) and tp=8 (conc 2..8) each collapse into one entry
+    assert len(grouped) == 2
+    tp4 = next(e for e in grouped if e['tp'] == 4)
+    tp8 = next(e for e in grouped if e['tp'] == 8)
+    assert tp4['conc-list'] == [1, 2, 4]
+    assert tp4['conc'] == 4
+    assert tp8['conc-list'] == [2, 4, 8]
+    assert tp8['ep'] == 2 and tp8['dp-attn'] == True
+    validate_matrix_output(grouped)
+
+
+def test_group_entries_by_server_keeps_distinct_layouts():
+    """Test that entries with different parallel layouts are not merged."""
+    base = {
+        "image": "test:latest",
+        "model": "test/model",
+        "precision": "fp8",
+        "framework": "vllm",
+        "runner": "h200",
+        "isl": 1024,
+        "osl": 1024,
+        "tp": 8,
+        "ep": 1,
+        "dp-attn": False,
+        "max-model-len": 2248,
+        "exp-name": "test_1k1k"
+    }
+    entries = [
+        {**base, "conc": 8},
+        {**base, "conc": 4},
+        {**base, "ep": 8, "conc": 4},
+        {**base, "dp-attn": True, "conc": 4},
+    ]
+    grouped = group_entries_by_server(entries)
+    assert len(grouped) == 3
+    assert grouped[0]['conc-list'] == [4, 8]
+    assert grouped[1]['conc-list'] == [4]
+    assert grouped[2]['conc-list'] == [4]
+
+
+def test_main_full_sweep_group_conc(temp_config_files):
+    """Test main function with full-sweep --group-conc."""
+    master_file, _ = temp_config_files
+
+    test_args = [
+        "generate_sweep_configs.py",
+        "full-sweep",
+        "--config-files", master_file,
+        "--seq-lens", "1k1k",
+        "--model-prefix", "8b",
+        "--group-conc"
+    ]
+
+    with patch('sys.argv', test_args):
+        result = main()
+        assert len(result) == 1
+        assert result[0]['conc-list'] == [4, 8, 16]
+        assert result[0]['conc'] == 16
+
+
+def test_group_entries_by_server_is_idempotent():
+    """Test that regrouping already grouped entries keeps their conc-list."""
+    entry = {
+        "image": "test:latest",
+        "model": "test/model",
+        "precision": "fp8",
+        "framework": "vllm",
+        "runner": "h200",
+        "isl": 1024,
+        "osl": 1024,
+        "tp": 8,
+        "ep": 1,
+        "dp-attn": False,
+        "max-model-len": 2248,
+        "exp-name": "test_1k1k"
+    }
+    grouped = group_entries_by_server([{**entry, "conc": 4}, {**entry, "conc": 8}])
+    assert group_entries_by_server(grouped) == grouped
+
+
+def test_reachable_sizes_pads_to_next_ladder_size():
+    """Test that sizes stop at the first ladder size covering the max batch."""
+    ladder = [1, 2, 4, 8, 16]
+    assert reachable_sizes(ladder, 4) == [1, 2, 4]
+    assert reachable_sizes(ladder, 5) == [1, 2, 4, 8]
+    assert reachable_sizes(ladder, 100) == ladder
+
+
+def test_add_graph_sizes_uses_highest_conc():
+    """Test that a grouped entry is sized for the largest concurrency it runs."""
+    entry = {"tp": 8, "dp-attn": False, "conc": 64, "conc-list": [4, 16, 64]}
+    sized = add_graph_sizes([entry])[0]
+    assert sized['cuda-graph-max-bs'] == 64
+    assert sized['cuda-graph-sizes'][-1] == 64
+    assert sized['compile-sizes'][-1] == 64
+    assert sized['conc-list'] == [4, 16, 64]
+
+    sized = add_graph_sizes([{"tp": 8, "dp-attn": False, "conc": 200}])[0]
+    # 200 pads to the next CUDA graph size, and compile sizes jump from 128 to 256
+    assert sized['cuda-graph-max-bs'] == 200
+    assert sized['compile-sizes'][-2:] == [128, 256]
+
+
+def test_add_graph_sizes_dp_attn_splits_batch():
+    """Test that DP attention with least-loaded dispatch sizes graphs for one rank's share."""
+    sized = add_graph_sizes([{"framework": "trt", "tp": 8, "dp-attn": True, "conc": 256}])[0]
+    assert sized['cuda-graph-max-bs'] == 32
+    # Fewer requests than ranks: one each
+    sized = add_graph_sizes([{"framework": "trt", "tp": 8, "dp-attn": True, "conc": 4}])[0]
+    assert sized['cuda-graph-max-bs'] == 1
+
+
+def test_add_graph_sizes_dp_attn_round_robin_covers_conc():
+    """Test that DP attention with round robin dispatch sizes graphs for the whole concurrency."""
+    sized = add_graph_sizes([{"framework": "sglang", "tp": 8, "dp-attn": True, "conc": 256}])[0]
+    assert sized['cuda-graph-max-bs'] == 256
+
+
+def test_main_full_sweep_graph_sizes(temp_config_files):
+    """Test main function with full-sweep --group-conc --graph-sizes."""
+    master_file, _ = temp_config_files
+
+    test_args = [
+        "generate_sweep_configs.py",
+        "full-sweep",
+        "--config-files", master_file,
+        "--seq-lens", "1k1k",
+        "--model-prefix", "8b",
+        "--group-conc",
+        "--graph-sizes"
+    ]
+
+    with patch('sys.argv', test_args):
+        result = main()
+        assert len(result) == 1
+        assert result[0]['cuda-graph-max-bs'] == 16
+        assert result[0]['cuda-graph-sizes'] == [1, 2, 4, 6, 8, 10, 12, 14, 16]
+        # Sized entries still group back onto the same server
+        assert group_entries_by_server(result)[0]['conc-list'] == [4, 8, 16]
+
+
+# Tests for the KV cache capacity model
+def _kv_entry(**overrides):
+    return {"image": "test:latest", "model": "deepseek-ai/DeepSeek-R1-0528", "precision": "fp8",
+            "framework": "sglang", "runner": "h200", "isl": 8192, "osl": 1024, "tp": 8, "ep": 1,
+            "dp-attn": False, "conc": 32, "max-model-len": 9416, "exp-name": "dsr1_8k1k", **overrides}
+
+
+def test_hbm_gb_runner_labels():
+    """Test that runner types and node labels map to their GPU."""
+    assert hbm_gb("h200") == 141
+    assert hbm_gb("b200-trt") == 180
+    assert hbm_gb("h200-cw_0") == 141
+    assert hbm_gb("gb200") == 186
+    assert hbm_gb("tpu") is None
+
+
+def test_kv_capacity_mla():
+    """Test the capacity of an MLA model, whose latent is replicated over TP ranks."""
+    # 141 * 0.82 (the script's fallback) - (653.8 + 17.2) / 8 GB for KV, 61 * 576 * 2 bytes
+    # per token, 9216 tokens
+    assert kv_capacity(_kv_entry()) == 49
+    # An fp8 KV cache holds twice as many sequences
+    assert kv_capacity(_kv_entry(**{"engine-args": {"kv-cache-dtype": "fp8_e4m3"}})) == 98
+    # Shorter sequences fit in proportion
+    assert kv_capacity(_kv_entry(isl=1024, osl=1024)) == 220
+    # The configured memory fraction is used instead of the script's
+    assert kv_capacity(_kv_entry(**{"engine-args": {"mem-fraction-static": 0.85}})) > 49
+
+
+def test_kv_capacity_dp_attention():
+    """Test that DP attention replicates dense weights but multiplies resident sequences by the ranks."""
+    trt = {"runner": "b200-trt", "framework": "trt", "precision": "fp4", "tp": 4, "ep": 4,
+           "engine-args": {"free-gpu-memory-fraction": 0.8, "kv-cache-dtype": "fp8"}}
+    tp4 = kv_capacity(_kv_entry(**trt))
+    dpa = kv_capacity(_kv_entry(**trt, **{"dp-attn": True}))
+    assert tp4 == 206
+    assert dpa == 700
+    assert dpa < 4 * tp4
+
+
+def test_kv_capacity_weights_do_not_fit():
+    """Test that a server whose weights exceed its memory budget has no capacity."""
+    assert kv_capacity(_kv_entry(runner="h100")) == 0
+
+
+def test_kv_capacity_gqa_sliding_window():
+    """Test the capacity of a GQA model with sliding window layers."""
+    entry = _kv_entry(model="openai/gpt-oss-120b", precision="fp4", framework="vllm", tp=1,
+                      isl=1024, osl=1024, conc=64)
+    # 141 * 0.9 - 68.7 GB; 2 * 8 * 64 * 2 bytes per token and layer, 18 full and 18 windowed layers
+    assert kv_capacity(entry) == 725
+    # TP splits the KV heads and frees weight memory, so capacity grows faster than the GPU count
+    assert kv_capacity({**entry, "tp": 8}) == 11799
+    assert kv_capacity({**entry, "model": "unknown/model"}) is None
+
+
+def test_add_kv_capacity_flags_and_drops(capsys):
+    """Test that entries over capacity are reported, and dropped on request."""
+    entries = [_kv_entry(conc=32), _kv_entry(conc=64), _kv_entry(model="unknown/model")]
+    checked = add_kv_capacity(entries)
+    assert [e.get("kv-capacity") for e in checked] == [49, 49, None]
+    err = capsys.readouterr().err
+    assert "1 entries exceed their KV cache capacity" in err
+    assert "conc=64 > capacity=49" in err
+    assert "No KV cache capacity model for unknown/model on h200 (fp8)" in err
+    validate_matrix_output(checked)
+
+    dropped = add_kv_capacity(entries, drop=True)
+    assert [e["conc"] for e in dropped] == [32, 32]
+    assert "were dropped" in capsys.readouterr().err
+
+
+def test_master_configs_declare_memory_settings():
+    """Test that every master config sets the memory fraction the capacity model reads."""
+    configs_dir = Path(__file__).resolve().parents[2] / ".github" / "configs"
+    for name in ("nvidia-master.yaml", "amd-master.yaml"):
+        with open(configs_dir / name) as f:
+            configs = yaml.safe_load(f)
+        validate_master_configs_structure(configs)
+        for key, val in configs.items():
+            assert MEM_FRACTION_ARGS[val["framework"]] in val.get("engine-args", {}), key
+
+
+def test_script_engine_defaults_match_scripts():
+    """Test that the capacity model's per-script fallbacks are the ones the benchmark scripts use."""
+    benchmarks_dir = Path(__file__).resolve().parents[2] / "benchmarks"
+    memory_args = set(MEM_FRACTION_ARGS.values()) | {"kv-cache-dtype"}
+    for script in sorted(benchmarks_dir.glob("*.sh")):
+        model_code, precision, gpu = script.stem.split("_")[:3]
+        text = script.read_text()
+        framework = "trt" if "_trt_" in script.name else "vllm" if "vllm serve" in text else "sglang"
+        fallbacks = {name: value for name, value in re.findall(r"engine_args\.py get ([\w-]+) ([\w.]+)", text)
+                     if name in memory_args}
+        expected = SCRIPT_ENGINE_DEFAULTS[(model_code, precision, gpu, framework)]
+        assert fallbacks == {name: str(value) for name, value in expected.items()}, script.name
+
+
+def test_kv_capacity_uses_script_defaults():
+    """Test that entries without engine-args get their script's memory fraction and KV dtype."""
+    entry = {"model": "nvidia/DeepSeek-R1-0528-FP4-V2", "runner": "b200", "framework": "sglang",
+             "precision": "fp4", "exp-name": "dsr1_1k8k", "isl": 1024, "osl": 8192, "tp": 4, "dp-attn": False}
+    configured = {**entry, "engine-args": {"mem-fraction-static": 0.85, "kv-cache-dtype": "fp8_e4m3"}}
+    assert kv_capacity(entry) == kv_capacity(configured)
+    # A custom entry with no known script gets the framework default and a 16-bit KV cache
+    assert kv_capacity({**entry, "exp-name": "custom"}) < kv_capacity(entry)
+
+
+def test_main_full_sweep_kv_capacity(temp_config_files):
+    """Test main function with full-sweep --kv-capacity --drop-infeasible."""
+    master_file, _ = temp_config_files
+
+    test_args = [
+        "generate_sweep_configs.py",
+        "full-sweep",
+        "--config-files", master_file,
+        "--seq-lens", "1k1k",
+        "--model-prefix", "gptoss",
+        "--kv-capacity",
+        "--drop-infeasible",
+        "--group-conc"
+    ]
+
+    with patch('sys.argv', test_args):
+        result = main()
+        assert result
+        assert all(e["kv-capacity"] > max(e["conc-list"]) for e in result)
+
+
+# Tests for engine-arg knobs
+def test_rule_matches_values_and_comparisons():
+    """Test exact and comparison conditions of engine-arg rules."""
+    entry = {"isl": 1024, "osl": 1024, "conc": 256, "tp": 8}
+    assert rule_matches({"isl": 1024, "conc": ">= 256"}, entry)
+    assert not rule_matches({"isl": 1024, "conc": "> 256"}, entry)
+    assert not rule_matches({"isl": 8192}, entry)
+    assert rule_matches({}, entry)
+
+
+def test_validate_engine_knobs_errors():
+    """Test validation of engine-args and engine-arg-rules."""
+    validate_engine_knobs({"engine-args": {"enable-ep": True, "max-num-seqs": [128, 256]},
+                           "engine-arg-rules": [{"when": {"conc": "< 64"}, "set": {"stream-interval": 1}}]}, "here")
+
+    with pytest.raises(ValueError, match="must be a scalar or a non-empty list"):
+        validate_engine_knobs({"engine-args": {"max-num-seqs": []}}, "here")
+    with pytest.raises(ValueError, match="must have exactly 'when' and 'set'"):
+        validate_engine_knobs({"engine-arg-rules": [{"when": {"isl": 1024}, "set": {"a": 1}, "extra": 1}]}, "here")
+    with pytest.raises(ValueError, match="Unknown condition field 'runner'"):
+        validate_engine_knobs({"engine-arg-rules": [{"when": {"runner": "h200"}, "set": {"a": 1}}]}, "here")
+    with pytest.raises(ValueError, match="Invalid condition 'conc: lots'"):
+        validate_engine_knobs({"engine-arg-rules": [{"when": {"conc": "lots"}, "set": {"a": 1}}]}, "here")
+
+
+def test_validate_master_configs_engine_knobs(sample_master_config):
+    """Test that engine knobs are validated in configs and search-space entries."""
+    sample_master_config["70b-fp8-vllm"]["engine-args"] = {"max-num-seqs": [128, 256]}
+    sample_master_config["70b-fp8-vllm"]["seq-len-configs"][0]["search-space"][0]["engine-arg-rules"] = [
+        {"when": {"conc": ">= 2"}, "set": {"max-num-seqs": 512}}]
+    validate_master_configs_structure(sample_master_config)
+
+    sample_master_config["70b-fp8-vllm"]["engine-args"] = "max-num-seqs=128"
+    with pytest.raises(ValueError, match="'engine-args' must be dict"):
+        validate_master_configs_structure(sample_master_config)
+
+
+def test_expand_engine_args_resolution_order():
+    """Test that rules override fixed args and inner scopes override outer ones."""
+    entry = {"isl": 1024, "osl": 1024, "conc": 256, "tp": 8}
+    config = {"engine-args": {"moe-backend": "TRTLLM", "stream-interval": 10},
+              "engine-arg-rules": [{"when": {"conc": ">= 256"}, "set": {"moe-backend": "CUTLASS"}}]}
+    bmk = {"engine-args": {"stream-interval": 20}}
+    expanded = expand_engine_args(entry, [config, bmk])
+    assert expanded == [{**entry, "engine-args": {"moe-backend": "CUTLASS", "stream-interval": 20}}]
+
+    assert expand_engine_args(entry, [{}, {}]) == [entry]
+
+
+def test_expand_engine_args_sweep_and_tag():
+    """Test that list values sweep as a cartesian product tagged by the swept values."""
+    entry = {"isl": 1024, "osl": 1024, "conc": 4, "tp": 8}
+    config = {"engine-args": {"max-num-seqs": [128, 256], "block-size": [16, 32], "enable-ep": True, "kv-dtype": ["fp8"]}}
+    expanded = expand_engine_args(entry, [config])
+    assert len(expanded) == 4
+    assert expanded[0]["engine-args"] == {"enable-ep": True, "max-num-seqs": 128, "block-size": 16, "kv-dtype": "fp8"}
+    # Single-value lists do not appear in the tag
+    assert [e["engine-args-tag"] for e in expanded] == [
+        "max-num-seqs-128_block-size-16", "max-num-seqs-128_block-size-32",
+        "max-num-seqs-256_block-size-16", "max-num-seqs-256_block-size-32"]
+
+    not_swept = expand_engine_args(entry, [config], sweep=False)
+    assert len(not_swept) == 1 and "engine-args-tag" not in not_swept[0]
+
+
+def test_generate_full_sweep_engine_args(sample_master_config, temp_config_files):
+    """Test that engine-arg axes multiply the sweep and stay on separate servers."""
+    _, runner_file = temp_config_files
+    sample_master_config["8b-fp4-trt"]["engine-args"] = {"max-num-tokens": [8192, 16384]}
+
+    class Args:
+        model_prefix = ["8b"]
+        seq_lens = ["1k1k"]
+        step_size = 2
+        precision = None
+        framework = None
+        runner_type = None
+        test_mode = False
+        runner_config = runner_file
+
+    result = generate_full_sweep(Args(), sample_master_config)
+    # conc 4, 8, 16 for each of the two values
+    assert len(result) == 6
+    validate_matrix_output(result)
+    grouped = group_entries_by_server(result)
+    assert len(grouped) == 2
+    assert sorted(e["engine-args-tag"] for e in grouped) == ["max-num-tokens-16384", "max-num-tokens-8192"]
+    assert all(e["conc-list"] == [4, 8, 16] for e in grouped)
+
+
+# Tests for the runtime-aware planner
+@pytest.fixture
+def plan_entry():
+    """A matrix entry used by planner tests."""
+    return {
+        "image": "test:latest",
+        "model": "test/model",
+        "precision": "fp8",
+        "framework": "vllm",
+        "runner": "h200",
+        "isl": 1024,
+        "osl": 1024,
+        "tp": 8,
+        "ep": 1,
+        "dp-attn": False,
+        "conc": 4,
+        "max-model-len": 2248,
+        "exp-name": "test_1k1k"
+    }
+
+
+def _agg_record(conc, median_e2el):
+    return {
+        "hw": "h200", "model": "test/model", "framework": "vllm", "precision": "fp8",
+        "isl": 1024, "osl": 1024, "tp": 8, "ep": 1, "dp_attention": "false",
+        "conc": conc, "tput_per_gpu": 1000.0, "median_e2el": median_e2el,
+    }
+
+
+def test_load_result_history(tmp_path):
+    """Test loading per-job and collected aggregated results."""
+    with open(tmp_path / "agg_single.json", 'w') as f:
+        json.dump(_agg_record(4, 30.0), f)
+    with open(tmp_path / "agg_dsr1_1k1k.json", 'w') as f:
+        json.dump([_agg_record(4, 50.0), {**_agg_record(8, 1.0), "isl": None}], f)
+    # Records without seq-len info are skipped
+    legacy = _agg_record(4, 99.0)
+    del legacy["isl"]
+    with open(tmp_path / "agg_legacy.json", 'w') as f:
+        json.dump(legacy, f)
+    # Truncated files and JSON that is not an aggregated record are skipped
+    (tmp_path / "agg_truncated.json").write_text('{"hw": "h200", "tput_per')
+    with open(tmp_path / "startup_dsr1.json", 'w') as f:
+        json.dump({"hw": "h200", "time_to_ready_s": 120.0}, f)
+    with open(tmp_path / "config.json", 'w') as f:
+        json.dump(["not", "a", "record"], f)
+
+    history = load_result_history(tmp_path)
+    key = ("h200", "test/model", "vllm", "fp8", 1024, 1024, 8, 1, "false", None, 4)
+    assert sorted(history[key]) == [30.0, 50.0]
+
+
+def test_estimate_entry_runtime_from_history(plan_entry):
+    """Test runtime estimate from the median of past median_e2el values."""
+    key = ("h200", "test/model", "vllm", "fp8", 1024, 1024, 8, 1, "false", None, 4)
+    history = {key: [10.0, 20.0, 90.0]}
+    seconds, from_history = estimate_entry_runtime(plan_entry, history, "h200", 100.0)
+    # 10 rounds of the median e2el (20s) plus startup
+    assert seconds == pytest.approx(100.0 + 10 * 20.0)
+    assert from_history == 1
+
+
+def test_estimate_entry_runtime_analytic_fallback(plan_entry):
+    """Test that entries without history fall back to the analytic estimate."""
+    seconds, from_history = estimate_entry_runtime(plan_entry, {}, "h200", 0.0)
+    assert from_history == 0
+    assert seconds == pytest.approx(10 * estimate_e2el_analytic(1024, 1024, 8, 4))
+    # Longer outputs and higher concurrency take longer per request
+    assert estimate_e2el_analytic(1024, 8192, 8, 4) > estimate_e2el_analytic(1024, 1024, 8, 4)
+    assert estimate_e2el_analytic(1024, 1024, 8, 256) > estimate_e2el_analytic(1024, 1024, 8, 4)
+
+
+def test_estimate_entry_runtime_conc_list_pays_startup_once(plan_entry):
+    """Test that server-reuse entries pay startup cost once."""
+    grouped = {**plan_entry, "conc": 8, "conc-list": [4, 8]}
+    single_4, _ = estimate_entry_runtime(plan_entry, {}, "h200", 500.0)
+    single_8, _ = estimate_entry_runtime({**plan_entry, "conc": 8}, {}, "h200", 500.0)
+    seconds, _ = estimate_entry_runtime(grouped, {}, "h200", 500.0)
+    assert seconds == pytest.approx(single_4 + single_8 - 500.0)
+
+
+def test_plan_node_assignment_lpt(plan_entry):
+    """Test longest-processing-time-first packing over runner nodes."""
+    runner_config = {"h200": ["h200-nv_0", "h200-nv_1"]}
+    history = {}
+    for conc, e2el in [(1, 100.0), (2, 60.0), (4, 50.0), (8, 40.0)]:
+        history[("h200", "test/model", "vllm", "fp8", 1024, 1024, 8, 1, "false", None, conc)] = [e2el]
+    entries = [{**plan_entry, "conc": c} for c in (8, 4, 2, 1)]
+
+    planned, node_loads, estimates = plan_node_assignment(entries, runner_config, history, startup_cost=0.0)
+
+    # Dispatch order is longest first
+    assert [e['conc'] for e in planned] == [1, 2, 4, 8]
+    # 1000 -> nv_0, 600 -> nv_1, 500 -> nv_1, 400 -> nv_0
+    assert node_loads == {"h200-nv_0": pytest.approx(1400.0), "h200-nv_1": pytest.approx(1100.0)}
+    assert [e['runner'] for e in planned] == ["h200-nv_0", "h200-nv_1", "h200-nv_1", "h200-nv_0"]
+    assert all(h == 1 for _, _, h in estimates)
+
+
+def test_plan_node_assignment_pinned_node(plan_entry):
+    """Test that entries already targeting a runner node stay on it."""
+    runner_config = {"h200": ["h200-nv_0", "h200-nv_1"]}
+    planned, node_loads, _ = plan_node_assignment(
+        [{**plan_entry, "runner": "h200-nv_1"}], runner_config, {}, startup_cost=0.0)
+    assert planned[0]['runner'] == "h200-nv_1"
+    assert list(node_loads) == ["h200-nv_1"]
+
+
+def test_plan_node_assignment_unknown_runner(plan_entry):
+    """Test planning with a runner missing from runner config."""
+    with pytest.raises(ValueError, match="is not a runner type or runner node"):
+        plan_node_assignment([{**plan_entry, "runner": "tpu"}], {"h200": ["h200-nv_0"]}, {})
+
+
+def test_main_plan(temp_config_files, capsys):
+    """Test main function with plan command."""
+    master_file, runner_file = temp_config_files
+
+    test_args = [
+        "generate_sweep_configs.py",
+        "plan",
+        "--config-files", master_file,
+        "--runner-config", runner_file,
+        "--model-prefix", "70b",
+        "--seq-lens", "1k1k",
+        "--group-conc"
+    ]
+
+    with patch('sys.argv', test_args):
+        result = main()
+    assert len(result) == 2
+    assert {e['runner'] for e in result} == {"h200-nv_1", "h200-nv_2"}
+    captured = capsys.readouterr()
+    assert "Predicted makespan" in captured.err
+    assert json.loads(captured.out) == result
+
+
+# Tests for the adaptive concurrency search
+def test_frontier_refinement_scores_skips_saturated():
+    """Test that intervals where throughput has saturated are not scored."""
+    points = [(4, 100.0, 90.0), (16, 300.0, 60.0), (64, 600.0, 30.0), (256, 610.0, 10.0)]
+    scores, saturated = frontier_refinement_scores(points, saturation=0.05)
+    assert saturated
+    assert [(lo, hi) for _, lo, hi in scores] == [(4, 16), (16, 64)]
+
+
+def test_frontier_refinement_scores_refined_curve_not_saturated():
+    """Test that closely spaced points of a still rising curve keep their upper intervals scored."""
+    # 8% more throughput per doubling, measured at quarter-doubling steps (under 2% apart)
+    concs = [16, 19, 23, 27, 32, 64, 128, 256]
+    points = [(c, 100.0 * 1.08 ** math.log2(c), 1000.0 / c) for c in concs]
+    scores, saturated = frontier_refinement_scores(points, saturation=0.05)
+    assert not saturated
+    assert [(lo, hi) for _, lo, hi in scores] == list(zip(concs, concs[1:]))
+
+
+def test_frontier_refinement_scores_skips_only_flat_interval():
+    """Test that a noisy dip leaves the intervals above it scored."""
+    points = [(4, 100.0, 90.0), (8, 180.0, 80.0), (16, 175.0, 70.0), (32, 320.0, 50.0), (64, 500.0, 30.0)]
+    scores, saturated = frontier_refinement_scores(points, saturation=0.05)
+    assert saturated
+    assert [(lo, hi) for _, lo, hi in scores] == [(4, 8), (16, 32), (32, 64)]
+
+
+def test_frontier_refinement_scores_prefers_knee():
+    """Test that the bend of the frontier outscores a straight segment of equal length."""
+    points = [(1, 10.0, 100.0), (4, 40.0, 70.0), (16, 70.0, 40.0), (64, 100.0, 39.0)]
+    scores, saturated = frontier_refinement_scores(points, saturation=0.0)
+    assert not saturated
+    best = max(scores)
+    assert (best[1], best[2]) in [(4, 16), (16, 64)]
+    straight = next(sc for sc, lo, _ in scores if lo == 1)
+    assert best[0] > straight
+
+
+def test_propose_refinement_concs():
+    """Test that follow-up points land inside the best intervals at the geometric mean."""
+    points = [(4, 100.0, 90.0), (16, 300.0, 60.0), (64, 600.0, 30.0), (256, 610.0, 10.0)]
+    assert propose_refinement_concs(points, max_new_points=1) in ([8], [32])
+    assert propose_refinement_concs(points, max_new_points=5) == [8, 32]
+    # Adjacent concurrencies leave nothing to refine
+    assert propose_refinement_concs([(1, 1.0, 10.0), (2, 2.0, 9.0)]) == []
+
+
+def _adaptive_args(results_dir):
+    class Args:
+        model_prefix = ["8b"]
+        seq_lens = ["1k1k"]
+        step_size = 4
+        precision = None
+        framework = None
+        runner_type = None
+        test_mode = False
+        runner_config = None
+        max_new_points = 2
+        saturation_threshold = 0.05
+    args = Args()
+    args.results_dir = results_dir
+    return args
+
+
+def _write_adaptive_results(results_dir, points):
+    for conc, tput, intvty in points:
+        record = {
+            "hw": "h100", "model": "meta-llama/Llama-3-8b", "framework": "trt", "precision": "fp4",
+            "isl": 1024, "osl": 1024, "tp": 2, "ep": 1, "dp_attention": "false",
+            "conc": conc, "tput_per_gpu": tput, "median_intvty": intvty,
+        }
+        with open(results_dir / f"agg_8b_conc{conc}.json", 'w') as f:
+            json.dump(record, f)
+
+
+def test_generate_adaptive_sweep_coarse_first(sample_master_config, tmp_path):
+    """Test that the coarse ladder is generated before any refinement."""
+    result = generate_adaptive_sweep(_adaptive_args(str(tmp_path)), sample_master_config)
+    # conc-start=4, conc-end=16, step 4
+    assert [e['conc'] for e in result] == [4, 16]
+
+
+def test_generate_adaptive_sweep_refines_measured_ladder(sample_master_config, tmp_path):
+    """Test follow-up points once the coarse ladder has been measured."""
+    _write_adaptive_results(tmp_path, [(4, 100.0, 90.0), (16, 300.0, 50.0)])
+    result = generate_adaptive_sweep(_adaptive_args(str(tmp_path)), sample_master_config)
+    assert [e['conc'] for e in result] == [8]
+    validate_matrix_output(result)
+
+    # Measured refinement points are used in the next round
+    _write_adaptive_results(tmp_path, [(8, 290.0, 70.0)])
+    assert [e['conc'] for e in generate_adaptive_sweep(_adaptive_args(str(tmp_path)), sample_master_config)] == [6]
+
+
+def test_generate_adaptive_sweep_stops_when_saturated(sample_master_config, tmp_path):
+    """Test that no follow-up points are generated once throughput saturates."""
+    _write_adaptive_results(tmp_path, [(4, 300.0, 90.0), (16, 305.0, 50.0)])
+    assert generate_adaptive_sweep(_adaptive_args(str(tmp_path)), sample_master_config) == []
+
+
+
+# Tests for the engine-knob autotuner
+AUTOTUNE_SPACE = {"mem-fraction-static": [0.8, 0.85, 0.9], "chunked-prefill-size": [4096, 8192, 16384],
+                  "disable-radix-cache": True}
+
+
+def synthetic_point(engine_args, conc):
+    """Synthetic (tput_per_gpu, median_intvty, median_ttft) of a knob setting at a concurrency.
+
+    Throughput peaks at mem-fraction-static 0.85 and grows with the chunk size, which
+    costs interactivity, so the interactivity constraint decides the best chunk size.
+    """
+    mem, chunk = engine_args["mem-fraction-static"], engine_args["chunked-prefill-size"]
+    tput = conc * 10.0 * (1 - 20 * (mem - 0.85) ** 2) * (1 + chunk / 16384)
+    intvty = 400.0 / conc * (4096 / chunk) ** 0.5
+    return tput, intvty, 0.1 * conc
+
+
+def _write_autotune_results(results_dir, matrix_values, skip_tags=()):
+    for entry in matrix_values:
+        if entry["engine-args-tag"] in skip_tags:
+            continue
+        for conc in entry.get("conc-list") or [entry["conc"]]:
+            tput, intvty, ttft = synthetic_point(entry["engine-args"], conc)
+            record = {
+                "hw": "h100", "model": entry["model"], "framework": entry["framework"],
+                "precision": entry["precision"], "isl": entry["isl"], "osl": entry["osl"],
+                "tp": entry["tp"], "ep": entry["ep"], "dp_attention": str(entry["dp-attn"]).lower(),
+                "conc": conc, "tput_per_gpu": tput, "median_intvty": intvty, "median_ttft": ttft,
+                "engine_args": entry["engine-args"], "engine_args_tag": entry["engine-args-tag"],
+            }
+            with open(results_dir / f"agg_{entry['engine-args-tag']}_conc{conc}.json", 'w') as f:
+                json.dump(record, f)
+
+
+def test_autotune_candidates_grid_and_sample():
+    """Test that candidates are the grid of list values, sampled when larger than the budget."""
+    candidates = autotune_candidates(AUTOTUNE_SPACE, 9)
+    assert len(candidates) == 9
+    assert candidates["mem-fraction-static-0.8_chunked-prefill-size-4096"] == {
+        "mem-fraction-static": 0.8, "chunked-prefill-size": 4096, "disable-radix-cache": True}
+
+    sampled = autotune_candidates(AUTOTUNE_SPACE, 4, seed=1)
+    assert len(sampled) == 4
+    assert sampled == autotune_candidates(AUTOTUNE_SPACE, 4, seed=1)
+    assert set(sampled) <= set(candidates)
+
+    assert list(autotune_candidates({"block-size": 16}, 9)) == ["default"]
+
+
+def test_autotune_rungs_and_concs():
+    """Test the number of halving steps and the concurrencies measured per rung."""
+    assert autotune_num_rungs(9, 3) == 2
+    assert autotune_num_rungs(5, 3) == 1
+    assert autotune_num_rungs(1, 3) == 0
+
+    ladder = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+    assert rung_concs(ladder, 0, 2, 3) == [16]
+    assert rung_concs(ladder, 1, 2, 3) == [1, 16, 256]
+    assert rung_concs(ladder, 2, 2, 3) == ladder
+    # Short ladders still add a concurrency per rung
+    assert [rung_concs([4, 8, 16], rung, 2, 3) for rung in range(3)] == [[8], [4, 16], [4, 8, 16]]
+
+
+def test_autotune_score_constraints():
+    """Test that only concurrencies meeting the constraints count."""
+    points = {4: (100.0, 50.0, 0.2), 16: (300.0, 20.0, 0.8), 64: (500.0, 5.0, 3.0)}
+    assert autotune_score(points) == 500.0
+    assert autotune_score(points, min_intvty=10.0) == 300.0
+    assert autotune_score(points, max_ttft=0.5) == 100.0
+    assert autotune_score(points, min_intvty=100.0) is None
+
+
+def test_successive_halving_survivors():
+    """Test that the best 1/eta survive and unscored candidates rank last."""
+    scores = {"a": 10.0, "b": None, "c": 30.0, "d": 20.0, "e": 5.0, "f": None}
+    assert successive_halving_survivors(scores, 3) == ["c", "d"]
+    assert successive_halving_survivors({"a": None, "b": None}, 3) == ["a"]
+
+
+def _run_autotune_round(master_file, space_file, state_file, results_dir, *extra):
+    test_args = [
+        "generate_sweep_configs.py", "autotune",
+        "--config-files", master_file,
+        "--model-prefix", "8b",
+        "--seq-lens", "1k1k",
+        "--space", space_file,
+        "--state", state_file,
+        "--results-dir", str(results_dir),
+        "--group-conc",
+        *extra,
+    ]
+    with patch('sys.argv', test_args):
+        return main()
+
+
+def test_autotune_converges_on_synthetic_objective(temp_config_files, tmp_path):
+    """Test rounds of autotune against a synthetic objective until it converges on the best setting."""
+    master_file, _ = temp_config_files
+    space_file, state_file = tmp_path / "space.yaml", tmp_path / "autotune_state.json"
+    results_dir = tmp_path / "results"
+    results_dir.mkdir()
+    with open(space_file, 'w') as f:
+        yaml.dump(AUTOTUNE_SPACE, f, sort_keys=False)
+
+    jobs = 0
+    for _ in range(10):
+        matrix_values = _run_autotune_round(master_file, str(space_file), str(state_file), results_dir,
+                                            "--min-intvty", "30")
+        if not matrix_values:
+            break
+        jobs += len(matrix_values)
+        _write_autotune_results(results_dir, matrix_values)
+    assert matrix_values == []
+
+    # Brute force over every candidate at every concurrency of the ladder (4, 8, 16)
+    candidates = autotune_candidates(AUTOTUNE_SPACE, 9)
+    true_scores = {tag: autotune_score({conc: synthetic_point(args, conc) for conc in (4, 8, 16)}, min_intvty=30)
+                   for tag, args in candidates.items()}
+    true_best = max(true_scores, key=true_scores.get)
+
+    with open(state_file) as f:
+        study, = json.load(f)["studies"].values()
+    assert study["done"]
+    assert study["best"]["engine-args-tag"] == true_best
+    assert study["best"]["engine-args"]["disable-radix-cache"] is True
+    assert study["best"]["tput_per_gpu"] == pytest.approx(true_scores[true_best])
+    # 9 launches at one concurrency, then 3 at the other two; the survivor then has the
+    # full ladder and needs no third round. A grid sweep measures all 27 points.
+    assert jobs == 12
+
+
+def test_autotune_failed_candidate_does_not_block(temp_config_files, tmp_path):
+    """Test that a candidate whose results never arrive is ranked last instead of stalling the rung."""
+    master_file, _ = temp_config_files
+    space_file, state_file = tmp_path / "space.yaml", tmp_path / "autotune_state.json"
+    with open(space_file, 'w') as f:
+        yaml.dump({"mem-fraction-static": [0.8, 0.85, 0.9], "chunked-prefill-size": 8192}, f)
+
+    first = _run_autotune_round(master_file, str(space_file), str(state_file), tmp_path)
+    assert len(first) == 3
+    _write_autotune_results(tmp_path, first, skip_tags={"mem-fraction-static-0.85"})
+
+    # The best setting failed, so the survivor is the next best and gets the full ladder
+    second = _run_autotune_round(master_file, str(space_file), str(state_file), tmp_path)
+    assert [e["engine-args-tag"] for e in second] == ["mem-fraction-static-0.8"]
+    assert second[0]["conc-list"] == [4, 16]
+
+
+def test_autotune_state_space_mismatch(sample_master_config, tmp_path):
+    """Test that a state file cannot be resumed with a different space."""
+    space_file, state_file = tmp_path / "space.yaml", tmp_path / "autotune_state.json"
+    with open(space_file, 'w') as f:
+        yaml.dump({"block-size": [16, 32]}, f)
+    with open(state_file, 'w') as f:
+        json.dump({"space": {"block-size": [16, 64]}, "studies": {}}, f)
+
+    class Args:
+        space = str(space_file)
+        state = str(state_file)
+        results_dir = None
+        runner_config = None
+
+    with pytest.raises(ValueError, match="different search space"):
+        generate_autotune(Args(), sample_master_config)
+
+
+# Serving simulator tests
+SIM_PARAMS = (0.01, 1e-4, 2e-8, 5e-6)
+
+
+def _sim_records(params, seq_lens, concs, tp=4):
+    records = []
+    for isl, osl in seq_lens:
+        for conc in concs:
+            records.append({
+                "hw": "h200", "model": "meta-llama/Llama-3-70b", "framework": "vllm", "precision": "fp8",
+                "isl": isl, "osl": osl, "tp": tp, "ep": 1, "dp_attention": "false", "conc": conc,
+                **simulate_point(params, isl, osl, conc, tp, False, None),
+            })
+    return records
+
+
+def test_simulate_server_single_request():
+    """Test the step timeline of one request: chunked prefill, then one token per step."""
+    duration, requests = simulate_server((0.01, 0.0, 0.0, 0.0), [(10, 5)], 1, 1, 4)
+    # Three prefill steps, the last emitting the first token, then four decode steps
+    assert duration == pytest.approx(0.07)
+    assert requests[0] == pytest.approx((0.03, 0.01, 0.07))
+
+
+def test_simulate_server_max_running_queues():
+    """Test that requests beyond max_running wait for a running one to finish."""
+    _, requests = simulate_server((0.01, 0.0, 0.0, 0.0), [(4, 3), (4, 3)], 2, 1, 4)
+    assert requests[0] == pytest.approx((0.01, 0.01, 0.03))
+    assert requests[1] == pytest.approx((0.04, 0.01, 0.06))
+
+    # Without the cap the second prompt is prefilled in the second step
+    _, requests = simulate_server((0.01, 0.0, 0.0, 0.0), [(4, 3), (4, 3)], 2, 2, 4)
+    assert requests[1] == pytest.approx((0.02, 0.01, 0.04))
+
+
+def test_simulate_server_step_time_terms():
+    """Test that the step time grows with the decoding batch, its context and prefilled tokens."""
+    _, requests = simulate_server((0.0, 1.0, 0.1, 0.01), [(10, 3)], 1, 1, 16)
+    # Prefill step: 10 tokens; decode steps: batch 1 at contexts 11 and 12
+    assert requests[0] == pytest.approx((0.1, (2.1 + 2.2) / 2, 0.1 + 2.1 + 2.2))
+
+
+def test_simulate_server_poisson_arrivals():
+    """Test that open-loop arrivals spread the requests out in time."""
+    lengths = [(100, 10)] * 20
+    closed, _ = simulate_server(SIM_PARAMS, lengths, 20, 20, 16384)
+    open_loop, _ = simulate_server(SIM_PARAMS, lengths, 20, 20, 16384, request_rate=1.0)
+    assert open_loop > 5 * closed
+
+
+def test_fit_step_time_recovers_linear_params():
+    """Test the non-negative least squares fit on exactly linear rows."""
+    true = (0.5, 0.0, 2.0)
+    rows = [(x, sum(p * f for p, f in zip(true, x))) for x in ([1, 1, 0], [1, 2, 1], [1, 0, 3], [2, 1, 1])]
+    assert fit_step_time(rows) == pytest.approx(true, abs=1e-6)
+
+
+def test_calibrate_simulator_reproduces_measured_points(capsys):
+    """Test that params fitted to simulated results predict held-out points of the same server."""
+    records = _sim_records(SIM_PARAMS, [(1024, 1024), (1024, 8192), (8192, 1024)], [4, 8, 16, 32, 64])
+    calibration = calibrate_simulator(records)
+    assert list(calibration) == [("h200", "meta-llama/Llama-3-70b", "vllm", "fp8", 4, 1, "false", None)]
+
+    errors = calibration_error_report(records, 0.3)
+    assert "4/15 held out" in capsys.readouterr().err
+    assert set(errors) == {"tput_per_gpu", "median_ttft", "median_tpot", "median_e2el"}
+    assert all(error < 0.1 for error in errors.values())
+
+
+def test_main_simulate(temp_config_files, tmp_path, capsys):
+    """Test that simulate predicts calibrated entries and reports the rest."""
+    master_file, _ = temp_config_files
+    records = _sim_records(SIM_PARAMS, [(1024, 1024), (1024, 8192), (8192, 1024)], [1, 4, 16, 64])
+    with open(tmp_path / "agg_70b.json", 'w') as f:
+        json.dump(records, f)
+
+    test_args = [
+        "generate_sweep_configs.py", "simulate",
+        "--config-files", master_file,
+        "--model-prefix", "70b",
+        "--seq-lens", "1k1k",
+        "--results-dir", str(tmp_path),
+    ]
+    with patch('sys.argv', test_args):
+        result = main()
+
+    predicted = {(e["tp"], e["conc"]): e["predicted"] for e in result}
+    assert set(predicted) == {(4, 1), (4, 2), (4, 4), (8, 2), (8, 4), (8, 8)}
+    for conc in (1, 4):
+        measured = next(r for r in records if r["isl"] == r["osl"] == 1024 and r["conc"] == conc)
+        for metric in ("tput_per_gpu", "median_ttft", "median_tpot", "median_e2el"):
+            assert predicted[(4, conc)][metric] == pytest.approx(measured[metric], rel=0.1)
+    assert predicted[(8, 2)] is None
+
+    err = capsys.readouterr().err
+    assert "Calibration error" in err
+    assert "No results to calibrate meta-llama/Llama-3-70b h200 vllm fp8 tp=8 ep=2 dpa=True" in err
+
+
+# Tests for open-loop arrivals
+def test_validate_arrivals():
+    """Test that request-rate, arrival and burstiness are validated together."""
+    validate_arrivals({"request-rate": [1, 2.5], "arrival": "gamma", "burstiness": 0.5}, "in test")
+    validate_arrivals({"request-rate": 4}, "in test")
+
+    with pytest.raises(ValueError, match="'request-rate' must be a positive number"):
+        validate_arrivals({"request-rate": []}, "in test")
+    with pytest.raises(ValueError, match="'request-rate' must be a positive number"):
+        validate_arrivals({"request-rate": [1, 0]}, "in test")
+    with pytest.raises(ValueError, match="'arrival' requires 'request-rate'"):
+        validate_arrivals({"arrival": "poisson"}, "in test")
+    with pytest.raises(ValueError, match="'arrival' must be one of poisson, gamma"):
+        validate_arrivals({"request-rate": 1, "arrival": "uniform"}, "in test")
+    with pytest.raises(ValueError, match="'burstiness' requires 'arrival: gamma'"):
+        validate_arrivals({"request-rate": 1, "burstiness": 0.5}, "in test")
+    with pytest.raises(ValueError, match="'burstiness' must be a positive number"):
+        validate_arrivals({"request-rate": 1, "arrival": "gamma", "burstiness": -1}, "in test")
+    with pytest.raises(ValueError, match="'arrival: gamma' requires 'burstiness'"):
+        validate_arrivals({"request-rate": 1, "arrival": "gamma"}, "in test")
+
+
+def test_expand_arrivals():
+    """Test that an entry is expanded per request rate with its arrival process."""
+    entry = {"conc": 8}
+    assert expand_arrivals(entry, {"tp": 8}) == [entry]
+    assert expand_arrivals(entry, {"request-rate": [1, 2]}) == [
+        {"conc": 8, "request-rate": 1.0, "arrival": "poisson"},
+        {"conc": 8, "request-rate": 2.0, "arrival": "poisson"}]
+    assert expand_arrivals(entry, {"request-rate": [1, 2], "arrival": "gamma", "burstiness": 0.5}, sweep=False) == [
+        {"conc": 8, "request-rate": 1.0, "arrival": "gamma", "burstiness": 0.5}]
+
+
+def test_generate_full_sweep_request_rates(sample_master_config, temp_config_files):
+    """Test that request rates multiply the sweep and stay on separate servers."""
+    _, runner_file = temp_config_files
+    sample_master_config["8b-fp4-trt"]["seq-len-configs"][0]["search-space"][0].update(
+        {"request-rate": [2, 4], "arrival": "gamma", "burstiness": 0.5})
+    validate_master_configs_structure(sample_master_config)
+
+    class Args:
+        model_prefix = ["8b"]
+        seq_lens = ["1k1k"]
+        step_size = 2
+        precision = None
+        framework = None
+        runner_type = None
+        test_mode = False
+        runner_config = runner_file
+
+    result = generate_full_sweep(Args(), sample_master_config)
+    # conc 4, 8, 16 for each of the two rates
+    assert len(result) == 6
+    validate_matrix_output(result)
+    assert all(e["arrival"] == "gamma" and e["burstiness"] == 0.5 for e in result)
+    grouped = group_entries_by_server(result)
+    assert sorted(e["request-rate"] for e in grouped) == [2.0, 4.0]
+
+
+def test_estimate_entry_runtime_open_loop(plan_entry):
+    """Test that an open-loop entry takes at least as long as sending its prompts."""
+    closed, _ = estimate_entry_runtime(plan_entry, {}, "h200", 0)
+    slow = {**plan_entry, "request-rate": 0.01, "arrival": "poisson"}
+    seconds, _ = estimate_entry_runtime(slow, {}, "h200", 0)
+    assert seconds > closed
+    assert seconds == pytest.approx(plan_entry["conc"] * PLAN_PROMPTS_PER_CONC / 0.01)
+
+
+def test_simulate_point_open_loop():
+    """Test that open-loop load below capacity queues less than saturating load."""
+    light = simulate_point(SIM_PARAMS, 1024, 1024, 64, 4, False, {}, request_rate=0.5)
+    heavy = simulate_point(SIM_PARAMS, 1024, 1024, 64, 4, False, {}, request_rate=1000.0, burstiness=0.25)
+    assert light["median_ttft"] < heavy["median_ttft"]
+    assert light["tput_per_gpu"] < heavy["tput_per_gpu"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--cov=generate_sweep_configs", "--cov-report=term-missing"])
@@ -0,0 +1,308 @@
+import sys
+import json
+import time
+import signal
+import socket
+import asyncio
+import argparse
+import statistics
+import collections
+import multiprocessing
+
+
+READY_LINE = 'INFO:     Application startup complete.'
+
+
+class LatencyModel:
+    """Base class of the token timing models; records server-side ground truth per request."""
+
+    def __init__(self):
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.ttfts, self.tpots, self.batch_sizes = [], [], []
+
+    def record(self, arrival, token_times):
+        self.ttfts.append(token_times[0] - arrival)
+        if len(token_times) > 1:
+            self.tpots.append((token_times[-1] - token_times[0]) / (len(token_times) - 1))
+
+    def stats(self):
+        """Ground-truth latencies (ms) as emitted by this server process, before any client overhead."""
+        result = {'num_requests': len(self.ttfts)}
+        for name, values in (('ttft', self.ttfts), ('tpot', self.tpots)):
+            if values:
+                result[f'mean_{name}_ms'] = statistics.fmean(values) * 1000
+                result[f'median_{name}_ms'] = statistics.median(values) * 1000
+        if self.batch_sizes:
+            result['mean_batch_size'] = statistics.fmean(self.batch_sizes)
+        return result
+
+
+class FixedLatencyModel(LatencyModel):
+    """Every request sees the same TTFT and inter-token latency, independent of load."""
+
+    def __init__(self, ttft_s, itl_s):
+        super().__init__()
+        self.ttft_s = ttft_s
+        self.itl_s = itl_s
+
+    async def generate(self, prompt_len, max_tokens):
+        """Yield once per output token at its emission time."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        token_times = []
+        for k in range(max_tokens):
+            # Sleep to absolute deadlines so scheduling jitter does not accumulate
+            await asyncio.sleep(max(0.0, start + self.ttft_s + k * self.itl_s - loop.time()))
+            token_times.append(loop.time())
+            yield
+        if token_times:
+            self.record(start, token_times)
+
+
+class _Sequence:
+    def __init__(self, prompt_len, max_tokens, arrival):
+        self.prompt_len = prompt_len
+        self.max_tokens = max_tokens
+        self.arrival = arrival
+        self.token_times = []
+        self.tokens = asyncio.Queue()
+
+
+class BatchLatencyModel(LatencyModel):
+    """Continuous-batching engine: every step emits one token for each running sequence.
+
+    A step takes decode_base + decode_per_seq * running batch size, plus
+    prefill_per_token * the prompt tokens of the sequences admitted in that step
+    (their first token comes at the end of it). At most max_running sequences run
+    at once; the rest wait in FIFO order, like --max-num-seqs / --max-running-requests.
+    """
+
+    def __init__(self, prefill_per_token_s, decode_base_s, decode_per_seq_s, max_running):
+        super().__init__()
+        self.prefill_per_token_s = prefill_per_token_s
+        self.decode_base_s = decode_base_s
+        self.decode_per_seq_s = decode_per_seq_s
+        self.max_running = max_running
+        self.waiting = collections.deque()
+        self.running = []
+        self.wakeup = None
+        self.engine = None
+
+    def step_time(self, batch_size, prefill_tokens):
+        return self.decode_base_s + self.decode_per_seq_s * batch_size + self.prefill_per_token_s * prefill_tokens
+
+    async def run_engine(self):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            if not self.running and not self.waiting:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                deadline = loop.time()
+
+            admitted = []
+            while self.waiting and len(self.running) + len(admitted) < self.max_running:
+                admitted.append(self.waiting.popleft())
+            batch = self.running + admitted
+            self.batch_sizes.append(len(batch))
+
+            # Absolute deadlines so the engine clock does not drift with event loop jitter
+            deadline += self.step_time(len(batch), sum(seq.prompt_len for seq in admitted))
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+            now = loop.time()
+
+            self.running = []
+            for seq in batch:
+                seq.token_times.append(now)
+                seq.tokens.put_nowait(now)
+                if len(seq.token_times) < seq.max_tokens:
+                    self.running.append(seq)
+                else:
+                    self.record(seq.arrival, seq.token_times)
+
+    async def generate(self, prompt_len, max_tokens):
+        """Yield once per output token as the engine emits it."""
+        if self.engine is None:
+            self.wakeup = asyncio.Event()
+            self.engine = asyncio.create_task(self.run_engine())
+        seq = _Sequence(prompt_len, max_tokens, asyncio.get_running_loop().time())
+        self.waiting.append(seq)
+        self.wakeup.set()
+        for _ in range(max_tokens):
+            await seq.tokens.get()
+            yield
+
+
+async def _read_request(reader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, path, _ = request_line.decode('latin-1').split(' ', 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return method, path, headers, body
+
+
+def _response(status, body, content_type='application/json'):
+    reason = {200: 'OK', 404: 'Not Found', 400: 'Bad Request'}.get(status, 'Error')
+    return (f'HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n'
+            f'Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n').encode() + body
+
+
+def _chunk(data):
+    payload = f'data: {data}\n\n'.encode()
+    return f'{len(payload):x}\r\n'.encode() + payload + b'\r\n'
+
+
+class MockServer:
+    """Minimal OpenAI-compatible server (HTTP/1.1 keep-alive, chunked SSE) driven by a latency model."""
+
+    def __init__(self, model_name, latency_model, stream_interval=1):
+        self.model_name = model_name
+        self.latency_model = latency_model
+        self.stream_interval = stream_interval
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, _, body = request
+                if method == 'GET' and path == '/health':
+                    writer.write(_response(200, b''))
+                elif method == 'GET' and path == '/v1/models':
+                    models = {'object': 'list', 'data': [{'id': self.model_name, 'object': 'model'}]}
+                    writer.write(_response(200, json.dumps(models).encode()))
+                elif method == 'GET' and path == '/mock/stats':
+                    writer.write(_response(200, json.dumps(self.latency_model.stats()).encode()))
+                elif method == 'POST' and path == '/mock/reset':
+                    self.latency_model.reset_stats()
+                    writer.write(_response(200, b'{}'))
+                elif method == 'POST' and path in ('/v1/completions', '/v1/chat/completions'):
+                    await self.stream_completion(writer, json.loads(body), chat=path.endswith('chat/completions'))
+                else:
+                    writer.write(_response(404, b'{"error": "not found"}'))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def stream_completion(self, writer, payload, chat):
+        prompt = payload.get('messages', [{}])[-1].get('content', '') if chat else payload.get('prompt', '')
+        prompt_len = len(prompt) if isinstance(prompt, list) else len(str(prompt).split())
+        max_tokens = int(payload.get('max_completion_tokens') or payload.get('max_tokens') or 16)
+
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n'
+                     b'Transfer-Encoding: chunked\r\nConnection: keep-alive\r\n\r\n')
+        created = int(time.time())
+        pending = 0
+        n_sent = 0
+        async for _ in self.latency_model.generate(prompt_len, max_tokens):
+            pending += 1
+            n_sent += 1
+            # Like --stream-interval in the real servers: one chunk per stream_interval tokens
+            if pending == self.stream_interval or n_sent == max_tokens:
+                text = 'x ' * pending
+                choice = {'index': 0, 'delta': {'content': text}} if chat else {'index': 0, 'text': text}
+                writer.write(_chunk(json.dumps({'id': 'mock', 'created': created, 'model': self.model_name, 'choices': [choice]})))
+                await writer.drain()
+                pending = 0
+
+        if (payload.get('stream_options') or {}).get('include_usage'):
+            usage = {'prompt_tokens': prompt_len, 'completion_tokens': n_sent, 'total_tokens': prompt_len + n_sent}
+            writer.write(_chunk(json.dumps({'id': 'mock', 'choices': [], 'usage': usage})))
+        writer.write(_chunk('[DONE]'))
+        writer.write(b'0\r\n\r\n')
+
+
+def _listen_socket(host, port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, 'SO_REUSEPORT'):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(4096)
+    sock.setblocking(False)
+    return sock
+
+
+def build_latency_model(args):
+    if args.latency_model == 'fixed':
+        return FixedLatencyModel(args.ttft_ms / 1000, args.itl_ms / 1000)
+    return BatchLatencyModel(args.prefill_ms_per_token / 1000, args.decode_ms_base / 1000,
+                             args.decode_ms_per_seq / 1000, args.max_running)
+
+
+async def _serve(args, sock, ready):
+    server = MockServer(args.model, build_latency_model(args), args.stream_interval)
+    srv = await asyncio.start_server(server.handle_connection, sock=sock, limit=1 << 20)
+    ready.set()
+    async with srv:
+        await srv.serve_forever()
+
+
+def _worker(args, sock, ready):
+    try:
+        asyncio.run(_serve(args, sock, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OpenAI-compatible stand-in server that streams tokens from a latency model')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8888)
+    parser.add_argument('--model', default='mock-model', help='Model name reported by /v1/models')
+    parser.add_argument('--latency-model', default='batch', choices=['batch', 'fixed'],
+                        help="'batch' simulates a continuous-batching engine, 'fixed' ignores load (default: batch)")
+    parser.add_argument('--prefill-ms-per-token', type=float, default=0.05,
+                        help='batch: prefill time per prompt token (default: 0.05)')
+    parser.add_argument('--decode-ms-base', type=float, default=15.0,
+                        help='batch: decode step time at batch size 0 (default: 15)')
+    parser.add_argument('--decode-ms-per-seq', type=float, default=0.1,
+                        help='batch: added decode step time per running sequence (default: 0.1)')
+    parser.add_argument('--max-running', type=int, default=256,
+                        help='batch: max concurrently running sequences, like --max-num-seqs (default: 256)')
+    parser.add_argument('--ttft-ms', type=float, default=50.0, help='fixed: time to first token (default: 50)')
+    parser.add_argument('--itl-ms', type=float, default=20.0, help='fixed: time between output tokens (default: 20)')
+    parser.add_argument('--stream-interval', type=int, default=1, help='Tokens per streamed chunk (default: 1)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Server processes sharing the port, so the stand-in is not the bottleneck (default: 1)')
+    args = parser.parse_args()
+
+    sock = _listen_socket(args.host, args.port)
+    ctx = multiprocessing.get_context('fork')
+    ready_events = [ctx.Event() for _ in range(args.workers)]
+    processes = [ctx.Process(target=_worker, args=(args, sock, ready), daemon=True) for ready in ready_events]
+    for p in processes:
+        p.start()
+    for ready in ready_events:
+        ready.wait()
+
+    # Same readiness line the benchmark scripts wait for in the server log
+    print(READY_LINE, flush=True)
+    # Stop the workers too when the launcher kills the server
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        for p in processes:
+            p.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for p in processes:
+            p.terminate()
+    sys.exit(0 if all(p.exitcode in (0, None, -15) for p in processes) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+import sys
+import json
+from pathlib import Path
+
+import numpy as np
+
+
+# Interactivity targets (tok/s/user) the frontiers are compared at
+DEFAULT_INTVTY_TARGETS = [20, 50, 100]
+
+# Fields defining one frontier; points of different groups are never compared
+GROUP_FIELDS = ['model', 'hw', 'framework', 'precision', 'isl', 'osl']
+
+
+def pareto_frontier(x, y, maximize_x=True):
+    """Return the indices of the upper Pareto frontier of (x, y), sorted by ascending x.
+
+    y is always maximized; x is maximized (e.g. interactivity) or minimized (e.g.
+    end-to-end latency). A point is on the frontier when no other point is at least as
+    good on both axes and better on one. Runs in O(n log n): one sort followed by a
+    running maximum.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if x.size == 0:
+        return np.array([], dtype=int)
+
+    # Best x first; among equal x, best y first so duplicates in x are dominated
+    order = np.lexsort((-y, -x if maximize_x else x))
+    y_sorted = y[order]
+    best_so_far = np.concatenate(([-np.inf], np.maximum.accumulate(y_sorted)[:-1]))
+    frontier = order[y_sorted > best_so_far]
+    return frontier[np.argsort(x[frontier], kind='stable')]
+
+
+def interpolate_frontier(x, y, targets, maximize_x=True):
+    """Interpolate the frontier of (x, y) at the given x targets.
+
+    Between frontier points the frontier is linear. Targets the frontier does not
+    reach (beyond its best x) are NaN; targets below what the frontier requires are
+    met by its highest-y point.
+    """
+    idx = pareto_frontier(x, y, maximize_x)
+    targets = np.asarray(targets, dtype=float)
+    if idx.size == 0:
+        return np.full(targets.shape, np.nan)
+
+    fx = np.asarray(x, dtype=float)[idx]
+    fy = np.asarray(y, dtype=float)[idx]
+    if maximize_x:
+        return np.interp(targets, fx, fy, left=fy[0], right=np.nan)
+    return np.interp(targets, fx, fy, left=np.nan, right=fy[-1])
+
+
+def group_results(results):
+    """Group agg records by GROUP_FIELDS, skipping records missing the plotted metrics."""
+    groups = {}
+    for r in results:
+        if r.get('tput_per_gpu') is None:
+            continue
+        key = tuple(r.get(f) for f in GROUP_FIELDS)
+        groups.setdefault(key, []).append(r)
+    return groups
+
+
+def frontier_records(results, x_metric, maximize_x=True):
+    """Return the records on the tput_per_gpu vs x_metric frontier, sorted by x_metric."""
+    results = [r for r in results if r.get(x_metric) is not None and r.get('tput_per_gpu') is not None]
+    idx = pareto_frontier([r[x_metric] for r in results], [r['tput_per_gpu'] for r in results], maximize_x)
+    return [results[i] for i in idx]
+
+
+def frontier_table(results, targets=DEFAULT_INTVTY_TARGETS):
+    """Return (group key, tput_per_gpu at each interactivity target) for every group."""
+    rows = []
+    for key, group in sorted(group_results(results).items(), key=lambda kv: tuple(str(v) for v in kv[0])):
+        group = [r for r in group if r.get('median_intvty') is not None]
+        if not group:
+            continue
+        values = interpolate_frontier([r['median_intvty'] for r in group], [r['tput_per_gpu'] for r in group], targets)
+        rows.append((key, values))
+    return rows
+
+
+def format_frontier_table(results, targets=DEFAULT_INTVTY_TARGETS):
+    header = '| Model | Hardware | Framework | Precision | ISL | OSL | ' + ' | '.join(
+        f'TPUT per GPU @ {t} tok/s/user' for t in targets) + ' |'
+    lines = [header, '| ' + ' | '.join([':-:'] * (6 + len(targets))) + ' |']
+    for (model, hw, framework, precision, isl, osl), values in frontier_table(results, targets):
+        cells = ' | '.join('-' if np.isnan(v) else f'{v:.4f}' for v in values)
+        lines.append(
+            f"| {model} "
+            f"| {str(hw).upper()} "
+            f"| {str(framework).upper()} "
+            f"| {str(precision).upper()} "
+            f"| {isl if isl is not None else '-'} "
+            f"| {osl if osl is not None else '-'} "
+            f"| {cells} |"
+        )
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    results = []
+    for result_path in Path(sys.argv[1]).rglob('*.json'):
+        with open(result_path) as f:
+            result = json.load(f)
+        results.append(result)
+    print(format_frontier_table(results))
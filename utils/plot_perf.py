@@ -1,11 +1,20 @@
 import sys
-import json
-from pathlib import Path
 import matplotlib.pyplot as plt
 
+from columnar import load_results
+from pareto import frontier_records, group_results
+from load_curves import is_open_loop, plot_load_curves
+
+
+# Columns read when loading from a columnar (Parquet) aggregate
+PLOT_COLUMNS = [
+    'model', 'hw', 'framework', 'precision', 'isl', 'osl', 'tp',
+    'median_e2el', 'median_intvty', 'tput_per_gpu',
+    'ep', 'dp_attention', 'conc', 'request_rate', 'arrival', 'burstiness', 'request_throughput',
+    'median_ttft', 'p99_ttft',
+]
+
 
-results_dir = Path(sys.argv[1])
-exp_name = sys.argv[2]
 hw_color = {
     'h100': 'lightgreen',
     'h200': 'green',           # H200 VLLM
@@ -18,14 +27,16 @@ hw_color = {
     'gb200': 'orange',          # GB200 TRT-LLM and SGlang
 }
 
-results = []
-for result_path in results_dir.rglob(f'*.json'):
-    with open(result_path) as f:
-        result = json.load(f)
-    results.append(result)
+def plot_frontiers(ax, series_results, x_metric, color, linestyle, maximize_x=True):
+    """Draw the tput_per_gpu vs x_metric Pareto frontier of each group in a scatter series."""
+    for group in group_results(series_results).values():
+        frontier = frontier_records(group, x_metric, maximize_x)
+        if len(frontier) > 1:
+            ax.plot([r[x_metric] for r in frontier], [r['tput_per_gpu'] for r in frontier],
+                    color=color, linestyle=linestyle, linewidth=1, alpha=0.7)
 
 
-def plot_tput_vs_e2el(precision_filter=None):
+def plot_tput_vs_e2el(results, exp_name, precision_filter=None):
     fig, ax = plt.subplots()
     
     # Filter results by precision if specified
@@ -43,12 +54,14 @@ def plot_tput_vs_e2el(precision_filter=None):
             xs_fp8 = [r['median_e2el'] for r in fp8_results]
             ys_fp8 = [r['tput_per_gpu'] for r in fp8_results]
             ax.scatter(xs_fp8, ys_fp8, label=f"{hw_label.upper()} (fp8)", color=color, marker='o', s=60)
+            plot_frontiers(ax, fp8_results, 'median_e2el', color, '-', maximize_x=False)
         
         # Plot fp4 results with squares
         if fp4_results:
             xs_fp4 = [r['median_e2el'] for r in fp4_results]
             ys_fp4 = [r['tput_per_gpu'] for r in fp4_results]
             ax.scatter(xs_fp4, ys_fp4, label=f"{hw_label.upper()} (fp4)", color=color, marker='s', s=60)
+            plot_frontiers(ax, fp4_results, 'median_e2el', color, '--', maximize_x=False)
 
     for result in filtered_results:
         x, y = result['median_e2el'], result['tput_per_gpu']
@@ -64,7 +77,7 @@ def plot_tput_vs_e2el(precision_filter=None):
     plt.close(fig)
 
 
-def plot_tput_vs_intvty(precision_filter=None):
+def plot_tput_vs_intvty(results, exp_name, precision_filter=None):
     fig, ax = plt.subplots()
     
     # Filter results by precision if specified
@@ -82,12 +95,14 @@ def plot_tput_vs_intvty(precision_filter=None):
             xs_fp8 = [r['median_intvty'] for r in fp8_results]
             ys_fp8 = [r['tput_per_gpu'] for r in fp8_results]
             ax.scatter(xs_fp8, ys_fp8, label=f"{hw_label.upper()} (fp8)", color=color, marker='o', s=60)
+            plot_frontiers(ax, fp8_results, 'median_intvty', color, '-')
         
         # Plot fp4 results with squares
         if fp4_results:
             xs_fp4 = [r['median_intvty'] for r in fp4_results]
             ys_fp4 = [r['tput_per_gpu'] for r in fp4_results]
             ax.scatter(xs_fp4, ys_fp4, label=f"{hw_label.upper()} (fp4)", color=color, marker='s', s=60)
+            plot_frontiers(ax, fp4_results, 'median_intvty', color, '--')
 
     for result in filtered_results:
         x, y = result['median_intvty'], result['tput_per_gpu']
@@ -103,7 +118,7 @@ def plot_tput_vs_intvty(precision_filter=None):
     plt.close(fig)
 
 
-def plot_tput_vs_e2el_for_model(model_results, model_name):
+def plot_tput_vs_e2el_for_model(model_results, model_name, exp_name):
     fig, ax = plt.subplots()
     
     for hw_label, color in hw_color.items():
@@ -116,12 +131,14 @@ def plot_tput_vs_e2el_for_model(model_results, model_name):
             xs_fp8 = [r['median_e2el'] for r in fp8_results]
             ys_fp8 = [r['tput_per_gpu'] for r in fp8_results]
             ax.scatter(xs_fp8, ys_fp8, label=f"{hw_label.upper()} (fp8)", color=color, marker='o', s=60)
+            plot_frontiers(ax, fp8_results, 'median_e2el', color, '-', maximize_x=False)
         
         # Plot fp4 results with squares
         if fp4_results:
             xs_fp4 = [r['median_e2el'] for r in fp4_results]
             ys_fp4 = [r['tput_per_gpu'] for r in fp4_results]
             ax.scatter(xs_fp4, ys_fp4, label=f"{hw_label.upper()} (fp4)", color=color, marker='s', s=60)
+            plot_frontiers(ax, fp4_results, 'median_e2el', color, '--', maximize_x=False)
 
     for result in model_results:
         x, y = result['median_e2el'], result['tput_per_gpu']
@@ -139,7 +156,7 @@ def plot_tput_vs_e2el_for_model(model_results, model_name):
     plt.close(fig)
 
 
-def plot_tput_vs_intvty_for_model(model_results, model_name):
+def plot_tput_vs_intvty_for_model(model_results, model_name, exp_name):
     fig, ax = plt.subplots()
     
     for hw_label, color in hw_color.items():
@@ -152,12 +169,14 @@ def plot_tput_vs_intvty_for_model(model_results, model_name):
             xs_fp8 = [r['median_intvty'] for r in fp8_results]
             ys_fp8 = [r['tput_per_gpu'] for r in fp8_results]
             ax.scatter(xs_fp8, ys_fp8, label=f"{hw_label.upper()} (fp8)", color=color, marker='o', s=60)
+            plot_frontiers(ax, fp8_results, 'median_intvty', color, '-')
         
         # Plot fp4 results with squares
         if fp4_results:
             xs_fp4 = [r['median_intvty'] for r in fp4_results]
             ys_fp4 = [r['tput_per_gpu'] for r in fp4_results]
             ax.scatter(xs_fp4, ys_fp4, label=f"{hw_label.upper()} (fp4)", color=color, marker='s', s=60)
+            plot_frontiers(ax, fp4_results, 'median_intvty', color, '--')
 
     for result in model_results:
         x, y = result['median_intvty'], result['tput_per_gpu']
@@ -186,12 +205,26 @@ def get_model_family(model_name):
         # Fallback to first part of model name
         return model_name.split('/')[-1].split('-')[0] if '/' in model_name else model_name
 
-model_families = set(get_model_family(r.get('model', 'unknown')) for r in results)
 
-for model_family in model_families:
-    # Filter results for this model family
-    model_results = [r for r in results if get_model_family(r.get('model', 'unknown')) == model_family]
-    
-    # Create plots for this model family
-    plot_tput_vs_e2el_for_model(model_results, model_family)
-    plot_tput_vs_intvty_for_model(model_results, model_family)
+def plot_all(results, exp_name):
+    # Open-loop runs get their own latency vs offered load plot instead of joining the frontiers
+    open_loop = [r for r in results if is_open_loop(r)]
+    if open_loop:
+        plot_load_curves(open_loop, f'ttft_vs_load_{exp_name}.png')
+    results = [r for r in results if not is_open_loop(r)]
+
+    model_families = set(get_model_family(r.get('model', 'unknown')) for r in results)
+
+    for model_family in model_families:
+        # Filter results for this model family
+        model_results = [r for r in results if get_model_family(r.get('model', 'unknown')) == model_family]
+
+        # Create plots for this model family
+        plot_tput_vs_e2el_for_model(model_results, model_family, exp_name)
+        plot_tput_vs_intvty_for_model(model_results, model_family, exp_name)
+
+
+if __name__ == '__main__':
+    # Accepts a directory of JSON results or an agg_<exp>.parquet file
+    plot_all(load_results(sys.argv[1], PLOT_COLUMNS), sys.argv[2])
+
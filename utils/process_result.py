@@ -1,51 +1,292 @@
+import re
 import sys
 import json
 import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from engine_args import load_engine_args
+from timeline import analyze_timeline, plot_timeline
+from trace_stats import load_result
 
-hw = os.environ.get('RUNNER_TYPE')
-tp_size = int(os.environ.get('TP'))
-ep_size = int(os.environ.get('EP_SIZE'))
-prefill_gpus_str = os.environ.get('PREFILL_GPUS', '')
-decode_gpus_str = os.environ.get('DECODE_GPUS', '')
-
-# If empty string (aggregated runs), assign to tp_size (total gpus), otherwise convert to int
-prefill_gpus = tp_size if not prefill_gpus_str else int(prefill_gpus_str)
-decode_gpus = tp_size if not decode_gpus_str else int(decode_gpus_str)
-dp_attention = os.environ.get('DP_ATTENTION')
-result_filename = os.environ.get('RESULT_FILENAME')
-framework = os.environ.get('FRAMEWORK')
-precision = os.environ.get('PRECISION')
-mtp_mode = os.environ.get('MTP_MODE')
-
-with open(f'{result_filename}.json') as f:
-    bmk_result = json.load(f)
-
-data = {
-    'hw': hw,
-    'tp': tp_size,
-    'ep': ep_size,
-    'dp_attention': dp_attention, # true or false
-    'conc': int(bmk_result['max_concurrency']),
-    'model': bmk_result['model_id'],
-    'framework': framework,
-    'precision': precision,
-    'tput_per_gpu': float(bmk_result['total_token_throughput']) / tp_size,
-    'output_tput_per_gpu': float(bmk_result['output_throughput']) / decode_gpus,
-    'input_tput_per_gpu': (float(bmk_result['total_token_throughput']) - float(bmk_result['output_throughput']) )/ prefill_gpus
-}
-
-if mtp_mode:  # MTP
-    data['mtp'] = mtp_mode
-
-for key, value in bmk_result.items():
-    if key.endswith('ms'):
-        data[key.replace('_ms', '')] = float(value) / 1000.0
-    if 'tpot' in key:
-        data[key.replace('_ms', '').replace('tpot', 'intvty')] = 1000.0 / float(value)
-
-print(json.dumps(data, indent=2))
-
-with open(f'agg_{result_filename}.json', 'w') as f:
-    json.dump(data, f, indent=2)
+
+# Result filename patterns of multi-node runs and the metadata they encode.
+# Dynamo TRT-LLM: <prefix>_ctx<N>_gen<M>_<tep|dep><K>_batch<B>_eplb<E>_mtp<T>_conc<C>_gpus<G>.json
+# Dynamo SGLang/vLLM: <prefix>_isl_<I>_osl_<O>_concurrency_<C>_req_rate_<R>_gpus_<G>_ctx_<P>_gen_<D>.json
+FILENAME_PATTERNS = [
+    re.compile(
+        r'_ctx(?P<ctx_num>\d+)_gen(?P<gen_num>\d+)_(?P<gen_parallel>[td]ep)(?P<gen_tp>\d+)'
+        r'_batch(?P<gen_batch_size>\d+)_eplb(?P<gen_eplb_slots>\d+)_mtp(?P<gen_mtp_size>\d+)'
+        r'_conc(?P<conc>\d+)_gpus(?P<gpus>\d+)$'
+    ),
+    re.compile(
+        r'_concurrency_(?P<conc>\d+)_req_rate_(?P<req_rate>[^_]+)_gpus_(?P<gpus>\d+)'
+        r'_ctx_(?P<prefill_gpus>\d+)_gen_(?P<decode_gpus>\d+)$'
+    ),
+]
+
+
+def parse_result_filename(result_filename):
+    """Parse the metadata encoded in a multi-node result filename (without .json).
+
+    Returns a dict with at least 'gpus', 'prefill_gpus' and 'decode_gpus', plus
+    'ep', 'dp_attention' and the generation server layout for TRT-LLM names, or None
+    if the name matches no known pattern.
+    """
+    for pattern in FILENAME_PATTERNS:
+        match = pattern.search(result_filename)
+        if match is None:
+            continue
+        fields = match.groupdict()
+        meta = {'gpus': int(fields['gpus'])}
+        if 'gen_parallel' in fields:
+            decode_gpus = int(fields['gen_num']) * int(fields['gen_tp'])
+            meta.update({
+                'prefill_gpus': meta['gpus'] - decode_gpus,
+                'decode_gpus': decode_gpus,
+                'ep': int(fields['gen_tp']),
+                'dp_attention': 'true' if fields['gen_parallel'] == 'dep' else 'false',
+                'ctx_num': int(fields['ctx_num']),
+                'gen_num': int(fields['gen_num']),
+                'gen_tp': int(fields['gen_tp']),
+                'gen_batch_size': int(fields['gen_batch_size']),
+                'gen_eplb_slots': int(fields['gen_eplb_slots']),
+                'gen_mtp_size': int(fields['gen_mtp_size']),
+            })
+        else:
+            meta.update({
+                'prefill_gpus': int(fields['prefill_gpus']),
+                'decode_gpus': int(fields['decode_gpus']),
+            })
+        return meta
+    return None
+
+
+def process_result(bmk_result, hw, tp_size, ep_size, dp_attention, framework, precision,
+                   prefill_gpus=None, decode_gpus=None, mtp_mode=None, isl=None, osl=None, image=None):
+    """Turn a raw benchmark client result into an aggregated result record."""
+    # Aggregated runs use all GPUs for both prefill and decode
+    prefill_gpus = tp_size if prefill_gpus is None else prefill_gpus
+    decode_gpus = tp_size if decode_gpus is None else decode_gpus
+
+    data = {
+        'hw': hw,
+        'tp': tp_size,
+        'ep': ep_size,
+        'dp_attention': dp_attention, # true or false
+        'conc': int(bmk_result['max_concurrency']),
+        'model': bmk_result['model_id'],
+        'framework': framework,
+        'precision': precision,
+        'tput_per_gpu': float(bmk_result['total_token_throughput']) / tp_size,
+        'output_tput_per_gpu': float(bmk_result['output_throughput']) / decode_gpus,
+        'input_tput_per_gpu': (float(bmk_result['total_token_throughput']) - float(bmk_result['output_throughput']) )/ prefill_gpus
+    }
+
+    if 'request_throughput' in bmk_result:
+        data['request_throughput'] = float(bmk_result['request_throughput'])
+
+    if mtp_mode:  # MTP
+        data['mtp'] = mtp_mode
+
+    if isl and osl:
+        data['isl'] = int(isl)
+        data['osl'] = int(osl)
+
+    if image:
+        data['image'] = image
+
+    for key, value in bmk_result.items():
+        if key.endswith('ms'):
+            data[key.replace('_ms', '')] = float(value) / 1000.0
+        if 'tpot' in key:
+            data[key.replace('_ms', '').replace('tpot', 'intvty')] = 1000.0 / float(value)
+
+    return data
+
+
+def process_result_file(result_filename, extra_fields=None, timeline_plot=False, **kwargs):
+    """Process <result_filename>.json and write agg_<result_filename>.json.
+
+    If the result holds per-request arrays (bench_serving --save-detailed), their
+    percentiles, ITL histogram and goodput are added to the record; metrics the
+    client already reported are kept as they are. The token timeline is rebuilt
+    from the same arrays to add steady-state throughput next to the whole-run
+    figures, and with timeline_plot it is drawn to timeline_<result_filename>.png.
+    """
+    # Streamed so detailed per-request arrays never have to fit in memory at once
+    bmk_result, trace_metrics, requests = load_result(f'{result_filename}.json', return_requests=True)
+
+    data = process_result(bmk_result, **kwargs)
+    for key, value in trace_metrics.items():
+        data.setdefault(key, value)
+
+    result_path = Path(result_filename)
+    if trace_metrics:
+        steady, timeline = analyze_timeline(f'{result_filename}.json', requests, data['conc'])
+        if steady:
+            decode_gpus = kwargs.get('decode_gpus') or kwargs['tp_size']
+            data['steady_tput_per_gpu'] = steady['steady_total_tok_s'] / kwargs['tp_size']
+            data['steady_output_tput_per_gpu'] = steady['steady_output_tok_s'] / decode_gpus
+            data['steady_window_s'] = steady['steady_window_end'] - steady['steady_window_start']
+            data['steady_window_frac'] = steady['steady_window_frac']
+        if timeline_plot and timeline:
+            plot_timeline(timeline, result_path.name, result_path.with_name(f'timeline_{result_path.name}.png'))
+
+    if extra_fields:
+        data.update(extra_fields)
+
+    with open(result_path.with_name(f'agg_{result_path.name}.json'), 'w') as f:
+        json.dump(data, f, indent=2)
+    return data
+
+
+def _process_batch_file(args):
+    result_filename, meta, common, timeline_plot = args
+    kwargs = {
+        **common,
+        'tp_size': meta['gpus'],
+        'ep_size': meta.get('ep', common['ep_size']),
+        'dp_attention': meta.get('dp_attention', common['dp_attention']),
+        'prefill_gpus': meta['prefill_gpus'],
+        'decode_gpus': meta['decode_gpus'],
+    }
+    # Generation server layout of TRT-LLM runs is kept on the record
+    layout = {k: v for k, v in meta.items() if k.startswith(('ctx_', 'gen_'))}
+    process_result_file(result_filename, extra_fields=layout, timeline_plot=timeline_plot, **kwargs)
+    return result_filename
+
+
+def process_batch(results_dir, prefix, common, workers=1, timeline_plot=False):
+    """Process every '<prefix>_*.json' multi-node result in results_dir.
+
+    Per-file metadata (GPU counts, parallelism, generation server layout) is parsed
+    from the filename; common holds the fields shared by all files (hw, framework,
+    ...). Files whose names match no known pattern are skipped. Agg files are written
+    next to the results. Returns the list of processed result filenames.
+    """
+    jobs = []
+    for result_path in sorted(Path(results_dir).glob(f'{prefix}_*.json')):
+        result_filename = str(result_path.with_suffix(''))
+        meta = parse_result_filename(result_path.stem)
+        if meta is None:
+            print(f'Skipping {result_path}: filename matches no known result pattern', file=sys.stderr)
+            continue
+        jobs.append((result_filename, meta, common, timeline_plot))
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_process_batch_file, jobs))
+    return [_process_batch_file(job) for job in jobs]
+
+
+def load_startup(startup_file):
+    """Startup fields recorded by wait_for_server.py, or {} if there is no usable record."""
+    if not startup_file or not os.path.exists(startup_file):
+        return {}
+    with open(startup_file) as f:
+        startup = json.load(f)
+    if startup.get('status') != 'ready':
+        return {}
+    phases = {k: v for k, v in startup.get('phases', {}).items() if k.startswith('startup_')}
+    return {'time_to_ready_s': startup['time_to_ready_s'], **phases}
+
+
+def load_compile_cache(compile_cache_file):
+    """Compile cache hit/miss report written by compile_cache.py, or {} if there is none."""
+    if not compile_cache_file or not os.path.exists(compile_cache_file):
+        return {}
+    with open(compile_cache_file) as f:
+        report = json.load(f)
+    return {k: report[k] for k in ('compile_cache', 'compile_cache_key') if k in report}
+
+
+def engine_args_fields():
+    """Engine args of the matrix entry from ENGINE_ARGS/ENGINE_ARGS_TAG, or {} for an entry without any."""
+    engine_args = load_engine_args()
+    if not engine_args:
+        return {}
+    return {'engine_args': engine_args, 'engine_args_tag': os.environ.get('ENGINE_ARGS_TAG') or None}
+
+
+def kv_capacity_fields():
+    """KV cache capacity predicted for the entry by the matrix generator, or {} if it was not computed."""
+    kv_capacity = os.environ.get('KV_CAPACITY')
+    return {'kv_capacity': int(kv_capacity)} if kv_capacity else {}
+
+
+def arrival_fields():
+    """Offered load of an open-loop entry from REQUEST_RATE/ARRIVAL/BURSTINESS, or {} for a closed-loop one."""
+    request_rate = os.environ.get('REQUEST_RATE')
+    if not request_rate or request_rate == 'inf':
+        return {}
+    fields = {'request_rate': float(request_rate), 'arrival': os.environ.get('ARRIVAL') or 'poisson'}
+    if os.environ.get('BURSTINESS'):
+        fields['burstiness'] = float(os.environ['BURSTINESS'])
+    return fields
+
+
+def common_fields_from_env():
+    return {
+        'hw': os.environ.get('RUNNER_TYPE'),
+        'ep_size': int(os.environ.get('EP_SIZE', '1')),
+        'dp_attention': os.environ.get('DP_ATTENTION', 'false'),
+        'framework': os.environ.get('FRAMEWORK'),
+        'precision': os.environ.get('PRECISION'),
+        'mtp_mode': os.environ.get('MTP_MODE'),
+        'isl': os.environ.get('ISL'),
+        'osl': os.environ.get('OSL'),
+        'image': os.environ.get('IMAGE'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Process benchmark results into agg_*.json records. Without arguments, processes '
+                    '$RESULT_FILENAME.json using TP, EP_SIZE, PREFILL_GPUS, DECODE_GPUS, ... from the environment. '
+                    'Server startup time is read from $STARTUP_FILE and the compile cache report '
+                    'from $COMPILE_CACHE_FILE when set, engine args from $ENGINE_ARGS, the predicted KV cache capacity from $KV_CAPACITY '
+                    'and the offered load of open-loop runs from $REQUEST_RATE, $ARRIVAL and $BURSTINESS.')
+    parser.add_argument('--batch-dir', required=False,
+                        help='Process all multi-node results named <prefix>_*.json in this directory')
+    parser.add_argument('--prefix', required=False,
+                        help='Result filename prefix for --batch-dir (default: $RESULT_FILENAME)')
+    parser.add_argument('--workers', type=int, default=1, help='Processes used in batch mode (default: 1)')
+    parser.add_argument('--timeline-plot', action='store_true',
+                        help='Plot the token timeline of results with per-request arrays to timeline_<result>.png')
+    args = parser.parse_args()
+
+    common = common_fields_from_env()
+
+    if args.batch_dir:
+        prefix = args.prefix or os.environ.get('RESULT_FILENAME')
+        if not prefix:
+            parser.error('--prefix or RESULT_FILENAME is required with --batch-dir')
+        processed = process_batch(args.batch_dir, prefix, common, args.workers, args.timeline_plot)
+        if not processed:
+            print(f"No results matching '{prefix}_*.json' found in {args.batch_dir}", file=sys.stderr)
+            sys.exit(1)
+        print(f'Processed {len(processed)} results', file=sys.stderr)
+        return
+
+    prefill_gpus_str = os.environ.get('PREFILL_GPUS', '')
+    decode_gpus_str = os.environ.get('DECODE_GPUS', '')
+    data = process_result_file(
+        os.environ.get('RESULT_FILENAME'),
+        extra_fields={**load_startup(os.environ.get('STARTUP_FILE')),
+                      **load_compile_cache(os.environ.get('COMPILE_CACHE_FILE')),
+                      **engine_args_fields(),
+                      **kv_capacity_fields(),
+                      **arrival_fields()},
+        **common,
+        timeline_plot=args.timeline_plot,
+        tp_size=int(os.environ.get('TP')),
+        prefill_gpus=int(prefill_gpus_str) if prefill_gpus_str else None,
+        decode_gpus=int(decode_gpus_str) if decode_gpus_str else None,
+    )
+    print(json.dumps(data, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from collect_results import write_agg_results
+from columnar import write_parquet
+from summarize import format_summary
+
+
+def _load_file(result_path):
+    with open(result_path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def load_results(results_dir, workers=None):
+    """Discover and parse every result file under results_dir once.
+
+    Files are read and parsed on a thread pool (file reads release the GIL); orjson
+    is used for parsing when installed. Results keep the sorted path order, so the
+    output does not depend on the number of workers.
+    """
+    result_paths = sorted(Path(results_dir).rglob('*.json'))
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    if workers <= 1 or len(result_paths) < 2:
+        return [_load_file(p) for p in result_paths]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_load_file, result_paths))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Load results once and produce the markdown summary, aggregated results and plots')
+    parser.add_argument('results_dir', help='Directory holding per-job aggregated results')
+    parser.add_argument('exp_name', help='Experiment name used in output file names')
+    parser.add_argument('--workers', type=int, required=False, help='Number of loader threads (default: CPU count + 4, at most 32)')
+    parser.add_argument('--summary-file', required=False, help='Append the markdown summary to this file instead of printing it')
+    parser.add_argument('--parquet', action='store_true', help='Also write agg_<exp_name>.parquet (requires pyarrow)')
+    parser.add_argument('--no-plots', action='store_true', help='Skip plotting')
+    args = parser.parse_args()
+
+    results = load_results(args.results_dir, args.workers)
+    print(f'Loaded {len(results)} results from {args.results_dir}', file=sys.stderr)
+
+    summary = format_summary(results)
+    if args.summary_file:
+        with open(args.summary_file, 'a') as f:
+            f.write(summary + '\n')
+    else:
+        print(summary)
+
+    write_agg_results(results, args.exp_name)
+    if args.parquet:
+        write_parquet(results, f'agg_{args.exp_name}.parquet')
+
+    if not args.no_plots:
+        # Imported lazily so summaries and aggregation work without matplotlib
+        from plot_perf import plot_all
+        plot_all(results, args.exp_name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+import urllib.request
+from pathlib import Path
+
+
+# Config columns every aggregated result is identified by, in index order
+CONFIG_COLUMNS = ['model', 'hw', 'framework', 'precision', 'isl', 'osl', 'tp', 'ep', 'dp_attention', 'conc']
+
+# Metric columns stored alongside the full JSON record for fast filtering/sorting
+METRIC_COLUMNS = [
+    'tput_per_gpu', 'output_tput_per_gpu', 'input_tput_per_gpu',
+    'median_ttft', 'median_tpot', 'median_intvty', 'median_e2el',
+    'p99_ttft', 'p99_tpot', 'p99_e2el',
+]
+
+SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    result_name TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    date TEXT NOT NULL,
+    model TEXT,
+    hw TEXT,
+    framework TEXT,
+    precision TEXT,
+    isl INTEGER,
+    osl INTEGER,
+    tp INTEGER,
+    ep INTEGER,
+    dp_attention TEXT,
+    conc INTEGER,
+    mtp TEXT,
+    {', '.join(f'{c} REAL' for c in METRIC_COLUMNS)},
+    record TEXT NOT NULL,
+    UNIQUE (run_id, result_name, content_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_results_config ON results ({', '.join(CONFIG_COLUMNS)}, date);
+CREATE INDEX IF NOT EXISTS idx_results_date ON results (date);
+'''
+
+
+def connect(db_path):
+    """Open (and create if needed) the results store."""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def content_hash(record):
+    """Stable hash of a result record, independent of key order and formatting."""
+    return hashlib.sha256(json.dumps(record, sort_keys=True).encode()).hexdigest()
+
+
+def iter_result_records(results_dir):
+    """Yield (result_name, record) for every result under results_dir.
+
+    Handles both per-job 'agg_<result>.json' records and collected 'agg_<exp>.json' lists;
+    records from a list are named '<file>#<index>'.
+    """
+    results_dir = Path(results_dir)
+    for result_path in sorted(results_dir.rglob('*.json')):
+        with open(result_path) as f:
+            data = json.load(f)
+        name = result_path.relative_to(results_dir).as_posix()
+        if isinstance(data, list):
+            for i, record in enumerate(data):
+                if isinstance(record, dict):
+                    yield f'{name}#{i}', record
+        elif isinstance(data, dict):
+            yield name, data
+
+
+def run_date(run_id, repo, token=None):
+    """ISO date (UTC) a GitHub Actions workflow run was created, from the GitHub API."""
+    request = urllib.request.Request(f'https://api.github.com/repos/{repo}/actions/runs/{run_id}',
+                                     headers={'Accept': 'application/vnd.github+json'})
+    if token:
+        request.add_header('Authorization', f'Bearer {token}')
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return json.load(response)['created_at'][:10]
+    except (OSError, ValueError, KeyError) as e:
+        raise ValueError(f"Unable to look up the date of run {run_id} in '{repo}': {e}. Pass --date instead.")
+
+
+def ingest(conn, results_dir, run_id, date):
+    """Ingest all results under results_dir for a given run, dated by the run (ISO date).
+
+    Rows are keyed by (run_id, result_name, content_hash), so re-ingesting the same
+    artifacts is a no-op. Returns (number of rows inserted, number of records seen).
+    """
+    columns = ['run_id', 'result_name', 'content_hash', 'date'] + CONFIG_COLUMNS + ['mtp'] + METRIC_COLUMNS + ['record']
+    sql = f"INSERT OR IGNORE INTO results ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+    n_seen = 0
+    before = conn.total_changes
+    with conn:
+        for name, record in iter_result_records(results_dir):
+            n_seen += 1
+            dp_attention = record.get('dp_attention')
+            row = [str(run_id), name, content_hash(record), date]
+            row += [record.get(c) for c in CONFIG_COLUMNS[:8]]
+            row += [None if dp_attention is None else str(dp_attention).lower(), record.get('conc')]
+            row += [record.get('mtp')]
+            row += [record.get(c) for c in METRIC_COLUMNS]
+            row += [json.dumps(record)]
+            conn.execute(sql, row)
+    return conn.total_changes - before, n_seen
+
+
+def query(conn, since=None, until=None, **filters):
+    """Return stored results matching the given config filters, oldest first.
+
+    Filters are exact matches on CONFIG_COLUMNS (e.g. hw='h200', conc=64); since/until
+    bound the ISO date inclusively. Each result is the original record plus its
+    run_id and date.
+    """
+    clauses, params = [], []
+    for column, value in filters.items():
+        if column not in CONFIG_COLUMNS:
+            raise ValueError(f"Unknown filter '{column}'. Valid filters are: {', '.join(CONFIG_COLUMNS)}")
+        if value is None:
+            continue
+        clauses.append(f'{column} = ?')
+        params.append(str(value).lower() if column == 'dp_attention' else value)
+    if since:
+        clauses.append('date >= ?')
+        params.append(since)
+    if until:
+        clauses.append('date <= ?')
+        params.append(until)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    rows = conn.execute(f'SELECT run_id, date, record FROM results {where} ORDER BY date, id', params)
+    return [{**json.loads(row['record']), 'run_id': row['run_id'], 'date': row['date']} for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Persistent store of aggregated benchmark results')
+    parser.add_argument('--db', required=True, help='Path to the SQLite results store')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help='Ingest agg_*.json results from a directory')
+    ingest_parser.add_argument('results_dir', help='Directory holding aggregated results')
+    ingest_parser.add_argument('--run-id', required=True, help='Identifier of the run the results belong to (e.g., GITHUB_RUN_ID)')
+    ingest_parser.add_argument('--date', required=False,
+                               help='ISO date of the run (default: the creation date of GitHub Actions run --run-id)')
+    ingest_parser.add_argument('--repo', default=os.environ.get('GITHUB_REPOSITORY'),
+                               help='owner/name of the repository the run belongs to (default: $GITHUB_REPOSITORY)')
+
+    query_parser = subparsers.add_parser('query', help='Print matching results as JSON')
+    for column in CONFIG_COLUMNS:
+        query_parser.add_argument(f"--{column.replace('_', '-')}", dest=column, required=False)
+    query_parser.add_argument('--since', required=False, help='Earliest ISO date to include')
+    query_parser.add_argument('--until', required=False, help='Latest ISO date to include')
+
+    args = parser.parse_args()
+    conn = connect(args.db)
+
+    if args.command == 'ingest':
+        try:
+            if args.date:
+                date = args.date
+            elif args.repo:
+                date = run_date(args.run_id, args.repo, os.environ.get('GITHUB_TOKEN'))
+            else:
+                raise ValueError('Pass --date, or --repo to look up the date of run --run-id')
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        n_inserted, n_seen = ingest(conn, args.results_dir, args.run_id, date)
+        print(f'Ingested {n_inserted} new results ({n_seen - n_inserted} already stored) into {args.db}', file=sys.stderr)
+    elif args.command == 'query':
+        filters = {c: getattr(args, c) for c in CONFIG_COLUMNS}
+        print(json.dumps(query(conn, args.since, args.until, **filters), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from specs import MODEL_SPECS, WEIGHT_BYTES_PER_PARAM, hardware_spec, kv_dtype_bytes, kv_elements_per_token
+
+
+# Tensor formats a weight precision can compute in, fastest first
+COMPUTE_FORMATS = {'fp4': ['fp4', 'fp8', 'bf16'], 'fp8': ['fp8', 'bf16'], 'bf16': ['bf16'], 'fp16': ['bf16']}
+
+# Fields defining one configuration in the efficiency table
+CONFIG_FIELDS = ['model', 'hw', 'framework', 'precision', 'isl', 'osl']
+
+
+def _context_sum(cost, ctx):
+    """Context tokens attended over, summed over layers."""
+    sliding_layers = cost.get('sliding_layers', 0)
+    return (cost['layers'] - sliding_layers) * ctx + sliding_layers * min(ctx, cost.get('sliding_window', ctx))
+
+
+def active_params(cost):
+    return (cost['dense_params_b'] + cost['expert_params_b'] * cost['top_k'] / cost['num_experts']) * 1e9
+
+
+def weight_bytes_read(cost, precision, tokens, tp, dp_attn):
+    """Weight bytes all GPUs of a server read for one forward pass over tokens tokens.
+
+    Only the experts some token is routed to are read: with uniform routing a batch
+    touches 1 - (1 - top_k / num_experts) ** tokens of them. With DP attention every
+    rank reads its own copy of the dense weights.
+    """
+    touched = 1 - (1 - cost['top_k'] / cost['num_experts']) ** tokens
+    expert_bytes = cost['expert_params_b'] * 1e9 * WEIGHT_BYTES_PER_PARAM[precision] * touched
+    dense_bytes = cost['dense_params_b'] * 1e9 * cost['dense_bytes_per_param'] * (tp if dp_attn else 1)
+    return expert_bytes + dense_bytes
+
+
+def roofline_utilization(record):
+    """Achieved HBM bandwidth and compute utilization of a result's decode and prefill phases.
+
+    Each phase's FLOPs and bytes per token come from the model's cost formulas: decode
+    tokens at the average context isl + osl / 2 in batches of conc sequences, and prefill
+    tokens at the average causal context isl / 2 in passes of isl tokens. They are
+    multiplied by output_tput_per_gpu and input_tput_per_gpu and divided by the GPU's
+    peak, so the utilizations are averages over the run's wall time.
+
+    roofline_efficiency is the fraction of GPU time the roofline says those token rates
+    need: for each phase, the larger of its compute and bandwidth utilization, summed.
+    1.0 means running at the hardware limit. Returns None for models, hardware or
+    precisions not in the tables.
+    """
+    spec = hardware_spec(record.get('hw'))
+    cost = MODEL_SPECS.get(record.get('model'))
+    precision = str(record.get('precision')).lower()
+    if spec is None or cost is None or precision not in WEIGHT_BYTES_PER_PARAM or record.get('isl') is None:
+        return None
+
+    peak_flops = next(spec['tflops'][f] for f in COMPUTE_FORMATS[precision] if f in spec['tflops']) * 1e12
+    peak_bw = spec['hbm_tb_s'] * 1e12
+    isl, osl, conc = int(record['isl']), int(record['osl']), int(record['conc'])
+    tp, dp_attn = int(record['tp']), str(record.get('dp_attention')).lower() == 'true'
+    # The KV cache dtype the server ran with is recorded in its engine args (set by the master configs)
+    kv_cache_dtype = (record.get('engine_args') or {}).get('kv-cache-dtype')
+    kv_token_bytes = kv_elements_per_token(cost) * kv_dtype_bytes(kv_cache_dtype)
+    matmul_flops = 2 * active_params(cost)
+
+    decode_ctx = isl + osl / 2
+    decode_flops = matmul_flops + cost['attn_flops_decode'] * _context_sum(cost, decode_ctx)
+    decode_bytes = (weight_bytes_read(cost, precision, conc, tp, dp_attn) / conc
+                    + kv_token_bytes * (_context_sum(cost, decode_ctx) + cost['layers']))
+
+    prefill_flops = matmul_flops + cost['attn_flops_prefill'] * _context_sum(cost, isl / 2)
+    prefill_bytes = weight_bytes_read(cost, precision, isl, tp, dp_attn) / isl + kv_token_bytes * cost['layers']
+
+    decode_rate = float(record.get('output_tput_per_gpu') or 0.0)
+    prefill_rate = float(record.get('input_tput_per_gpu') or 0.0)
+    utilization = {
+        'decode_hbm_util': decode_rate * decode_bytes / peak_bw,
+        'decode_compute_util': decode_rate * decode_flops / peak_flops,
+        'prefill_hbm_util': prefill_rate * prefill_bytes / peak_bw,
+        'prefill_compute_util': prefill_rate * prefill_flops / peak_flops,
+    }
+    utilization['roofline_efficiency'] = (
+        max(utilization['decode_hbm_util'], utilization['decode_compute_util'])
+        + max(utilization['prefill_hbm_util'], utilization['prefill_compute_util']))
+    return utilization
+
+
+def efficiency_table(results):
+    """Return (config key, number of points, best point, its utilization) for every configuration.
+
+    The best point of a configuration is the one with the highest roofline efficiency.
+    """
+    groups = {}
+    for r in results:
+        utilization = roofline_utilization(r)
+        if utilization is not None:
+            groups.setdefault(tuple(r.get(f) for f in CONFIG_FIELDS), []).append((r, utilization))
+
+    rows = []
+    for key, points in sorted(groups.items(), key=lambda kv: tuple(str(v) for v in kv[0])):
+        best, utilization = max(points, key=lambda p: p[1]['roofline_efficiency'])
+        rows.append((key, len(points), best, utilization))
+    return rows
+
+
+def format_efficiency_table(results):
+    lines = [
+        '| Model | Hardware | Framework | Precision | ISL | OSL | Points | Best Roofline Eff. (%) | TP | EP | Conc '
+        '| Decode HBM BW (%) | Decode Compute (%) | Prefill HBM BW (%) | Prefill Compute (%) |',
+        '| ' + ' | '.join([':-:'] * 15) + ' |',
+    ]
+    for (model, hw, framework, precision, isl, osl), n_points, best, u in efficiency_table(results):
+        lines.append(
+            f"| {model} "
+            f"| {str(hw).upper()} "
+            f"| {str(framework).upper()} "
+            f"| {str(precision).upper()} "
+            f"| {isl} "
+            f"| {osl} "
+            f"| {n_points} "
+            f"| {u['roofline_efficiency'] * 100:.1f} "
+            f"| {best.get('tp')} "
+            f"| {best.get('ep')} "
+            f"| {best.get('conc')} "
+            f"| {u['decode_hbm_util'] * 100:.1f} "
+            f"| {u['decode_compute_util'] * 100:.1f} "
+            f"| {u['prefill_hbm_util'] * 100:.1f} "
+            f"| {u['prefill_compute_util'] * 100:.1f} |"
+        )
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Report measured throughput as a fraction of the hardware roofline (HBM bandwidth and '
+                    'tensor FLOPs) for the decode and prefill phases of each result')
+    parser.add_argument('results_dir', help='Directory holding aggregated results')
+    parser.add_argument('--output', required=False, help='Also write the per-result utilization as JSON to this file')
+    args = parser.parse_args()
+
+    results = []
+    for result_path in sorted(Path(args.results_dir).rglob('*.json')):
+        with open(result_path) as f:
+            data = json.load(f)
+        results += [r for r in (data if isinstance(data, list) else [data]) if isinstance(r, dict) and 'hw' in r]
+
+    if not results:
+        print(f'No results found in {args.results_dir}', file=sys.stderr)
+    print(format_efficiency_table(results))
+
+    if args.output:
+        rows = []
+        for r in results:
+            utilization = roofline_utilization(r)
+            if utilization is not None:
+                rows.append({**{f: r.get(f) for f in CONFIG_FIELDS + ['tp', 'ep', 'dp_attention', 'conc']},
+                             **utilization})
+        with open(args.output, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# Hardware and model tables shared by the KV cache capacity model in
+# matrix-logic/generate_sweep_configs.py and the roofline report in roofline.py
+
+# Per-GPU hardware limits: HBM capacity (GB), HBM bandwidth (TB/s) and dense tensor
+# throughput (TFLOP/s, without sparsity) by format
+HARDWARE_SPECS = {
+    'h100': {'memory_gb': 80, 'hbm_tb_s': 3.35, 'tflops': {'bf16': 989, 'fp8': 1979}},
+    'h200': {'memory_gb': 141, 'hbm_tb_s': 4.8, 'tflops': {'bf16': 989, 'fp8': 1979}},
+    'b200': {'memory_gb': 180, 'hbm_tb_s': 8.0, 'tflops': {'bf16': 2250, 'fp8': 4500, 'fp4': 9000}},
+    'gb200': {'memory_gb': 186, 'hbm_tb_s': 8.0, 'tflops': {'bf16': 2500, 'fp8': 5000, 'fp4': 10000}},
+    'mi300x': {'memory_gb': 192, 'hbm_tb_s': 5.3, 'tflops': {'bf16': 1307, 'fp8': 2615}},
+    'mi325x': {'memory_gb': 256, 'hbm_tb_s': 6.0, 'tflops': {'bf16': 1307, 'fp8': 2615}},
+    'mi355x': {'memory_gb': 288, 'hbm_tb_s': 8.0, 'tflops': {'bf16': 2500, 'fp8': 5000, 'fp4': 10000}},
+}
+
+# Per-model architecture and cost parameters. Routed experts (expert_params_b, top_k of
+# num_experts per token) are stored at the entry's precision, the rest (attention,
+# embeddings, shared experts) at dense_bytes_per_param. Attention FLOPs are per layer
+# and context token; sliding window layers only attend over their window.
+_DEEPSEEK_R1 = {
+    'dense_params_b': 17.2,
+    'expert_params_b': 653.8,
+    'num_experts': 256,
+    'top_k': 8,
+    'dense_bytes_per_param': 1.0,
+    'layers': 61,
+    # MLA caches one compressed latent (kv_lora_rank 512 + rope dim 64) per token and
+    # layer, shared by all heads, so it is not split over tensor parallel ranks
+    'mla_latent_dim': 576,
+    # Decode runs in the absorbed form over the latent (128 heads), prefill in the
+    # expanded form (192-wide QK, 128-wide V heads)
+    'attn_flops_decode': 2 * 128 * (576 + 512),
+    'attn_flops_prefill': 2 * 128 * (192 + 128),
+}
+_GPT_OSS_120B = {
+    'dense_params_b': 2.1,
+    'expert_params_b': 114.7,
+    'num_experts': 128,
+    'top_k': 4,
+    'dense_bytes_per_param': 2.0,
+    'layers': 36,
+    # 64 query heads and 8 KV heads of size 64
+    'kv_heads': 8,
+    'head_dim': 64,
+    # Every other layer attends over a 128 token sliding window
+    'sliding_layers': 18,
+    'sliding_window': 128,
+    'attn_flops_decode': 2 * 64 * (64 + 64),
+    'attn_flops_prefill': 2 * 64 * (64 + 64),
+}
+MODEL_SPECS = {
+    'deepseek-ai/DeepSeek-R1-0528': _DEEPSEEK_R1,
+    'nvidia/DeepSeek-R1-0528-FP4-V2': _DEEPSEEK_R1,
+    'amd/DeepSeek-R1-0528-MXFP4-Preview': _DEEPSEEK_R1,
+    'openai/gpt-oss-120b': _GPT_OSS_120B,
+}
+
+# Bytes per expert weight by precision; fp4 carries an 8-bit scale per 16 values
+WEIGHT_BYTES_PER_PARAM = {'bf16': 2.0, 'fp16': 2.0, 'fp8': 1.0, 'fp4': 0.5625}
+
+
+def hardware_name(runner):
+    """GPU of a runner type or node label such as 'b200-trt' or 'h200-cw_0', or None if unknown."""
+    matches = [gpu for gpu in HARDWARE_SPECS if runner == gpu or str(runner).startswith(f'{gpu}-')]
+    return max(matches, key=len) if matches else None
+
+
+def hardware_spec(runner):
+    """Spec of a runner type or node label, or None if unknown."""
+    gpu = hardware_name(runner)
+    return HARDWARE_SPECS[gpu] if gpu else None
+
+
+def kv_elements_per_token(model):
+    """KV cache elements one token takes per layer, over all heads."""
+    if 'mla_latent_dim' in model:
+        return model['mla_latent_dim']
+    return 2 * model['kv_heads'] * model['head_dim']
+
+
+def kv_dtype_bytes(kv_cache_dtype):
+    """Bytes per KV cache element for an engine's kv-cache-dtype; 'auto' keeps the 16-bit activations."""
+    kv_cache_dtype = str(kv_cache_dtype or 'auto')
+    if 'fp8' in kv_cache_dtype:
+        return 1.0
+    if 'fp4' in kv_cache_dtype:
+        return 0.5
+    return 2.0
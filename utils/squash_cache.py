@@ -0,0 +1,249 @@
+import os
+import re
+import sys
+import json
+import time
+import fcntl
+import shlex
+import hashlib
+import argparse
+import subprocess
+from pathlib import Path
+
+
+METADATA_SUFFIX = '.json'
+LOCK_SUFFIX = '.lock'
+
+DEFAULT_MAX_SIZE_GB = 500
+# Images used this recently may back a running job and are never evicted
+DEFAULT_PROTECT_HOURS = 4
+# Imports of a tag (not pinned by @sha256:) whose manifest digest cannot be resolved are
+# trusted this long, so a moved tag is picked up by the next nightly run
+DEFAULT_TAG_TTL_HOURS = 12
+RESOLVE_TIMEOUT_S = 60
+HASH_CHUNK_BYTES = 16 * 2**20
+
+
+def squash_path(cache_dir, image):
+    """Squash file of an image, named like the launchers always have."""
+    return Path(cache_dir) / f"{re.sub(r'[/:@#]', '_', image)}.sqsh"
+
+
+def file_digest(path):
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK_BYTES):
+            sha256.update(chunk)
+    return f'sha256:{sha256.hexdigest()}'
+
+
+def pinned_digest(image):
+    """Manifest digest an image reference is pinned to with @sha256:..., or None for a tag."""
+    return image.split('@', 1)[1] if '@sha256:' in image else None
+
+
+def resolve_digest(image, skopeo_cmd='skopeo'):
+    """Manifest digest an image reference currently points to, or None if it cannot be resolved.
+
+    Tags are resolved with skopeo inspect; enroot's registry#image form is turned into
+    registry/image for it.
+    """
+    if pinned_digest(image):
+        return pinned_digest(image)
+    cmd = [*shlex.split(skopeo_cmd), 'inspect', '--format', '{{.Digest}}', f"docker://{image.replace('#', '/', 1)}"]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=RESOLVE_TIMEOUT_S)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    digest = result.stdout.strip()
+    return digest if result.returncode == 0 and digest.startswith('sha256:') else None
+
+
+def is_current(metadata, manifest_digest, tag_ttl_s):
+    """Whether a cached import is of the image the reference points to now.
+
+    Imports are compared by manifest digest. When the digest of a tag cannot be
+    resolved, imports older than tag_ttl_s are assumed stale.
+    """
+    if manifest_digest is not None:
+        return metadata.get('manifest_digest') == manifest_digest
+    return time.time() - metadata.get('imported_at', 0) < tag_ttl_s
+
+
+def _metadata_path(path):
+    return path.with_name(path.name + METADATA_SUFFIX)
+
+
+def read_metadata(path):
+    try:
+        with open(_metadata_path(path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_metadata(path, metadata):
+    tmp_path = path.with_name(path.name + METADATA_SUFFIX + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(metadata, f, indent=2)
+    tmp_path.replace(_metadata_path(path))
+
+
+def _file_stamp(path):
+    """Inode, size and mtime of a file: they change whenever its contents are replaced or modified."""
+    stat = path.stat()
+    return [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+
+def is_valid(path, metadata, verify_digest=True):
+    """Whether a squash file is a complete import: its size and digest match the record.
+
+    A file without a record was left by an interrupted or unmanaged import and is not
+    trusted. Hashing a squash file takes minutes, so the digest is checked once per
+    version of the file: a successful check records the file's stamp in metadata, and
+    while the stamp is unchanged the file is not hashed again.
+    """
+    if metadata is None or not path.exists():
+        return False
+    if path.stat().st_size != metadata.get('size_bytes'):
+        return False
+    if not verify_digest or metadata.get('verified_stamp') == _file_stamp(path):
+        return True
+    if file_digest(path) != metadata.get('digest'):
+        return False
+    metadata['verified_stamp'] = _file_stamp(path)
+    return True
+
+
+class FileLock:
+    """Exclusive flock on a lock file; with blocking=False, acquired is False if another job holds it."""
+
+    def __init__(self, path, blocking=True):
+        self.path = path
+        self.blocking = blocking
+        self.acquired = False
+
+    def __enter__(self):
+        self.file = open(self.path, 'w')
+        try:
+            fcntl.flock(self.file, fcntl.LOCK_EX | (0 if self.blocking else fcntl.LOCK_NB))
+            self.acquired = True
+        except BlockingIOError:
+            pass
+        return self
+
+    def __exit__(self, *exc):
+        if self.acquired:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
+
+
+def import_image(image, path, enroot_cmd):
+    """enroot import into a temporary file, renamed into place only once complete."""
+    tmp_path = path.with_name(f'{path.name}.tmp{os.getpid()}')
+    tmp_path.unlink(missing_ok=True)
+    cmd = [*shlex.split(enroot_cmd), 'import', '-o', str(tmp_path), f'docker://{image}']
+    print(f"+ {' '.join(cmd)}", file=sys.stderr)
+    returncode = subprocess.run(cmd, stdout=sys.stderr).returncode
+    if returncode != 0 or not tmp_path.exists():
+        tmp_path.unlink(missing_ok=True)
+        raise ValueError(f'enroot import of {image} failed with exit code {returncode}')
+    tmp_path.replace(path)
+
+
+def ensure_image(cache_dir, image, enroot_cmd='enroot', verify_digest=True, skopeo_cmd='skopeo',
+                 tag_ttl_s=DEFAULT_TAG_TTL_HOURS * 3600):
+    """Return the squash file of image, importing it unless a valid, current one is cached.
+
+    Concurrent jobs for the same image serialize on a per-image lock, so only the
+    first imports and the others reuse its file. A tag that has moved to another
+    manifest since the cached import is imported again. Returns (path, 'hit' or 'import').
+    """
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    path = squash_path(cache_dir, image)
+    with FileLock(path.with_name(path.name + LOCK_SUFFIX)):
+        metadata = read_metadata(path)
+        manifest_digest = resolve_digest(image, skopeo_cmd)
+        status = 'hit'
+        if not is_valid(path, metadata, verify_digest) or not is_current(metadata, manifest_digest, tag_ttl_s):
+            import_image(image, path, enroot_cmd)
+            metadata = {'image': image, 'manifest_digest': manifest_digest, 'size_bytes': path.stat().st_size,
+                        'digest': file_digest(path), 'verified_stamp': _file_stamp(path),
+                        'imported_at': time.time()}
+            status = 'import'
+        metadata['last_used'] = time.time()
+        _write_metadata(path, metadata)
+    return path, status
+
+
+def evict(cache_dir, max_bytes, protect_s, keep=()):
+    """Delete least recently used squash files until the cache fits in max_bytes.
+
+    Files in keep, used within protect_s seconds, or locked by an import in
+    progress are never deleted. Returns the images evicted.
+    """
+    now = time.time()
+    # Partial files of imports killed before they could clean up
+    for tmp_path in Path(cache_dir).glob('*.sqsh.tmp*'):
+        if now - tmp_path.stat().st_mtime > protect_s:
+            tmp_path.unlink(missing_ok=True)
+
+    entries = []
+    for path in Path(cache_dir).glob('*.sqsh'):
+        metadata = read_metadata(path) or {}
+        entries.append((metadata.get('last_used', path.stat().st_mtime), path.stat().st_size, path, metadata))
+
+    total = sum(size for _, size, _, _ in entries)
+    evicted = []
+    for last_used, size, path, metadata in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        if path in keep or now - last_used < protect_s:
+            continue
+        with FileLock(path.with_name(path.name + LOCK_SUFFIX), blocking=False) as lock:
+            if not lock.acquired:
+                continue
+            path.unlink(missing_ok=True)
+            _metadata_path(path).unlink(missing_ok=True)
+        total -= size
+        evicted.append(metadata.get('image', path.name))
+    return evicted
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Import a container image with enroot into a shared squash file cache, reusing a valid '
+                    'cached import and evicting least recently used images; prints the squash file path')
+    parser.add_argument('--cache-dir', required=True, help='Directory holding the squash files')
+    parser.add_argument('--image', required=True, help='Docker image reference, as in docker://<image>')
+    parser.add_argument('--enroot', default=os.environ.get('ENROOT', 'enroot'),
+                        help='enroot command, e.g. "sudo enroot" (default: $ENROOT or enroot)')
+    parser.add_argument('--skopeo', default=os.environ.get('SKOPEO', 'skopeo'),
+                        help='skopeo command resolving the manifest digest of a tag (default: $SKOPEO or skopeo)')
+    parser.add_argument('--tag-ttl-hours', type=float, default=DEFAULT_TAG_TTL_HOURS,
+                        help='Re-import a tag whose manifest digest cannot be resolved after this long '
+                             f'(default: {DEFAULT_TAG_TTL_HOURS})')
+    parser.add_argument('--no-verify-digest', dest='verify_digest', action='store_false',
+                        help='Only check the size of a cached file, not its sha256 against the one recorded at import')
+    parser.add_argument('--max-size-gb', type=float, default=DEFAULT_MAX_SIZE_GB,
+                        help=f'Evict least recently used images beyond this size (default: {DEFAULT_MAX_SIZE_GB})')
+    parser.add_argument('--protect-hours', type=float, default=DEFAULT_PROTECT_HOURS,
+                        help=f'Never evict images used this recently (default: {DEFAULT_PROTECT_HOURS})')
+    args = parser.parse_args()
+
+    try:
+        path, status = ensure_image(args.cache_dir, args.image, args.enroot, args.verify_digest, args.skopeo,
+                                    args.tag_ttl_hours * 3600)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    print(f'Squash image {status}: {path}', file=sys.stderr)
+
+    evicted = evict(args.cache_dir, args.max_size_gb * 2**30, args.protect_hours * 3600, keep={path})
+    if evicted:
+        print(f"Evicted {len(evicted)} squash images: {', '.join(evicted)}", file=sys.stderr)
+    print(path)
+
+
+if __name__ == '__main__':
+    main()
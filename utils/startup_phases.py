@@ -0,0 +1,134 @@
+import re
+import sys
+import json
+import argparse
+from datetime import datetime
+
+
+PHASES = ['weight_load', 'compile', 'graph_capture', 'kv_cache']
+
+# Line timestamp formats, tried in order: SGLang '[2025-08-12 10:00:01 TP0]',
+# TRT-LLM '[08/12/2025-10:00:01]', vLLM 'INFO 08-12 10:00:01' (no year)
+TIMESTAMP_FORMATS = [
+    (re.compile(r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})'), '%Y-%m-%d %H:%M:%S'),
+    (re.compile(r'\[(\d{2}/\d{2}/\d{4}-\d{2}:\d{2}:\d{2})\]'), '%m/%d/%Y-%H:%M:%S'),
+    (re.compile(r'^(?:DEBUG|INFO|WARNING|ERROR)\s+(\d{2}-\d{2} \d{2}:\d{2}:\d{2})'), '%m-%d %H:%M:%S'),
+]
+
+# Per framework and phase, rules tried in order until one matches. A 'duration'
+# rule reads the phase length from a message that reports it (max over ranks);
+# a 'span' rule times the phase from the first begin line to the last end line.
+PHASE_RULES = {
+    'vllm': {
+        'weight_load': [('duration', r'Model loading took [\d.]+ ?GiB and (?P<s>[\d.]+) s'),
+                        ('duration', r'Loading weights took (?P<s>[\d.]+) s')],
+        'compile': [('duration', r'torch\.compile takes (?P<s>[\d.]+) s in total')],
+        'graph_capture': [('duration', r'Graph capturing finished in (?P<s>[\d.]+) sec')],
+        'kv_cache': [('duration', r'Memory profiling takes (?P<s>[\d.]+) s'),
+                     ('span', r'Available KV cache memory', r'GPU KV cache size|# (?:GPU|cuda) blocks')],
+    },
+    'sglang': {
+        'weight_load': [('span', r'Load weight begin', r'Load weight end')],
+        'graph_capture': [('duration', r'Capture cuda graph end\. Time elapsed: (?P<s>[\d.]+) s'),
+                          ('span', r'Capture cuda graph begin', r'Capture cuda graph end')],
+        'kv_cache': [('span', r'Load weight end', r'KV Cache is allocated|Memory pool end')],
+    },
+    'trtllm': {
+        'weight_load': [('duration', r'Model init total -- (?P<s>[\d.]+) ?s'),
+                        ('span', r'Loading model weights|Start loading', r'Memory used after loading model weights')],
+        'compile': [('span', r'\[Autotuner\] Autotuning process starts', r'\[Autotuner\] Autotuning process ends')],
+        'graph_capture': [('span', r'Creating CUDA graph instances|CUDA graph warmup', r'Application startup complete')],
+        'kv_cache': [('span', r'Memory used after loading model weights', r'for max tokens in paged KV cache')],
+    },
+}
+
+# Messages that only appear in one framework's log, used when the framework is not given
+FRAMEWORK_MARKERS = {
+    'sglang': r'sglang|Load weight begin|The server is fired up',
+    'trtllm': r'\[TRT-LLM\]|tensorrt_llm',
+    'vllm': r'vllm|Model loading took',
+}
+
+
+def parse_timestamp(line, year=None):
+    """Timestamp of a log line as a datetime, or None. Formats without a year use year."""
+    for regex, fmt in TIMESTAMP_FORMATS:
+        m = regex.search(line)
+        if m:
+            ts = datetime.strptime(m.group(1), fmt)
+            return ts.replace(year=year or datetime.now().year) if '%Y' not in fmt else ts
+    return None
+
+
+def detect_framework(lines):
+    text = '\n'.join(lines[:2000])
+    counts = {fw: len(re.findall(pattern, text)) for fw, pattern in FRAMEWORK_MARKERS.items()}
+    return max(counts, key=counts.get) if any(counts.values()) else None
+
+
+def _apply_rule(rule, lines, timestamps):
+    kind, *patterns = rule
+    if kind == 'duration':
+        regex = re.compile(patterns[0])
+        values = [float(m.group('s')) for m in map(regex.search, lines) if m]
+        return max(values) if values else None
+
+    begin, end = (re.compile(p) for p in patterns)
+    begins = [t for line, t in zip(lines, timestamps) if t and begin.search(line)]
+    ends = [t for line, t in zip(lines, timestamps) if t and end.search(line)]
+    if not begins or not ends or ends[-1] < begins[0]:
+        return None
+    return (ends[-1] - begins[0]).total_seconds()
+
+
+def analyze_startup(lines, framework=None):
+    """Per-phase startup time in seconds from a server log.
+
+    Returns {'framework', 'startup_<phase>_s' for each phase found,
+    'startup_logged_s'}, where startup_logged_s spans the first to the last
+    timestamped line. Phases a framework or version does not log are omitted.
+    """
+    framework = framework or detect_framework(lines)
+    if framework not in PHASE_RULES:
+        return {}
+
+    # Lines without a timestamp (tracebacks, progress bars) inherit the previous one
+    timestamps, last = [], None
+    for line in lines:
+        last = parse_timestamp(line) or last
+        timestamps.append(last)
+
+    result = {'framework': framework}
+    for phase in PHASES:
+        for rule in PHASE_RULES[framework].get(phase, []):
+            seconds = _apply_rule(rule, lines, timestamps)
+            if seconds is not None:
+                result[f'startup_{phase}_s'] = seconds
+                break
+
+    stamped = [t for t in timestamps if t]
+    if stamped:
+        result['startup_logged_s'] = (stamped[-1] - stamped[0]).total_seconds()
+    return result
+
+
+def analyze_log_file(log_path, framework=None):
+    with open(log_path, errors='replace') as f:
+        return analyze_startup(f.read().splitlines(), framework)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Startup phase breakdown (weight load, compile, graph capture, KV cache) from a server log')
+    parser.add_argument('log_file', help='vLLM, SGLang or TRT-LLM server log')
+    parser.add_argument('--framework', choices=sorted(PHASE_RULES), required=False, help='Default: detected from the log')
+    args = parser.parse_args()
+
+    phases = analyze_log_file(args.log_file, args.framework)
+    if not phases:
+        print(f'Could not detect the framework of {args.log_file}; pass --framework', file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(phases, indent=2))
+
+
+if __name__ == '__main__':
+    main()
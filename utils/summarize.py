@@ -1,40 +1,79 @@
 import sys
-import json
-from pathlib import Path
-
-
-results = []
-results_dir = Path(sys.argv[1])
-for result_path in results_dir.rglob(f'*.json'):
-    with open(result_path) as f:
-        result = json.load(f)
-    results.append(result)
-results.sort(key=lambda r: (r.get('model', 'unknown'), r['hw'], r.get('framework', 'vllm'), r.get('precision', 'fp8'), r['tp'], r['ep'], r['conc']))
-
-summary_header = f'''\
-| Model | Hardware | Framework | Precision | TP | EP | DP Attention | Conc | TTFT (ms) | TPOT (ms) | Interactivity (tok/s/user) | E2EL (s) | TPUT per GPU | Output TPUT per GPU | Input TPUT per GPU |
-| :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: |\
-'''
-print(summary_header)
-
-for result in results:
-    framework = result.get('framework', 'vllm')
-    precision = result.get('precision', 'fp8')
-    model = result.get('model', 'unknown')
-    print(
-        f"| {model} "
-        f"| {result['hw'].upper()} "
-        f"| {framework.upper()} "
-        f"| {precision.upper()} "
-        f"| {result['tp']} "
-        f"| {result['ep']} "
-        f"| {result['dp_attention']} "
-        f"| {result['conc']} "
-        f"| {(result['median_ttft'] * 1000):.4f} "
-        f"| {(result['median_tpot'] * 1000):.4f} "
-        f"| {result['median_intvty']:.4f} "
-        f"| {result['median_e2el']:.4f} "
-        f"| {result['tput_per_gpu']:.4f} "
-        f"| {result['output_tput_per_gpu']:.4f} "
-        f"| {result['input_tput_per_gpu']:.4f} |"
-    )
+
+from columnar import load_results
+from pareto import DEFAULT_INTVTY_TARGETS, format_frontier_table
+from roofline import format_efficiency_table, roofline_utilization
+from load_curves import format_load_curves, is_open_loop
+
+
+# Columns read when loading from a columnar (Parquet) aggregate
+SUMMARY_COLUMNS = [
+    'model', 'hw', 'framework', 'precision', 'isl', 'osl', 'tp', 'ep', 'dp_attention', 'conc',
+    'median_ttft', 'median_tpot', 'median_intvty', 'median_e2el',
+    'tput_per_gpu', 'output_tput_per_gpu', 'input_tput_per_gpu', 'time_to_ready_s',
+    'request_rate', 'arrival', 'burstiness', 'request_throughput', 'p99_ttft',
+]
+
+
+def format_summary(results):
+    # Open-loop points are reported against offered load; the tables and frontiers compare closed-loop runs
+    open_loop = [r for r in results if is_open_loop(r)]
+    results = sorted((r for r in results if not is_open_loop(r)), key=lambda r: (r.get('model', 'unknown'), r['hw'], r.get('framework', 'vllm'), r.get('precision', 'fp8'), r['tp'], r['ep'], r['conc']))
+
+    lines = ['''\
+| Model | Hardware | Framework | Precision | TP | EP | DP Attention | Conc | TTFT (ms) | TPOT (ms) | Interactivity (tok/s/user) | E2EL (s) | TPUT per GPU | Output TPUT per GPU | Input TPUT per GPU | Roofline Eff. (%) | Time to Ready (s) |
+| :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: | :-: |\
+''']
+
+    for result in results:
+        framework = result.get('framework', 'vllm')
+        precision = result.get('precision', 'fp8')
+        model = result.get('model', 'unknown')
+        time_to_ready = f"{result['time_to_ready_s']:.1f}" if result.get('time_to_ready_s') is not None else '-'
+        utilization = roofline_utilization(result)
+        efficiency = f"{utilization['roofline_efficiency'] * 100:.1f}" if utilization is not None else '-'
+        lines.append(
+            f"| {model} "
+            f"| {result['hw'].upper()} "
+            f"| {framework.upper()} "
+            f"| {precision.upper()} "
+            f"| {result['tp']} "
+            f"| {result['ep']} "
+            f"| {result['dp_attention']} "
+            f"| {result['conc']} "
+            f"| {(result['median_ttft'] * 1000):.4f} "
+            f"| {(result['median_tpot'] * 1000):.4f} "
+            f"| {result['median_intvty']:.4f} "
+            f"| {result['median_e2el']:.4f} "
+            f"| {result['tput_per_gpu']:.4f} "
+            f"| {result['output_tput_per_gpu']:.4f} "
+            f"| {result['input_tput_per_gpu']:.4f} "
+            f"| {efficiency} "
+            f"| {time_to_ready} |"
+        )
+
+    lines += [
+        '',
+        f"Throughput per GPU on the Pareto frontier at {'/'.join(str(t) for t in DEFAULT_INTVTY_TARGETS)} tok/s/user:",
+        '',
+        format_frontier_table(results),
+        '',
+        'Roofline efficiency: share of GPU time the HBM bandwidth and FLOPs limits require for the measured '
+        'token rates, at each configuration\'s most efficient point (see utils/roofline.py):',
+        '',
+        format_efficiency_table(results),
+    ]
+    if open_loop:
+        lines += [
+            '',
+            'Latency vs offered load of open-loop runs; saturated points complete requests slower than they '
+            'arrive, so the queue grows without bound (see utils/load_curves.py):',
+            '',
+            format_load_curves(open_loop),
+        ]
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    # Accepts a directory of JSON results or an agg_<exp>.parquet file
+    print(format_summary(load_results(sys.argv[1], SUMMARY_COLUMNS)))
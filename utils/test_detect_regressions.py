@@ -0,0 +1,103 @@
+import pytest
+
+from detect_regressions import detect_regressions, robust_compare
+
+
+# detect_regressions.py defaults
+THRESHOLDS = {'z_threshold': 3.5, 'min_effect': 0.03, 'rel_noise_floor': 0.01}
+
+
+def _record(conc=16, run_id=None, **metrics):
+    record = {
+        'model': 'deepseek-ai/DeepSeek-R1-0528', 'hw': 'h200', 'framework': 'sglang', 'precision': 'fp8',
+        'isl': 1024, 'osl': 1024, 'tp': 8, 'ep': 1, 'dp_attention': 'false', 'conc': conc,
+        'image': 'lmsysorg/sglang:v0.5.5', **metrics,
+    }
+    return {**record, 'run_id': run_id} if run_id is not None else record
+
+
+def _history(tputs, conc=16, **metrics):
+    """One record per night, oldest first."""
+    return [_record(conc, run_id=str(night), tput_per_gpu=tput, **metrics) for night, tput in enumerate(tputs)]
+
+
+def _detect(current, history, max_baseline=10, min_history=3, **thresholds):
+    return detect_regressions(current, history, max_baseline, min_history, **{**THRESHOLDS, **thresholds})
+
+
+def _status(findings, metric='tput_per_gpu', conc=16):
+    return [f['status'] for f in findings if f['metric'] == metric and f['conc'] == conc]
+
+
+def test_robust_compare_flags_drop():
+    """Test that a drop well outside the baseline noise is a regression."""
+    comparison = robust_compare(90.0, [100.0, 101.0, 99.0, 100.5, 99.5], True, **THRESHOLDS)
+    assert comparison['status'] == 'regression'
+    assert comparison['baseline_median'] == 100.0
+    assert comparison['rel_change'] == pytest.approx(-0.1)
+    # Lower is better: the same change in a latency is an improvement
+    assert robust_compare(90.0, [100.0, 101.0, 99.0, 100.5, 99.5], False, **THRESHOLDS)['status'] == 'improvement'
+
+
+def test_robust_compare_noise_floor():
+    """Test that an identical history does not turn a small change into a significant one."""
+    comparison = robust_compare(102.0, [100.0] * 5, True, **THRESHOLDS)
+    # The MAD is 0, so the noise is the 1% floor: z = 2
+    assert comparison['baseline_mad'] == 0
+    assert comparison['z_score'] == pytest.approx(2.0)
+    assert comparison['status'] == 'unchanged'
+    assert robust_compare(95.0, [100.0] * 5, True, **THRESHOLDS)['status'] == 'regression'
+
+
+def test_robust_compare_min_effect():
+    """Test that a change below min_effect is not flagged however tight the baseline is."""
+    comparison = robust_compare(101.0, [100.0, 100.01, 99.99, 100.0, 100.02], True,
+                                z_threshold=3.5, min_effect=0.03, rel_noise_floor=0.0)
+    assert comparison['z_score'] > 3.5
+    assert comparison['status'] == 'unchanged'
+
+
+def test_detect_regressions_planted_regression():
+    """Test that one regressed point of a stable history is flagged and nothing else is."""
+    history = _history([1000, 1010, 990, 1005, 995]) + _history([600, 605, 595, 602, 598], conc=4)
+    current = [_record(16, tput_per_gpu=800.0), _record(4, tput_per_gpu=601.0)]
+    findings = _detect(current, history)
+    assert _status(findings, conc=16) == ['regression']
+    assert _status(findings, conc=4) == ['unchanged']
+    regression = next(f for f in findings if f['status'] == 'regression')
+    assert regression['n_baseline'] == 5
+    assert regression['baseline_images'] == ['lmsysorg/sglang:v0.5.5']
+
+
+def test_detect_regressions_noisy_history():
+    """Test that a value inside a noisy history's spread is not flagged."""
+    history = _history([800, 1200, 900, 1100, 1000, 850, 1150])
+    assert _status(_detect([_record(tput_per_gpu=880.0)], history)) == ['unchanged']
+
+
+def test_detect_regressions_min_history():
+    """Test that points with too few past samples get no verdict."""
+    findings = _detect([_record(tput_per_gpu=500.0)], _history([1000, 1000]))
+    assert _status(findings) == ['no_baseline']
+    assert findings[0]['n_baseline'] == 2
+    # New points have no history at all
+    assert _status(_detect([_record(64, tput_per_gpu=500.0)], _history([1000] * 5)), conc=64) == ['no_baseline']
+
+
+def test_detect_regressions_baseline_window():
+    """Test that only the latest max_baseline samples form the baseline."""
+    # The point got faster four nights ago; older nights no longer count
+    history = _history([500] * 6 + [1000] * 4)
+    assert _status(_detect([_record(tput_per_gpu=1000.0)], history, max_baseline=4)) == ['unchanged']
+    assert _status(_detect([_record(tput_per_gpu=1000.0)], history, max_baseline=10)) == ['improvement']
+
+
+def test_detect_regressions_startup_once_per_server():
+    """Test that startup metrics, shared by every concurrency of a server, are judged once."""
+    history = (_history([1000] * 5, time_to_ready_s=300.0)
+               + _history([600] * 5, conc=4, time_to_ready_s=300.0))
+    current = [_record(4, tput_per_gpu=600.0, time_to_ready_s=450.0),
+               _record(16, tput_per_gpu=1000.0, time_to_ready_s=450.0)]
+    startup = [f for f in _detect(current, history) if f['metric'] == 'time_to_ready_s']
+    assert len(startup) == 1
+    assert startup[0]['status'] == 'regression'
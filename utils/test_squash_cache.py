@@ -0,0 +1,209 @@
+import os
+import sys
+import json
+import subprocess
+import pytest
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import squash_cache
+from squash_cache import ensure_image, evict, read_metadata, squash_path
+
+
+UTILS_DIR = Path(__file__).resolve().parent
+FAKE_ENROOT = f'{sys.executable} {UTILS_DIR / "fake_enroot.py"}'
+IMAGE = 'lmsysorg/sglang:v0.5.5-cu129-amd64'
+
+
+@pytest.fixture
+def import_log(tmp_path, monkeypatch):
+    """File the fake enroot appends each imported image to."""
+    log = tmp_path / 'imports.log'
+    monkeypatch.setenv('FAKE_ENROOT_LOG', str(log))
+    monkeypatch.setenv('FAKE_ENROOT_SIZE', str(64 * 1024))
+    return log
+
+
+def _imports(log):
+    return log.read_text().split() if log.exists() else []
+
+
+def _ensure(cache_dir, image, **kwargs):
+    return ensure_image(cache_dir, image, FAKE_ENROOT, skopeo_cmd=FAKE_ENROOT, **kwargs)
+
+
+def _set_registry(tmp_path, monkeypatch, digests):
+    registry = tmp_path / 'registry.json'
+    registry.write_text(json.dumps(digests))
+    monkeypatch.setenv('FAKE_ENROOT_REGISTRY', str(registry))
+
+
+def test_import_then_hit(tmp_path, import_log):
+    """Test that the first job imports the image and later jobs reuse the verified file."""
+    cache_dir = tmp_path / 'squash'
+    path, status = _ensure(cache_dir, IMAGE)
+    assert status == 'import'
+    assert path == squash_path(cache_dir, IMAGE)
+    assert path.stat().st_size == 64 * 1024
+
+    path, status = _ensure(cache_dir, IMAGE)
+    assert status == 'hit'
+    assert _imports(import_log) == [IMAGE]
+    metadata = read_metadata(path)
+    assert metadata['digest'].startswith('sha256:')
+    assert metadata['last_used'] >= metadata['imported_at']
+
+
+def test_hit_does_not_rehash_verified_file(tmp_path, import_log, monkeypatch):
+    """Test that a file whose digest was checked is not hashed again while it is unchanged."""
+    cache_dir = tmp_path / 'squash'
+    _ensure(cache_dir, IMAGE)
+
+    hashed = []
+    file_digest = squash_cache.file_digest
+    monkeypatch.setattr(squash_cache, 'file_digest', lambda path: hashed.append(path) or file_digest(path))
+    assert _ensure(cache_dir, IMAGE)[1] == 'hit'
+    assert hashed == []
+
+
+def test_concurrent_imports_share_one(tmp_path, import_log, monkeypatch):
+    """Test that jobs starting together import the image once and all get its file."""
+    monkeypatch.setenv('FAKE_ENROOT_DELAY', '0.5')
+    cache_dir = tmp_path / 'squash'
+
+    def run_job(_):
+        return subprocess.run(
+            [sys.executable, str(UTILS_DIR / 'squash_cache.py'), '--cache-dir', str(cache_dir), '--image', IMAGE,
+             '--enroot', FAKE_ENROOT, '--skopeo', FAKE_ENROOT], capture_output=True, text=True, check=True)
+
+    with ThreadPoolExecutor(4) as pool:
+        jobs = list(pool.map(run_job, range(4)))
+
+    assert {job.stdout.strip() for job in jobs} == {str(squash_path(cache_dir, IMAGE))}
+    assert _imports(import_log) == [IMAGE]
+    assert sum('Squash image import' in job.stderr for job in jobs) == 1
+    assert not list(cache_dir.glob('*.tmp*'))
+
+
+def test_failed_import_leaves_nothing(tmp_path, import_log, monkeypatch):
+    """Test that a failed import raises, leaves no partial file, and the next job imports again."""
+    cache_dir = tmp_path / 'squash'
+    monkeypatch.setenv('FAKE_ENROOT_FAIL', '1')
+    with pytest.raises(ValueError, match='enroot import of .* failed with exit code 1'):
+        _ensure(cache_dir, IMAGE)
+    assert not squash_path(cache_dir, IMAGE).exists()
+    assert not list(cache_dir.glob('*.tmp*'))
+
+    monkeypatch.delenv('FAKE_ENROOT_FAIL')
+    assert _ensure(cache_dir, IMAGE)[1] == 'import'
+
+
+def test_truncated_file_is_reimported(tmp_path, import_log):
+    """Test that a cached file whose size no longer matches its record is imported again."""
+    cache_dir = tmp_path / 'squash'
+    path, _ = _ensure(cache_dir, IMAGE)
+    with open(path, 'r+b') as f:
+        f.truncate(1024)
+
+    path, status = _ensure(cache_dir, IMAGE)
+    assert status == 'import'
+    assert path.stat().st_size == 64 * 1024
+    assert _imports(import_log) == [IMAGE, IMAGE]
+
+
+def test_corrupted_file_is_reimported(tmp_path, import_log):
+    """Test that a cached file with the recorded size but other contents fails the digest check."""
+    cache_dir = tmp_path / 'squash'
+    path, _ = _ensure(cache_dir, IMAGE)
+    with open(path, 'r+b') as f:
+        f.write(b'\0' * 16)
+
+    assert _ensure(cache_dir, IMAGE)[1] == 'import'
+    # Checking only the size trusts the file
+    with open(path, 'r+b') as f:
+        f.write(b'\0' * 16)
+    assert _ensure(cache_dir, IMAGE, verify_digest=False)[1] == 'hit'
+
+
+def test_unrecorded_file_is_reimported(tmp_path, import_log):
+    """Test that a squash file without a metadata record (unmanaged or interrupted) is not trusted."""
+    cache_dir = tmp_path / 'squash'
+    cache_dir.mkdir()
+    squash_path(cache_dir, IMAGE).write_bytes(b'partial')
+    assert _ensure(cache_dir, IMAGE)[1] == 'import'
+
+
+def test_moved_tag_is_reimported(tmp_path, import_log, monkeypatch):
+    """Test that a tag pointing to another manifest than the cached import is imported again."""
+    cache_dir = tmp_path / 'squash'
+    image = 'nvcr.io#nvidia/tensorrt-llm/release:gpt-oss-dev'
+    _set_registry(tmp_path, monkeypatch, {'nvcr.io/nvidia/tensorrt-llm/release:gpt-oss-dev': 'sha256:aaaa'})
+    assert _ensure(cache_dir, image)[1] == 'import'
+    assert _ensure(cache_dir, image)[1] == 'hit'
+
+    _set_registry(tmp_path, monkeypatch, {'nvcr.io/nvidia/tensorrt-llm/release:gpt-oss-dev': 'sha256:bbbb'})
+    path, status = _ensure(cache_dir, image)
+    assert status == 'import'
+    assert read_metadata(path)['manifest_digest'] == 'sha256:bbbb'
+    assert _ensure(cache_dir, image)[1] == 'hit'
+
+
+def test_unresolved_tag_expires(tmp_path, import_log):
+    """Test that a tag whose digest cannot be resolved is trusted only for the tag TTL."""
+    cache_dir = tmp_path / 'squash'
+    assert _ensure(cache_dir, IMAGE)[1] == 'import'
+    assert _ensure(cache_dir, IMAGE)[1] == 'hit'
+    assert read_metadata(squash_path(cache_dir, IMAGE))['manifest_digest'] is None
+    assert _ensure(cache_dir, IMAGE, tag_ttl_s=0)[1] == 'import'
+
+
+def test_pinned_reference_is_not_resolved(tmp_path, import_log):
+    """Test that a reference pinned by @sha256: stays cached without a registry lookup or TTL."""
+    cache_dir = tmp_path / 'squash'
+    image = f'{IMAGE.split(":")[0]}@sha256:cccc'
+    assert _ensure(cache_dir, image)[1] == 'import'
+    assert _ensure(cache_dir, image, tag_ttl_s=0)[1] == 'hit'
+    assert read_metadata(squash_path(cache_dir, image))['manifest_digest'] == 'sha256:cccc'
+
+
+def test_evict_least_recently_used(tmp_path, import_log):
+    """Test that eviction removes the least recently used images until the cache fits."""
+    cache_dir = tmp_path / 'squash'
+    images = ['a/model:1', 'b/model:1', 'c/model:1', 'd/model:1']
+    for i, image in enumerate(images):
+        path, _ = _ensure(cache_dir, image)
+        metadata = read_metadata(path)
+        metadata['last_used'] = 1000.0 + i
+        with open(path.with_name(path.name + '.json'), 'w') as f:
+            json.dump(metadata, f)
+
+    # A leftover partial import is cleaned up too
+    (cache_dir / 'e_model_1.sqsh.tmp123').write_bytes(b'x')
+    os.utime(cache_dir / 'e_model_1.sqsh.tmp123', (1000.0, 1000.0))
+
+    # a is the oldest but kept (the current job's image); room for two files
+    keep = {squash_path(cache_dir, 'a/model:1')}
+    evicted = evict(cache_dir, 2 * 64 * 1024, protect_s=0, keep=keep)
+    assert evicted == ['b/model:1', 'c/model:1']
+    assert sorted(p.name for p in cache_dir.glob('*.sqsh')) == ['a_model_1.sqsh', 'd_model_1.sqsh']
+    assert not list(cache_dir.glob('*.tmp*'))
+
+
+def test_evict_skips_recent_and_locked(tmp_path, import_log):
+    """Test that recently used images and images being imported are never evicted."""
+    cache_dir = tmp_path / 'squash'
+    old, locked = 'old/model:1', 'locked/model:1'
+    for image in (old, locked):
+        path, _ = _ensure(cache_dir, image)
+        metadata = read_metadata(path)
+        metadata['last_used'] = 1000.0
+        with open(path.with_name(path.name + '.json'), 'w') as f:
+            json.dump(metadata, f)
+    recent, _ = _ensure(cache_dir, 'recent/model:1')
+
+    locked_path = squash_path(cache_dir, locked)
+    with squash_cache.FileLock(locked_path.with_name(locked_path.name + '.lock')):
+        evicted = evict(cache_dir, 0, protect_s=3600)
+    assert evicted == [old]
+    assert locked_path.exists()
+    assert recent.exists()
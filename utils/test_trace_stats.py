@@ -0,0 +1,144 @@
+import io
+import json
+import numpy as np
+import pytest
+
+import trace_stats
+from trace_stats import DEFAULT_ITL_EDGES_MS, DEFAULT_PERCENTILES, _parse_events_fallback, load_result, percentile_key
+
+
+N_REQUESTS = 400
+DURATION_S = 60.0
+
+
+@pytest.fixture(scope='module')
+def trace():
+    """Per-request arrays of a --save-detailed result, drawn with a fixed seed."""
+    rng = np.random.default_rng(0)
+    output_lens = rng.integers(0, 200, N_REQUESTS)
+    return {
+        'ttfts': rng.lognormal(np.log(0.5), 0.8, N_REQUESTS).tolist(),
+        # A request with no output has no ITLs
+        'itls': [rng.lognormal(np.log(0.03), 0.5, max(n - 1, 0)).tolist() for n in output_lens],
+        'output_lens': output_lens.tolist(),
+        'input_lens': rng.integers(800, 1024, N_REQUESTS).tolist(),
+    }
+
+
+@pytest.fixture
+def result_file(tmp_path, trace):
+    result = {
+        'date': '20251017-120000', 'model_id': 'deepseek-ai/DeepSeek-R1-0528', 'duration': DURATION_S,
+        'max_concurrency': 64, 'total_token_throughput': 12345.6, 'burstiness': None, 'ignore_eos': True,
+        **trace,
+        # Large fields the stats skip, with escapes the parser has to handle
+        'generated_texts': ['say "hi"\\n\u00e9 {[,:]}'] * N_REQUESTS,
+        'errors': [''] * N_REQUESTS,
+    }
+    path = tmp_path / 'result.json'
+    path.write_text(json.dumps(result))
+    return path
+
+
+@pytest.fixture(params=['ijson', 'fallback'])
+def parser(request, monkeypatch):
+    """Run each test with ijson (when installed) and with the pure-Python fallback parser."""
+    if request.param == 'ijson':
+        pytest.importorskip('ijson')
+    else:
+        monkeypatch.setattr(trace_stats, 'ijson', None)
+    return request.param
+
+
+def _build(events):
+    """Rebuild the document from (prefix, event, value) events."""
+    stack, key, root = [], None, None
+    for _, event, value in events:
+        if event == 'map_key':
+            key = value
+            continue
+        if event in ('start_map', 'start_array'):
+            value = {} if event == 'start_map' else []
+        elif event in ('end_map', 'end_array'):
+            stack.pop()
+            continue
+        if not stack:
+            root = value
+        elif isinstance(stack[-1], dict):
+            stack[-1][key] = value
+        else:
+            stack[-1].append(value)
+        if event in ('start_map', 'start_array'):
+            stack.append(value)
+    return root
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 4096])
+def test_fallback_parser_matches_json(result_file, chunk_size):
+    """Test that the fallback parser gives the same document as json, whatever the chunk boundaries."""
+    text = result_file.read_text()
+    events = _parse_events_fallback(io.StringIO(text), chunk_size=chunk_size)
+    assert _build(events) == json.loads(text)
+
+
+def test_fallback_parser_numbers_across_chunks():
+    """Test that numbers split over chunk boundaries are read whole."""
+    text = '[2.5, -1e-3, 123456, 0.25E+2]'
+    for chunk_size in range(1, len(text) + 1):
+        assert _build(_parse_events_fallback(io.StringIO(text), chunk_size=chunk_size)) == [2.5, -1e-3, 123456, 25.0]
+
+
+def test_fallback_parser_invalid_json():
+    """Test that malformed input raises instead of yielding a partial document."""
+    with pytest.raises(ValueError, match='Invalid JSON'):
+        list(_parse_events_fallback(io.StringIO('{"a": @}')))
+
+
+def test_percentiles_match_numpy(result_file, trace, parser):
+    """Test TTFT and TPOT percentiles against numpy, and the ITL sketch within its accuracy."""
+    summary, metrics = load_result(result_file)
+    assert summary['duration'] == DURATION_S
+    assert summary['model_id'] == 'deepseek-ai/DeepSeek-R1-0528'
+    assert 'generated_texts' not in summary
+
+    tpots = [np.mean(itls) for itls in trace['itls'] if itls]
+    all_itls = np.concatenate([itls for itls in trace['itls'] if itls])
+    for p in DEFAULT_PERCENTILES:
+        assert metrics[percentile_key(p, 'ttft')] == pytest.approx(np.percentile(trace['ttfts'], p), rel=1e-12)
+        assert metrics[percentile_key(p, 'tpot')] == pytest.approx(np.percentile(tpots, p), rel=1e-12)
+        # The sketch keeps 1% relative accuracy; numpy interpolates between neighbouring values
+        assert metrics[percentile_key(p, 'itl')] == pytest.approx(np.percentile(all_itls, p), rel=0.02)
+
+
+def test_itl_histogram_matches_numpy(result_file, trace, parser):
+    """Test that the ITL histogram counts every ITL in its millisecond bucket."""
+    _, metrics = load_result(result_file)
+    all_itls_ms = np.concatenate([itls for itls in trace['itls'] if itls]) * 1000
+    expected, _ = np.histogram(all_itls_ms, bins=DEFAULT_ITL_EDGES_MS + [np.inf])
+    assert metrics['itl_histogram'] == {'edges_ms': DEFAULT_ITL_EDGES_MS, 'counts': expected.tolist()}
+
+
+@pytest.mark.parametrize('ttft_slo_ms, tpot_slo_ms', [(2000.0, 100.0), (500.0, 30.0)])
+def test_goodput_matches_numpy(result_file, trace, parser, ttft_slo_ms, tpot_slo_ms):
+    """Test goodput: requests with output that meet both the TTFT and the TPOT SLO."""
+    _, metrics = load_result(result_file, ttft_slo_ms=ttft_slo_ms, tpot_slo_ms=tpot_slo_ms)
+    ttfts = np.array(trace['ttfts'])
+    output_lens = np.array(trace['output_lens'])
+    tpots = np.array([np.mean(itls) if itls else 0.0 for itls in trace['itls']])
+    good = (output_lens > 0) & (ttfts * 1000 <= ttft_slo_ms) & (tpots * 1000 <= tpot_slo_ms)
+    assert 0 < good.sum() < N_REQUESTS
+
+    assert metrics['goodput_ttft_slo'] == ttft_slo_ms / 1000
+    assert metrics['goodput_tpot_slo'] == tpot_slo_ms / 1000
+    assert metrics['goodput_ratio'] == pytest.approx(good.mean())
+    assert metrics['goodput_req_s'] == pytest.approx(good.sum() / DURATION_S)
+    assert metrics['goodput_output_tok_s'] == pytest.approx(output_lens[good].sum() / DURATION_S)
+
+
+def test_result_without_detailed_arrays(tmp_path, parser):
+    """Test that a result saved without --save-detailed gives its summary and no trace metrics."""
+    path = tmp_path / 'result.json'
+    path.write_text(json.dumps({'duration': DURATION_S, 'median_ttft_ms': 512.0}))
+    summary, metrics = load_result(path)
+    assert summary == {'duration': DURATION_S, 'median_ttft_ms': 512.0}
+    assert metrics == {}
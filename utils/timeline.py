@@ -0,0 +1,190 @@
+import sys
+import json
+import heapq
+import bisect
+import argparse
+
+from trace_stats import load_result, parse_events
+
+
+DEFAULT_N_BINS = 200
+
+# Fraction of the concurrency limit that must be in flight for the run to count as saturated
+DEFAULT_SATURATION = 0.9
+
+
+def request_spans(requests, conc):
+    """Return per-request (start, first_token, end) times in seconds from the start of the run.
+
+    Uses the client's start_times when present. Otherwise start times are rebuilt
+    by replaying bench_serving's closed loop: requests are dispatched in order onto
+    conc slots, each taking ttft + sum(itls).
+    """
+    ttfts, itl_sums = requests['ttfts'], requests['itl_sums']
+    n = len(ttfts)
+    latencies = [ttfts[i] + (itl_sums[i] if i < len(itl_sums) else 0.0) for i in range(n)]
+
+    if requests.get('start_times') is not None:
+        t0 = min(requests['start_times'])
+        starts = [t - t0 for t in requests['start_times']]
+    else:
+        slots = [0.0] * max(1, min(conc, n))
+        starts = []
+        for latency in latencies:
+            start = heapq.heappop(slots)
+            starts.append(start)
+            heapq.heappush(slots, start + latency)
+
+    first_tokens = [starts[i] + ttfts[i] for i in range(n)]
+    ends = [starts[i] + latencies[i] for i in range(n)]
+    return starts, first_tokens, ends
+
+
+def _count_active(sorted_begins, sorted_ends, t):
+    return bisect.bisect_right(sorted_begins, t) - bisect.bisect_right(sorted_ends, t)
+
+
+def steady_state_window(starts, first_tokens, ends, conc, saturation=DEFAULT_SATURATION, n_points=1000):
+    """Return (t_start, t_end) of the window where the server is saturated, or None.
+
+    The window opens once saturation * conc requests are past their first token
+    (ramp-up prefill is over) and closes at the last moment saturation * conc
+    requests are still in flight (before the straggler tail).
+    """
+    if not ends:
+        return None
+    threshold = saturation * min(conc, len(ends))
+    sorted_starts, sorted_first, sorted_ends = sorted(starts), sorted(first_tokens), sorted(ends)
+    t_max = sorted_ends[-1]
+    grid = [t_max * k / n_points for k in range(n_points + 1)]
+
+    t_start = next((t for t in grid if _count_active(sorted_first, sorted_ends, t) >= threshold), None)
+    t_end = next((t for t in reversed(grid) if _count_active(sorted_starts, sorted_ends, t) >= threshold), None)
+    if t_start is None or t_end is None or t_end <= t_start:
+        return None
+    return t_start, t_end
+
+
+def analyze_timeline(result_path, requests, conc, saturation=DEFAULT_SATURATION, n_bins=DEFAULT_N_BINS):
+    """Rebuild the output-token and in-flight timeline of a run and its steady-state throughput.
+
+    Token emission times are start + ttft for the first token and cumulative ITLs
+    after that. They are binned while streaming the 'itls' arrays of result_path
+    once more. Chunks carrying several tokens (e.g. speculative decoding) are
+    weighted by output_len / (n_itls + 1). Returns (metrics, timeline).
+    """
+    starts, first_tokens, ends = request_spans(requests, conc)
+    if not ends:
+        return {}, None
+    t_max = max(ends) or 1.0
+    bin_width = t_max / n_bins
+    output_tokens = [0.0] * n_bins
+    window = steady_state_window(starts, first_tokens, ends, conc, saturation)
+    w_start, w_end = window if window else (0.0, 0.0)
+    window_output_tokens = 0.0
+
+    output_lens, itl_counts = requests['output_lens'], requests['itl_counts']
+    weights = []
+    for i in range(len(ends)):
+        out_len = output_lens[i] if i < len(output_lens) else 0
+        n_chunks = (itl_counts[i] if i < len(itl_counts) else 0) + 1
+        weights.append(out_len / n_chunks if out_len > 0 else 0.0)
+
+    def add_tokens(t, weight):
+        nonlocal window_output_tokens
+        output_tokens[min(int(t / bin_width), n_bins - 1)] += weight
+        if w_start <= t <= w_end:
+            window_output_tokens += weight
+
+    for i, t in enumerate(first_tokens):
+        add_tokens(t, weights[i])
+
+    i, t = -1, 0.0
+    with open(result_path, 'rb') as f:
+        for prefix, event, value in parse_events(f):
+            if prefix == 'itls.item.item' and event == 'number':
+                t += value
+                add_tokens(t, weights[i])
+            elif prefix == 'itls.item' and event == 'start_array':
+                i += 1
+                t = first_tokens[i]
+
+    sorted_starts, sorted_first, sorted_ends = sorted(starts), sorted(first_tokens), sorted(ends)
+    centers = [(k + 0.5) * bin_width for k in range(n_bins)]
+    timeline = {
+        'time': centers,
+        'output_tok_s': [tokens / bin_width for tokens in output_tokens],
+        'in_flight': [_count_active(sorted_starts, sorted_ends, t) for t in centers],
+        'decoding': [_count_active(sorted_first, sorted_ends, t) for t in centers],
+        'window': window,
+    }
+
+    if window is None:
+        return {}, timeline
+
+    input_lens = requests['input_lens']
+    window_input_tokens = sum(input_lens[i] for i, t in enumerate(first_tokens)
+                              if i < len(input_lens) and w_start <= t <= w_end)
+    window_s = w_end - w_start
+    metrics = {
+        'steady_window_start': w_start,
+        'steady_window_end': w_end,
+        'steady_window_frac': window_s / t_max,
+        'steady_output_tok_s': window_output_tokens / window_s,
+        'steady_total_tok_s': (window_output_tokens + window_input_tokens) / window_s,
+    }
+    return metrics, timeline
+
+
+def plot_timeline(timeline, title, path):
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    ax.plot(timeline['time'], timeline['output_tok_s'], color='black', label='Output tok/s')
+    ax.set_xlabel('Time (s)')
+    ax.set_ylabel('Output throughput (tok/s)')
+
+    ax2 = ax.twinx()
+    ax2.plot(timeline['time'], timeline['in_flight'], color='green', linestyle='--', label='In flight')
+    ax2.plot(timeline['time'], timeline['decoding'], color='orange', linestyle=':', label='Decoding')
+    ax2.set_ylabel('Requests')
+
+    if timeline['window']:
+        ax.axvspan(*timeline['window'], color='gray', alpha=0.2, label='Steady state')
+
+    lines, labels = ax.get_legend_handles_labels()
+    lines2, labels2 = ax2.get_legend_handles_labels()
+    ax.legend(lines + lines2, labels + labels2, loc='lower center')
+    ax.set_title(title)
+    fig.tight_layout()
+    fig.savefig(path, bbox_inches='tight')
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Token timeline and steady-state throughput of a bench_serving run')
+    parser.add_argument('result_file', help='bench_serving result JSON with per-request arrays')
+    parser.add_argument('--saturation', type=float, default=DEFAULT_SATURATION,
+                        help='Fraction of max concurrency in flight that counts as saturated (default: 0.9)')
+    parser.add_argument('--n-bins', type=int, default=DEFAULT_N_BINS, help='Number of timeline bins (default: 200)')
+    parser.add_argument('--plot', required=False, help='Write a timeline plot to this file')
+    args = parser.parse_args()
+
+    summary, _, requests = load_result(args.result_file, return_requests=True)
+    if not requests['ttfts']:
+        print(f'{args.result_file} has no per-request arrays', file=sys.stderr)
+        sys.exit(1)
+
+    metrics, timeline = analyze_timeline(args.result_file, requests, int(summary['max_concurrency']),
+                                         args.saturation, args.n_bins)
+    if summary.get('duration'):
+        metrics['whole_run_output_tok_s'] = summary.get('output_throughput')
+        metrics['whole_run_total_tok_s'] = summary.get('total_token_throughput')
+    print(json.dumps(metrics, indent=2))
+
+    if args.plot:
+        plot_timeline(timeline, args.result_file, args.plot)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+import io
+import re
+import sys
+import json
+import math
+import bisect
+import argparse
+from array import array
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+DEFAULT_PERCENTILES = [50, 90, 95, 99, 99.9]
+
+# ITL histogram bucket edges in milliseconds; the last bucket is open ended
+DEFAULT_ITL_EDGES_MS = [0, 5, 10, 15, 20, 30, 40, 50, 75, 100, 150, 200, 300, 500, 1000]
+
+# Per-request SLOs a request must meet to count towards goodput
+DEFAULT_TTFT_SLO_MS = 2000.0
+DEFAULT_TPOT_SLO_MS = 100.0
+
+READ_CHUNK_SIZE = 1 << 20
+
+_TOKEN = re.compile(r'''\s*(?:
+    (?P<punct>[\[\]{}:,])
+  | "(?P<str>(?:[^"\\]|\\.)*)"
+  | (?P<num>-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<lit>true|false|null)
+)''', re.VERBOSE | re.DOTALL)
+
+_LITERALS = {'true': ('boolean', True), 'false': ('boolean', False), 'null': ('null', None)}
+
+
+def _parse_events_fallback(f, chunk_size=READ_CHUNK_SIZE):
+    """Pure-Python incremental JSON parser yielding ijson-style (prefix, event, value) events.
+
+    The file is read in chunks, so memory is bounded by the chunk size and the
+    largest single token rather than by the document size.
+    """
+    buf, pos, eof = '', 0, False
+    stack, path, expect_key = [], [], False
+
+    while True:
+        m = _TOKEN.match(buf, pos)
+        # A number within two characters of the end of the buffer may continue in the
+        # next chunk (e.g. '2.' + '5' or '1e' + '-3')
+        if (m is None or (m.group('num') and len(buf) - m.end() <= 2)) and not eof:
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        if m is None:
+            if buf[pos:].strip():
+                raise ValueError(f'Invalid JSON near: {buf[pos:pos + 40]!r}')
+            return
+        pos = m.end()
+
+        punct = m.group('punct')
+        if punct == '{':
+            yield '.'.join(path), 'start_map', None
+            stack.append('map')
+            path.append(None)
+            expect_key = True
+        elif punct == '}':
+            stack.pop()
+            path.pop()
+            yield '.'.join(path), 'end_map', None
+            expect_key = False
+        elif punct == '[':
+            yield '.'.join(path), 'start_array', None
+            stack.append('array')
+            path.append('item')
+        elif punct == ']':
+            stack.pop()
+            path.pop()
+            yield '.'.join(path), 'end_array', None
+        elif punct == ',':
+            expect_key = bool(stack) and stack[-1] == 'map'
+        elif punct == ':':
+            pass
+        elif m.group('str') is not None:
+            value = m.group('str')
+            if '\\' in value:
+                value = json.loads(f'"{value}"')
+            if expect_key:
+                path[-1] = value
+                yield '.'.join(path[:-1]), 'map_key', value
+                expect_key = False
+            else:
+                yield '.'.join(path), 'string', value
+        elif m.group('num') is not None:
+            num = m.group('num')
+            value = float(num) if any(c in num for c in '.eE') else int(num)
+            yield '.'.join(path), 'number', value
+        else:
+            event, value = _LITERALS[m.group('lit')]
+            yield '.'.join(path), event, value
+
+
+def parse_events(f):
+    """Yield (prefix, event, value) events of a JSON document opened in binary or text mode."""
+    if ijson is not None:
+        yield from ijson.parse(f, use_float=True)
+        return
+    if isinstance(f.read(0), bytes):
+        f = io.TextIOWrapper(f, encoding='utf-8')
+    yield from _parse_events_fallback(f)
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch with bounded relative error (DDSketch style).
+
+    Memory depends on the value range, not on the number of values; quantiles are
+    within rel_accuracy of the exact value.
+    """
+
+    def __init__(self, rel_accuracy=0.01):
+        self.gamma = (1 + rel_accuracy) / (1 - rel_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        i = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[i] = self.buckets.get(i, 0) + 1
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for i in sorted(self.buckets):
+            seen += self.buckets[i]
+            if rank < seen:
+                return 2 * self.gamma ** i / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+def exact_percentile(sorted_values, p):
+    """Linearly interpolated percentile of an already sorted sequence (numpy's default method)."""
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * p / 100
+    lo = math.floor(rank)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (rank - lo)
+
+
+def percentile_key(p, metric):
+    return f"p{p:g}_{metric}"
+
+
+def load_result(result_path, percentiles=DEFAULT_PERCENTILES, itl_edges_ms=DEFAULT_ITL_EDGES_MS,
+                 ttft_slo_ms=DEFAULT_TTFT_SLO_MS, tpot_slo_ms=DEFAULT_TPOT_SLO_MS, return_requests=False):
+    """Stream a bench_serving result file.
+
+    Returns (summary, trace_metrics). summary holds the top-level scalar fields
+    (everything process_result needs). trace_metrics holds percentiles, an ITL
+    histogram and goodput computed from the per-request 'ttfts', 'itls' and
+    'output_lens' arrays, or is empty when the file has no detailed arrays. Other
+    large fields such as generated texts are skipped without being materialized.
+    Individual ITLs go into a quantile sketch, so memory grows with the number of
+    requests rather than the number of tokens.
+
+    With return_requests, a third element holds the per-request arrays
+    (start_times if the client saved them, ttfts, itl_sums, itl_counts, input_lens,
+    output_lens) for further analysis such as timeline.py.
+    """
+    summary = {}
+    ttfts, output_lens = array('d'), array('d')
+    start_times, input_lens = array('d'), array('d')
+    req_itl_sum, req_itl_n = array('d'), array('l')
+    itl_sketch = QuantileSketch()
+    itl_counts = [0] * len(itl_edges_ms)
+    itl_sum = itl_n = 0
+
+    with open(result_path, 'rb') as f:
+        for prefix, event, value in parse_events(f):
+            if prefix == 'itls.item.item' and event == 'number':
+                itl_sketch.add(value)
+                itl_n += 1
+                itl_sum += value
+                req_itl_n[-1] += 1
+                req_itl_sum[-1] += value
+                itl_counts[max(bisect.bisect_right(itl_edges_ms, value * 1000) - 1, 0)] += 1
+            elif prefix == 'itls.item' and event == 'start_array':
+                req_itl_sum.append(0.0)
+                req_itl_n.append(0)
+            elif prefix == 'ttfts.item' and event == 'number':
+                ttfts.append(value)
+            elif prefix == 'output_lens.item' and event == 'number':
+                output_lens.append(value)
+            elif prefix == 'input_lens.item' and event == 'number':
+                input_lens.append(value)
+            elif prefix == 'start_times.item' and event == 'number':
+                start_times.append(value)
+            elif '.' not in prefix and prefix and event in ('string', 'number', 'boolean', 'null'):
+                summary[prefix] = value
+
+    requests = {
+        'start_times': start_times if start_times else None,
+        'ttfts': ttfts,
+        'itl_sums': req_itl_sum,
+        'itl_counts': req_itl_n,
+        'input_lens': input_lens,
+        'output_lens': output_lens,
+    }
+
+    if not ttfts:
+        return (summary, {}, requests) if return_requests else (summary, {})
+
+    metrics = {}
+    sorted_ttfts = sorted(ttfts)
+    tpots = sorted(s / n for s, n in zip(req_itl_sum, req_itl_n) if n > 0)
+    for p in percentiles:
+        metrics[percentile_key(p, 'ttft')] = exact_percentile(sorted_ttfts, p)
+        if tpots:
+            metrics[percentile_key(p, 'tpot')] = exact_percentile(tpots, p)
+        if itl_n:
+            metrics[percentile_key(p, 'itl')] = itl_sketch.quantile(p / 100)
+
+    if itl_n:
+        metrics['itl_histogram'] = {'edges_ms': list(itl_edges_ms), 'counts': itl_counts}
+
+    # A request is good if it produced output and met both the TTFT and TPOT SLOs
+    n_good = good_tokens = 0
+    n_requests = len(ttfts)
+    for i in range(n_requests):
+        out_len = output_lens[i] if i < len(output_lens) else 0
+        tpot = req_itl_sum[i] / req_itl_n[i] if i < len(req_itl_n) and req_itl_n[i] else 0.0
+        if out_len > 0 and ttfts[i] * 1000 <= ttft_slo_ms and tpot * 1000 <= tpot_slo_ms:
+            n_good += 1
+            good_tokens += out_len
+
+    metrics['goodput_ttft_slo'] = ttft_slo_ms / 1000
+    metrics['goodput_tpot_slo'] = tpot_slo_ms / 1000
+    metrics['goodput_ratio'] = n_good / n_requests
+    duration = summary.get('duration')
+    if duration:
+        metrics['goodput_req_s'] = n_good / duration
+        metrics['goodput_output_tok_s'] = good_tokens / duration
+
+    return (summary, metrics, requests) if return_requests else (summary, metrics)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Distribution metrics from a bench_serving result with detailed per-request arrays')
+    parser.add_argument('result_file', help='bench_serving result JSON (saved with --save-detailed)')
+    parser.add_argument('--percentiles', type=float, nargs='+', default=DEFAULT_PERCENTILES)
+    parser.add_argument('--ttft-slo-ms', type=float, default=DEFAULT_TTFT_SLO_MS)
+    parser.add_argument('--tpot-slo-ms', type=float, default=DEFAULT_TPOT_SLO_MS)
+    args = parser.parse_args()
+
+    _, metrics = load_result(args.result_file, args.percentiles, ttft_slo_ms=args.ttft_slo_ms, tpot_slo_ms=args.tpot_slo_ms)
+    if not metrics:
+        print(f'{args.result_file} has no per-request arrays', file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(metrics, indent=2))
+
+
+if __name__ == '__main__':
+    main()
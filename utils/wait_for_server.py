@@ -0,0 +1,260 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import subprocess
+import collections
+import urllib.request
+from datetime import datetime
+
+from startup_phases import analyze_log_file
+
+
+# Log lines each framework prints once it serves requests
+READY_PATTERNS = {
+    'vllm': [r'Application startup complete'],
+    'sglang': [r'The server is fired up and ready to roll', r'Application startup complete'],
+    'trtllm': [r'Application startup complete'],
+}
+
+# Checked in order against the log tail when the server dies; the first match classifies the failure
+ERROR_CLASSES = [
+    ('oom', r'CUDA out of memory|HIP out of memory|OutOfMemoryError|No available memory for the cache blocks|'
+            r'Not enough memory|insufficient GPU memory'),
+    ('nccl', r'NCCL error|ncclSystemError|ncclInternalError|ncclUnhandledCudaError|RCCL error'),
+    ('port_in_use', r'Address already in use'),
+    ('model_access', r'RepositoryNotFoundError|GatedRepoError|LocalEntryNotFoundError|HFValidationError|401 Client Error'),
+    ('gpu_fault', r'CUDA error|HIP error|illegal memory access|no kernel image is available|Xid'),
+    ('import', r'ModuleNotFoundError|ImportError'),
+    ('config', r'unrecognized arguments|error: argument|ValueError|NotImplementedError'),
+]
+
+EXIT_CODES = {'timeout': 2, 'crashed': 3, 'oom': 4, 'nccl': 5, 'port_in_use': 6, 'model_access': 7,
+              'gpu_fault': 8, 'import': 9, 'config': 10}
+
+LOG_POLL_S = 0.5
+PROBE_BACKOFF_S = (1.0, 10.0)
+LOG_TAIL_LINES = 200
+
+
+class ProcessWatcher:
+    """Liveness of a server process started by the calling shell."""
+
+    def __init__(self, pid):
+        self.pid = pid
+
+    def started_at(self):
+        """Process start time as a Unix timestamp, or None if unknown."""
+        try:
+            with open(f'/proc/{self.pid}/stat') as f:
+                start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+            with open('/proc/stat') as f:
+                boot_time = next(int(line.split()[1]) for line in f if line.startswith('btime'))
+        except (OSError, ValueError, IndexError, StopIteration):
+            return None
+        return boot_time + start_ticks / os.sysconf('SC_CLK_TCK')
+
+    def failure(self):
+        """None while the process runs, otherwise a short description of how it ended."""
+        try:
+            with open(f'/proc/{self.pid}/stat') as f:
+                # A zombie has exited but was not reaped yet by the launching shell
+                if f.read().rsplit(')', 1)[1].split()[0] == 'Z':
+                    return f'process {self.pid} exited'
+            return None
+        except FileNotFoundError:
+            return f'process {self.pid} exited'
+        except OSError:
+            pass
+        try:
+            os.kill(self.pid, 0)
+        except ProcessLookupError:
+            return f'process {self.pid} exited'
+        except PermissionError:
+            pass
+        return None
+
+    def oom_killed(self):
+        return False
+
+
+class ContainerWatcher:
+    """Liveness of a server running in a Docker container, with its logs copied to a file."""
+
+    def __init__(self, name, log_path):
+        self.name = name
+        self.log_file = open(log_path, 'wb')
+        self.logs = subprocess.Popen(['docker', 'logs', '-f', name], stdout=self.log_file, stderr=subprocess.STDOUT)
+        self.state = {}
+
+    def _inspect(self):
+        out = subprocess.run(['docker', 'inspect', '--format', '{{json .State}}', self.name],
+                             capture_output=True, text=True)
+        self.state = json.loads(out.stdout) if out.returncode == 0 and out.stdout.strip() else {}
+        return self.state
+
+    def started_at(self):
+        started = self._inspect().get('StartedAt')
+        if not started:
+            return None
+        # Docker reports nanoseconds, which fromisoformat does not accept
+        started = re.sub(r'(\.\d{6})\d*', r'\1', started).replace('Z', '+00:00')
+        return datetime.fromisoformat(started).timestamp()
+
+    def failure(self):
+        state = self._inspect()
+        if not state:
+            return f'container {self.name} not found'
+        if state.get('Running') or state.get('Status') in ('created', 'restarting'):
+            return None
+        return f"container {self.name} {state.get('Status')} with exit code {state.get('ExitCode')}"
+
+    def oom_killed(self):
+        return bool(self.state.get('OOMKilled'))
+
+    def close(self):
+        self.logs.terminate()
+        self.log_file.close()
+
+
+class LogFollower:
+    """Incrementally reads new complete lines from a log file that may not exist yet."""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.partial = b''
+        self.tail = collections.deque(maxlen=LOG_TAIL_LINES)
+
+    def read_lines(self):
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        self.offset += len(data)
+        *lines, self.partial = (self.partial + data).split(b'\n')
+        lines = [line.decode('utf-8', errors='replace').rstrip('\r') for line in lines]
+        self.tail.extend(lines)
+        return lines
+
+
+def classify_failure(log_lines, oom_killed=False):
+    """Return (error class, matching log line) for a server that died during startup."""
+    if oom_killed:
+        return 'oom', 'container was OOM killed'
+    for error_class, pattern in ERROR_CLASSES:
+        regex = re.compile(pattern)
+        # The last matching line is usually closest to the root cause
+        for line in reversed(log_lines):
+            if regex.search(line):
+                return error_class, line.strip()
+    return 'crashed', log_lines[-1].strip() if log_lines else ''
+
+
+def _probe(url):
+    try:
+        with urllib.request.urlopen(url, timeout=2) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def wait_for_server(watcher, log_path, port=None, host='localhost', frameworks=None, timeout=None, echo=True):
+    """Block until the server is ready, its process dies, or the timeout expires.
+
+    Ready means a framework readiness line in the log, or both /health and
+    /v1/models answering 200 (probed with exponential backoff). Returns a dict
+    with 'status' ('ready', 'failed' or 'timeout'), 'time_to_ready_s' measured
+    from the server process start when known, and for failures 'error_class' and
+    'error_line'.
+    """
+    patterns = [p for fw in (frameworks or READY_PATTERNS) for p in READY_PATTERNS[fw]]
+    ready_regex = re.compile('|'.join(patterns))
+    follower = LogFollower(log_path)
+    start = time.time()
+    started_at = watcher.started_at() or start
+    probe_delay, next_probe = PROBE_BACKOFF_S[0], start + PROBE_BACKOFF_S[0]
+
+    def result(status, **fields):
+        return {'status': status, 'elapsed_s': time.time() - started_at, **fields}
+
+    while True:
+        for line in follower.read_lines():
+            if echo:
+                print(line, flush=True)
+            if ready_regex.search(line):
+                return result('ready', time_to_ready_s=time.time() - started_at, ready_signal='log')
+
+        failure = watcher.failure()
+        if failure:
+            # Pick up the last lines written before the process died
+            follower.read_lines()
+            error_class, error_line = classify_failure(list(follower.tail), watcher.oom_killed())
+            return result('failed', error_class=error_class, error_line=error_line, reason=failure)
+
+        now = time.time()
+        if port and now >= next_probe:
+            if _probe(f'http://{host}:{port}/health') and _probe(f'http://{host}:{port}/v1/models'):
+                return result('ready', time_to_ready_s=time.time() - started_at, ready_signal='health')
+            probe_delay = min(probe_delay * 2, PROBE_BACKOFF_S[1])
+            next_probe = now + probe_delay
+
+        if timeout and now - start > timeout:
+            return result('timeout', error_class='timeout', error_line=follower.tail[-1] if follower.tail else '')
+
+        time.sleep(LOG_POLL_S)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Wait for an inference server to become ready; exit immediately with a classified error if it dies')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--pid', type=int, help='PID of the server process (with --log)')
+    source.add_argument('--container', help='Name of the Docker container running the server')
+    parser.add_argument('--log', required=False, help='Server log file (required with --pid)')
+    parser.add_argument('--port', type=int, required=False, help='Also probe /health and /v1/models on this port')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--framework', choices=sorted(READY_PATTERNS), action='append',
+                        help='Only accept this framework\'s readiness lines (default: any)')
+    parser.add_argument('--timeout', type=float, default=5400, help='Seconds before giving up (default: 5400)')
+    parser.add_argument('--output', required=False,
+                        help='Write the outcome and time-to-ready as JSON to this file (read by process_result.py)')
+    args = parser.parse_args()
+
+    if args.pid and not args.log:
+        parser.error('--log is required with --pid')
+
+    if args.container:
+        log_path = args.log or f'/tmp/{args.container}.log'
+        watcher = ContainerWatcher(args.container, log_path)
+    else:
+        log_path = args.log
+        watcher = ProcessWatcher(args.pid)
+
+    try:
+        outcome = wait_for_server(watcher, log_path, args.port, args.host, args.framework, args.timeout)
+    finally:
+        if args.container:
+            watcher.close()
+
+    # Phases are read from the log now, as it does not outlive the job
+    outcome['phases'] = analyze_log_file(log_path, args.framework[0] if args.framework else None)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(outcome, f, indent=2)
+
+    if outcome['status'] == 'ready':
+        print(f"Server ready after {outcome['time_to_ready_s']:.1f}s ({outcome['ready_signal']})", file=sys.stderr)
+        return
+    print(f"Server {outcome['status']} after {outcome['elapsed_s']:.1f}s: {outcome['error_class']}"
+          f"{' (' + outcome['reason'] + ')' if outcome.get('reason') else ''}\n  {outcome['error_line']}", file=sys.stderr)
+    sys.exit(EXIT_CODES[outcome['error_class']])
+
+
+if __name__ == '__main__':
+    main()